@@ -10,6 +10,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import pandas as pd
 import numpy as np
 from termcolor import colored, cprint
+from src.data.ohlcv_store import load_csv_data
+from src.data.feature_cache import cached_fused_indicators
+from src.data.precision import indicator_dtype
 
 class AIDebugDemo:
     def __init__(self):
@@ -20,35 +23,21 @@ class AIDebugDemo:
         
     def calculate_strategy_indicators(self, df):
         """Calcula indicadores da estratégia Moon Dev"""
-        # EMA 9
-        df['ema9'] = df['close'].ewm(span=9).mean()
+        # EMA 9 + distância + Bollinger na distância (período menor para mais sinais) numa única passada
+        out = cached_fused_indicators(df['close'].values, 9, 50, 2, adjust=True, dtype=indicator_dtype())
         
-        # Distância percentual
-        df['distance_ema9'] = ((df['close'] - df['ema9']) / df['ema9']) * 100
-        
-        # Bollinger Bands na distância (período menor para mais sinais)
-        rolling_mean = df['distance_ema9'].rolling(window=50).mean()
-        rolling_std = df['distance_ema9'].rolling(window=50).std()
-        
-        df['bb_upper'] = rolling_mean + (rolling_std * 2)
-        df['bb_lower'] = rolling_mean - (rolling_std * 2)
+        df['ema9'] = out['ema']
+        df['distance_ema9'] = out['distance']
+        df['bb_upper'] = out['bb_upper']
+        df['bb_lower'] = out['bb_lower']
         
         # Sinais de exaustão
-        df['exhaustion_buy'] = df['distance_ema9'] < df['bb_lower']
-        df['exhaustion_sell'] = df['distance_ema9'] > df['bb_upper']
+        df['exhaustion_buy'] = out['exhaustion_buy']
+        df['exhaustion_sell'] = out['exhaustion_sell']
         
         # Força da exaustão
-        df['exhaustion_strength_buy'] = np.where(
-            df['exhaustion_buy'], 
-            abs((df['distance_ema9'] - df['bb_lower']) / df['bb_lower']), 
-            0
-        )
-        
-        df['exhaustion_strength_sell'] = np.where(
-            df['exhaustion_sell'], 
-            abs((df['distance_ema9'] - df['bb_upper']) / df['bb_upper']), 
-            0
-        )
+        df['exhaustion_strength_buy'] = out['strength_buy']
+        df['exhaustion_strength_sell'] = out['strength_sell']
         
         # RSI
         delta = df['close'].diff()
@@ -276,10 +265,7 @@ def test_debug_demo(csv_file):
     cprint(f"🔍 DEBUG DEMO: {csv_file}", "white", "on_blue")
     
     # Carregar dados
-    df = pd.read_csv(csv_file)
-    df.columns = df.columns.str.lower()
-    df['timestamp'] = pd.to_datetime(df['datetime'])
-    df = df.dropna()
+    df = load_csv_data(csv_file)
     
     # Criar demo
     demo = AIDebugDemo()
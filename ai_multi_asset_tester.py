@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from ai_debug_demo import AIDebugDemo
+from src.data.ohlcv_store import load_csv_data
 import pandas as pd
 import glob
 from termcolor import colored, cprint
@@ -32,10 +33,7 @@ def test_all_assets():
         
         try:
             # Carregar dados
-            df = pd.read_csv(csv_file)
-            df.columns = df.columns.str.lower()
-            df['timestamp'] = pd.to_datetime(df['datetime'])
-            df = df.dropna()
+            df = load_csv_data(csv_file)
             
             # Criar demo
             demo = AIDebugDemo()
@@ -12,6 +12,12 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import pandas as pd
 import numpy as np
 from termcolor import colored, cprint
+from src.data.ohlcv_store import load_csv_data
+from src.data.feature_cache import cached_fused_indicators
+from src.data.precision import indicator_dtype
+from src.data.backtest_core import build_context_features, context_at, run_event_backtest, close_open_position
+from src.agents.decision_cache import DecisionCache
+from src.core.config import DECISION_CACHE_ENABLED, AI_CANDIDATE_FILTER
 from dotenv import load_dotenv
 import requests
 import json
@@ -20,7 +26,21 @@ import time
 
 load_dotenv()
 
+# Campos do contexto que entram na chave do cache de decisões
+# (preço, saldo, horário etc. ficam de fora para contextos equivalentes se repetirem)
+CACHE_FEATURES = [
+    'distance_ema9', 'bb_upper', 'bb_lower',
+    'exhaustion_buy_now', 'exhaustion_sell_now',
+    'exhaustion_strength_buy', 'exhaustion_strength_sell',
+    'recent_exhaustion_buy', 'recent_exhaustion_sell',
+    'periods_since_buy_exhaustion', 'periods_since_sell_exhaustion',
+    'rsi', 'price_change_1period', 'price_change_5periods', 'volume_ratio',
+]
+
 class AISmartTrader:
+    # Mude a versão ao alterar o prompt para não reaproveitar decisões antigas
+    CACHE_NAMESPACE = "ai_smart_trader:deepseek-chat:v1"
+    
     def __init__(self):
         self.api_key = os.getenv('DEEPSEEK_API_KEY')
         self.base_url = "https://api.deepseek.com/v1/chat/completions"
@@ -28,41 +48,29 @@ class AISmartTrader:
         self.current_position = None
         self.balance = 10000  # Capital inicial
         self.initial_balance = 10000
-        self.equity_curve = []
+        self.equity_curve = np.empty(0)
+        self.backtest_stats = {}
+        self.decision_cache = DecisionCache() if DECISION_CACHE_ENABLED and self.api_key else None
         
     def calculate_strategy_indicators(self, df, ema_period=9, bb_period=200, bb_std=2):
         """Calcula sua estratégia original: Distância EMA9 + Bollinger Bands"""
         
-        # EMA 9
-        df['ema9'] = df['close'].ewm(span=ema_period).mean()
-        
-        # Distância percentual da EMA9
-        df['distance_ema9'] = ((df['close'] - df['ema9']) / df['ema9']) * 100
+        # EMA 9, distância %, Bollinger na distância e exaustão numa única passada
+        out = cached_fused_indicators(df['close'].values, ema_period, bb_period, bb_std, adjust=True, dtype=indicator_dtype())
         
-        # Bollinger Bands na distância
-        rolling_mean = df['distance_ema9'].rolling(window=bb_period).mean()
-        rolling_std = df['distance_ema9'].rolling(window=bb_period).std()
-        
-        df['bb_upper'] = rolling_mean + (rolling_std * bb_std)
-        df['bb_middle'] = rolling_mean
-        df['bb_lower'] = rolling_mean - (rolling_std * bb_std)
+        df['ema9'] = out['ema']
+        df['distance_ema9'] = out['distance']
+        df['bb_upper'] = out['bb_upper']
+        df['bb_middle'] = out['bb_middle']
+        df['bb_lower'] = out['bb_lower']
         
         # Sinais de exaustão (sua estratégia original)
-        df['exhaustion_buy'] = df['distance_ema9'] < df['bb_lower']  # Abaixo da banda = exaustão de venda
-        df['exhaustion_sell'] = df['distance_ema9'] > df['bb_upper']  # Acima da banda = exaustão de compra
+        df['exhaustion_buy'] = out['exhaustion_buy']  # Abaixo da banda = exaustão de venda
+        df['exhaustion_sell'] = out['exhaustion_sell']  # Acima da banda = exaustão de compra
         
         # Força da exaustão
-        df['exhaustion_strength_buy'] = np.where(
-            df['exhaustion_buy'], 
-            abs((df['distance_ema9'] - df['bb_lower']) / df['bb_lower']), 
-            0
-        )
-        
-        df['exhaustion_strength_sell'] = np.where(
-            df['exhaustion_sell'], 
-            abs((df['distance_ema9'] - df['bb_upper']) / df['bb_upper']), 
-            0
-        )
+        df['exhaustion_strength_buy'] = out['strength_buy']
+        df['exhaustion_strength_sell'] = out['strength_sell']
         
         # Indicadores adicionais para contexto
         df['rsi'] = self.calculate_rsi(df['close'], 14)
@@ -80,67 +88,14 @@ class AISmartTrader:
         rsi = 100 - (100 / (1 + rs))
         return rsi.fillna(50)
     
-    def prepare_ai_context(self, df, index):
-        """Prepara contexto completo para a IA"""
-        if index < 250:  # Precisa de histórico para Bollinger Bands
-            return None
-            
-        current = df.iloc[index]
-        recent = df.iloc[max(0, index-10):index+1]  # Últimos 10 períodos
-        
-        # Verificar sinais de exaustão recentes (últimos 5 períodos)
-        recent_exhaustion_buy = df.iloc[max(0, index-5):index+1]['exhaustion_buy'].any()
-        recent_exhaustion_sell = df.iloc[max(0, index-5):index+1]['exhaustion_sell'].any()
-        
-        # Contar períodos desde última exaustão
-        periods_since_buy_exhaustion = 0
-        periods_since_sell_exhaustion = 0
-        
-        for i in range(index, max(0, index-20), -1):
-            if df.iloc[i]['exhaustion_buy'] and periods_since_buy_exhaustion == 0:
-                periods_since_buy_exhaustion = index - i
-            if df.iloc[i]['exhaustion_sell'] and periods_since_sell_exhaustion == 0:
-                periods_since_sell_exhaustion = index - i
-        
-        # Contexto do mercado
-        price_change_1 = ((current['close'] - df.iloc[index-1]['close']) / df.iloc[index-1]['close']) * 100
-        price_change_5 = ((current['close'] - df.iloc[index-5]['close']) / df.iloc[index-5]['close']) * 100 if index >= 5 else 0
-        
-        context = {
-            'timestamp': current['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-            'price': current['close'],
-            'volume': current['volume'],
-            'volume_ratio': current['volume_ratio'],
-            
-            # Sua estratégia original
-            'ema9': current['ema9'],
-            'distance_ema9': current['distance_ema9'],
-            'bb_upper': current['bb_upper'],
-            'bb_middle': current['bb_middle'],
-            'bb_lower': current['bb_lower'],
-            
-            # Sinais de exaustão ATUAIS
-            'exhaustion_buy_now': bool(current['exhaustion_buy']),
-            'exhaustion_sell_now': bool(current['exhaustion_sell']),
-            'exhaustion_strength_buy': current['exhaustion_strength_buy'],
-            'exhaustion_strength_sell': current['exhaustion_strength_sell'],
-            
-            # Histórico de exaustão
-            'recent_exhaustion_buy': recent_exhaustion_buy,
-            'recent_exhaustion_sell': recent_exhaustion_sell,
-            'periods_since_buy_exhaustion': periods_since_buy_exhaustion,
-            'periods_since_sell_exhaustion': periods_since_sell_exhaustion,
-            
-            # Contexto adicional
-            'rsi': current['rsi'],
-            'price_change_1period': price_change_1,
-            'price_change_5periods': price_change_5,
-            
-            # Situação atual
-            'current_position': self.current_position,
-            'balance': self.balance,
-            'total_trades': len(self.trades)
-        }
+    def prepare_ai_context(self, features, index):
+        """Prepara contexto completo para a IA a partir das colunas pré-calculadas"""
+        context = context_at(features, index)
+        
+        # Situação atual
+        context['current_position'] = self.current_position
+        context['balance'] = self.balance
+        context['total_trades'] = len(self.trades)
         
         return context
     
@@ -157,6 +112,14 @@ class AISmartTrader:
             else:
                 return {'action': 'HOLD', 'confidence': 0.5, 'reason': 'Aguardando melhor momento (fallback)'}
         
+        # Contexto equivalente já decidido? (sem chamada de API)
+        cache_features = {name: context[name] for name in CACHE_FEATURES}
+        cache_features['in_position'] = bool(context['current_position'])
+        if self.decision_cache:
+            cached = self.decision_cache.get(self.CACHE_NAMESPACE, cache_features)
+            if cached:
+                return cached
+        
         prompt = f"""
 Você é um trader expert usando a estratégia Moon Dev de exaustão de mercado.
 
@@ -237,6 +200,8 @@ REGRAS:
                     decision = json.loads(json_str)
                     
                     if decision.get('action') in ['BUY', 'SELL', 'HOLD']:
+                        if self.decision_cache:
+                            self.decision_cache.put(self.CACHE_NAMESPACE, cache_features, decision)
                         return decision
             
         except Exception as e:
@@ -245,66 +210,25 @@ REGRAS:
         # Fallback
         return {'action': 'HOLD', 'confidence': 0.5, 'reason': 'API error - aguardando'}
     
-    def execute_trade(self, action, price, context):
-        """Executa trade e registra na equity curve"""
-        timestamp = context['timestamp']
-        
-        if action == 'BUY' and not self.current_position:
-            # Comprar
-            shares = self.balance / price
+    def record_trade(self, event):
+        """Atualiza posição/saldo a cada entrada ou saída do backtest"""
+        if event['type'] == 'BUY':
             self.current_position = {
                 'type': 'LONG',
-                'entry_price': price,
-                'shares': shares,
-                'entry_time': timestamp,
-                'entry_context': context.copy()
-            }
-            
-            cprint(f"🟢 COMPRA: ${price:.2f} | Ações: {shares:.4f} | Exaustão: {context['exhaustion_buy_now']}", "green")
-            
-        elif action == 'SELL' and self.current_position:
-            # Vender
-            entry_price = self.current_position['entry_price']
-            shares = self.current_position['shares']
-            
-            # Calcular P&L
-            pnl = (price - entry_price) * shares
-            pnl_pct = ((price / entry_price) - 1) * 100
-            
-            # Atualizar saldo
-            self.balance = shares * price
-            
-            # Registrar trade
-            trade = {
-                'entry_time': self.current_position['entry_time'],
-                'exit_time': timestamp,
-                'entry_price': entry_price,
-                'exit_price': price,
-                'shares': shares,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'entry_exhaustion': self.current_position['entry_context'].get('exhaustion_buy_now', False),
-                'exit_exhaustion': context.get('exhaustion_sell_now', False),
-                'entry_strength': self.current_position['entry_context'].get('exhaustion_strength_buy', 0),
-                'exit_strength': context.get('exhaustion_strength_sell', 0)
+                'entry_price': event['entry_price'],
+                'shares': event['shares'],
+                'entry_index': event['entry_index'],
             }
-            
+            cprint(f"🟢 COMPRA: ${event['entry_price']:.2f} | Ações: {event['shares']:.4f} | Exaustão: {event['entry_exhaustion']}", "green")
+        else:
+            trade = {k: v for k, v in event.items() if k != 'type'}
             self.trades.append(trade)
+            self.balance = trade['shares'] * trade['exit_price']
             self.current_position = None
             
-            color = "green" if pnl > 0 else "red"
-            cprint(f"🔴 VENDA: ${price:.2f} | P&L: ${pnl:.2f} ({pnl_pct:+.2f}%) | Exaustão: {context['exhaustion_sell_now']}", color)
-        
-        # Registrar equity curve
-        current_equity = self.balance
-        if self.current_position:
-            current_equity = self.current_position['shares'] * price
-        
-        self.equity_curve.append({
-            'timestamp': timestamp,
-            'equity': current_equity,
-            'price': price
-        })
+            color = "green" if trade['pnl'] > 0 else "red"
+            cprint(f"🔴 VENDA: ${trade['exit_price']:.2f} | P&L: ${trade['pnl']:.2f} ({trade['pnl_pct']:+.2f}%) | "
+                   f"Exaustão: {trade['exit_exhaustion']}", color)
     
     def calculate_advanced_metrics(self):
         """Calcula métricas avançadas incluindo Profit Factor"""
@@ -336,20 +260,14 @@ REGRAS:
         expectancy = (win_rate/100 * avg_win) - ((100-win_rate)/100 * avg_loss)
         
         # Drawdown máximo
-        peak_equity = self.initial_balance
         max_drawdown = 0
         max_drawdown_pct = 0
         
-        for point in self.equity_curve:
-            equity = point['equity']
-            if equity > peak_equity:
-                peak_equity = equity
-            
-            drawdown = peak_equity - equity
-            drawdown_pct = (drawdown / peak_equity) * 100
-            
-            max_drawdown = max(max_drawdown, drawdown)
-            max_drawdown_pct = max(max_drawdown_pct, drawdown_pct)
+        if len(self.equity_curve):
+            peak_equity = np.maximum.accumulate(np.maximum(self.equity_curve, self.initial_balance))
+            drawdown = peak_equity - self.equity_curve
+            max_drawdown = max(0, drawdown.max())
+            max_drawdown_pct = max(0, (drawdown / peak_equity).max() * 100)
         
         # Análise de exaustão
         exhaustion_entry_trades = [t for t in self.trades if t.get('entry_exhaustion', False)]
@@ -376,8 +294,11 @@ REGRAS:
             'avg_exit_strength': np.mean([t.get('exit_strength', 0) for t in self.trades])
         }
     
-    def run_backtest(self, df, sample_size=1000):
-        """Executa backtest com IA decidindo sobre sinais de exaustão"""
+    def run_backtest(self, df, sample_size=1000, candidates=AI_CANDIDATE_FILTER):
+        """
+        Executa backtest com IA decidindo sobre sinais de exaustão (sample_size=None usa todo o histórico).
+        candidates escolhe em quais candles a IA é consultada: 'strict', 'exhaustion' ou 'off'.
+        """
         cprint("🤖 BACKTEST IA SMART TRADER - ESTRATÉGIA MOON DEV", "white", "on_blue")
         cprint("📊 Distância EMA9 + Bollinger Bands + Decisão IA", "white", "on_blue")
         cprint("=" * 60, "blue")
@@ -386,25 +307,24 @@ REGRAS:
         df = self.calculate_strategy_indicators(df)
         
         # Usar amostra se necessário
-        if len(df) > sample_size:
+        if sample_size and len(df) > sample_size:
             df = df.tail(sample_size)
             cprint(f"📊 Usando {len(df)} períodos (dados recentes)", "cyan")
         
         cprint(f"💰 Capital inicial: ${self.initial_balance:,.2f}", "yellow")
         cprint(f"📅 Período: {df['timestamp'].min()} até {df['timestamp'].max()}", "white")
         
+        # Contexto de todos os candles de uma vez (colunas NumPy)
+        features = build_context_features(df)
+        warmup = 250  # Começar após período de aquecimento
+        
         decisions_log = []
         
-        # Executar backtest
-        for i in range(250, len(df)):  # Começar após período de aquecimento
-            context = self.prepare_ai_context(df, i)
-            if not context:
-                continue
-            
-            # IA decide sobre os sinais de exaustão
+        def decide(i, in_position):
+            # IA decide sobre os sinais de exaustão (só nos candles que podem mudar a posição)
+            context = self.prepare_ai_context(features, i)
             decision = self.ask_ai_decision(context)
             
-            # Log da decisão
             decisions_log.append({
                 'timestamp': context['timestamp'],
                 'price': context['price'],
@@ -414,31 +334,29 @@ REGRAS:
                 'exhaustion_buy': context['exhaustion_buy_now'],
                 'exhaustion_sell': context['exhaustion_sell_now']
             })
-            
-            # Executar trade
-            if decision['action'] in ['BUY', 'SELL']:
-                self.execute_trade(decision['action'], context['price'], context)
-            else:
-                # Ainda registrar na equity curve para HOLD
-                current_equity = self.balance
-                if self.current_position:
-                    current_equity = self.current_position['shares'] * context['price']
-                
-                self.equity_curve.append({
-                    'timestamp': context['timestamp'],
-                    'equity': current_equity,
-                    'price': context['price']
-                })
-            
-            # Progresso
-            if len(decisions_log) % 100 == 0:
-                progress = (i / len(df)) * 100
-                cprint(f"⏳ {progress:.1f}% | Decisões: {len(decisions_log)} | Trades: {len(self.trades)}", "cyan")
+            return decision['action']
+        
+        start_time = time.time()
+        result = run_event_backtest(features, decide, self.balance, start=warmup,
+                                    on_trade=self.record_trade, candidates=candidates)
         
         # Fechar posição final
-        if self.current_position:
-            final_context = self.prepare_ai_context(df, len(df)-1)
-            self.execute_trade('SELL', final_context['price'], final_context)
+        final_trade = close_open_position(result, features)
+        if final_trade:
+            self.record_trade(dict(final_trade, type='SELL'))
+        
+        self.equity_curve = result['equity']
+        evaluated = slice(min(warmup, len(df)), len(df))
+        self.backtest_stats = {
+            'bars': len(self.equity_curve),
+            'decisions': result['decisions'],
+            'exhaustion_signals': int((features['exhaustion_buy'][evaluated] | features['exhaustion_sell'][evaluated]).sum()),
+        }
+        avoided = self.backtest_stats['bars'] - result['decisions']
+        avoided_pct = avoided / self.backtest_stats['bars'] * 100 if self.backtest_stats['bars'] else 0
+        cprint(f"🚦 Filtro '{candidates}': {result['decisions']} de {self.backtest_stats['bars']} candles enviados à IA "
+               f"({avoided} chamadas evitadas, {avoided_pct:.1f}%)", "cyan")
+        cprint(f"⚡ {len(self.trades)} trades em {time.time() - start_time:.2f}s", "cyan")
         
         return decisions_log
     
@@ -497,13 +415,13 @@ REGRAS:
         cprint(f"✅ Vencedores: {metrics['winning_trades']}", "green")
         cprint(f"❌ Perdedores: {metrics['losing_trades']}", "red")
         
-        # Decisões da IA
+        # Decisões da IA (candles não consultados contam como HOLD)
         buy_decisions = len([d for d in decisions_log if d['action'] == 'BUY'])
         sell_decisions = len([d for d in decisions_log if d['action'] == 'SELL'])
-        hold_decisions = len([d for d in decisions_log if d['action'] == 'HOLD'])
+        hold_decisions = self.backtest_stats.get('bars', len(decisions_log)) - buy_decisions - sell_decisions
         
         # Análise de sinais vs ações
-        exhaustion_signals = len([d for d in decisions_log if d['exhaustion_buy'] or d['exhaustion_sell']])
+        exhaustion_signals = self.backtest_stats.get('exhaustion_signals', 0)
         actions_on_signals = len([d for d in decisions_log if (d['exhaustion_buy'] or d['exhaustion_sell']) and d['action'] != 'HOLD'])
         
         cprint(f"\n🤖 INTELIGÊNCIA DA IA:", "white", "on_blue")
@@ -514,6 +432,9 @@ REGRAS:
         cprint(f"🔴 Decisões VENDA: {sell_decisions}", "red")
         cprint(f"⚪ Decisões HOLD: {hold_decisions}", "white")
         
+        if self.decision_cache:
+            self.decision_cache.print_stats()
+        
         return metrics
 
 def test_ai_smart_trader(csv_file):
@@ -521,10 +442,7 @@ def test_ai_smart_trader(csv_file):
     cprint(f"🤖 TESTANDO AI SMART TRADER: {csv_file}", "white", "on_blue")
     
     # Carregar dados
-    df = pd.read_csv(csv_file)
-    df.columns = df.columns.str.lower()
-    df['timestamp'] = pd.to_datetime(df['datetime'])
-    df = df.dropna()
+    df = load_csv_data(csv_file)
     
     # Criar trader
     trader = AISmartTrader()
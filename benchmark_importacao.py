@@ -0,0 +1,94 @@
+"""
+🌙 Moon Dev's Import Benchmark
+Mede o tempo de import (interpretador novo a cada rodada) dos módulos usados
+pelos scripts de backtest e mostra quais dependências pesadas cada um carrega.
+Uso: python benchmark_importacao.py [ref_git_para_comparar] (ex: HEAD~1)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import io
+from termcolor import cprint
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RUNS = 7
+
+# Entradas usadas pelos scripts de backtest / simulador
+MODULES = [
+    'src.core.nice_funcs',
+    'src.data.ohlcv_collector',
+    'src.data.streaming_indicators',
+    'src.data.backtest_core',
+]
+HEAVY = ['pandas', 'numpy', 'requests', 'dotenv', 'solders', 'solana']
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print('@@', elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(module, src_root, workdir):
+    """Mediana do tempo de import em `RUNS` interpretadores novos"""
+    env = dict(os.environ, PYTHONPATH=src_root, PYTHONDONTWRITEBYTECODE='1')
+    # Chave fictícia: versões antigas levantavam erro no import sem ela
+    env.setdefault('BIRDEYE_API_KEY', 'benchmark')
+    times = []
+    loaded = ''
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        # Linha marcada: o módulo pode imprimir coisas no import/saída
+        line = next(l for l in result.stdout.splitlines() if l.startswith('@@ '))
+        elapsed, _, loaded = line[3:].partition(' ')
+        times.append(float(elapsed))
+    return statistics.median(times), loaded
+
+
+def export_ref(ref, destination):
+    """Extrai src/ de um commit para comparar"""
+    archive = subprocess.run(['git', 'archive', ref, 'src'], cwd=ROOT, capture_output=True, check=True)
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        tar.extractall(destination)
+
+
+def run_benchmark(ref=None):
+    cprint("⏱️ Moon Dev's Import Benchmark", "white", "on_blue")
+    print(f"Mediana de {RUNS} execuções por módulo (interpretador novo a cada vez)\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        baseline_root = None
+        if ref:
+            baseline_root = os.path.join(workdir, 'baseline')
+            os.makedirs(baseline_root)
+            export_ref(ref, baseline_root)
+
+        for module in MODULES:
+            current, loaded = measure(module, ROOT, workdir)
+            if current is None:
+                cprint(f"❌ {module}: {loaded}", "white", "on_red")
+                continue
+            line = f"{module:<32} {current*1000:8.1f} ms  | carrega: {loaded or '-'}"
+            if baseline_root:
+                before, before_loaded = measure(module, baseline_root, workdir)
+                if before is None:
+                    line += f"\n{'':<32} {ref}: falhou ({before_loaded})"
+                else:
+                    line += (f"\n{'':<32} {before*1000:8.1f} ms  | {ref} carregava: {before_loaded or '-'}"
+                             f"  -> {before / current:.1f}x mais rápido")
+            print(line)
+
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
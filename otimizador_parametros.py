@@ -7,10 +7,13 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.data.custom_indicators_simple import calculate_ema, calculate_bollinger_bands, generate_signals
+from src.data.custom_indicators_simple import calculate_ema, calculate_bollinger_bands, band_signals
+from src.data.ohlcv_store import load_csv_data
+from src.data.parameter_sweep import run_parameter_sweep
 from termcolor import colored, cprint
 import pandas as pd
 import numpy as np
+import time
 
 def test_parameters(df, ema_period=9, bb_period=200, bb_std=2):
     """Testa parâmetros específicos"""
@@ -25,7 +28,7 @@ def test_parameters(df, ema_period=9, bb_period=200, bb_std=2):
         df['bb_lower'] = bb_lower
         
         # Gerar sinais
-        df['signal'], df['signal_strength'] = generate_signals(df)
+        df['signal'], df['signal_strength'] = band_signals(df['distance'].values, bb_upper.values, bb_lower.values)
         
         # Calcular performance
         buy_signals = len(df[df['signal'] == 1])
@@ -57,10 +60,7 @@ def optimize_parameters(csv_file):
     cprint("=" * 60, "blue")
     
     # Carregar dados
-    df = pd.read_csv(csv_file)
-    df.columns = df.columns.str.lower()
-    df['timestamp'] = pd.to_datetime(df['datetime'])
-    df = df.dropna()
+    df = load_csv_data(csv_file)
     
     if len(df) < 500:
         cprint("❌ Dados insuficientes para otimização", "red")
@@ -73,23 +73,15 @@ def optimize_parameters(csv_file):
     bb_periods = [50, 100, 200, 300]
     bb_stds = [1.5, 2.0, 2.5]
     
-    results = []
     total_tests = len(ema_periods) * len(bb_periods) * len(bb_stds)
-    current_test = 0
     
     cprint(f"🧪 Executando {total_tests} testes...", "yellow")
     
-    for ema in ema_periods:
-        for bb_period in bb_periods:
-            for bb_std in bb_stds:
-                current_test += 1
-                if current_test % 10 == 0:
-                    progress = (current_test / total_tests) * 100
-                    cprint(f"⏳ Progresso: {progress:.1f}%", "cyan")
-                
-                result = test_parameters(df.copy(), ema, bb_period, bb_std)
-                if result:
-                    results.append(result)
+    # Varredura vetorizada com a MME de calculate_ema (adjust=False)
+    start_time = time.time()
+    sweep = run_parameter_sweep(df['close'].values, ema_periods, bb_periods, bb_stds, adjust=False)
+    results = sweep.results()
+    cprint(f"⚡ {total_tests} testes concluídos em {time.time() - start_time:.2f}s", "cyan")
     
     if not results:
         cprint("❌ Nenhum resultado válido", "red")
@@ -8,56 +8,34 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.data.custom_indicators_simple import run_complete_analysis
+from src.data.ohlcv_store import load_csv_data
+from src.data.parameter_sweep import run_parameter_sweep
+from src.data.fused_indicators import signal_arrays
+from src.data.feature_cache import cached_fused_indicators
+from src.data.parallel_optimizer import parallel_sweep
 from termcolor import colored, cprint
 import pandas as pd
 import numpy as np
+import time
+
+# Checkpoint da otimização multi-arquivo (permite retomar uma execução interrompida)
+CHECKPOINT_FILE = os.path.join('data', 'otimizacao_checkpoint.jsonl')
 
 def test_single_parameter_set(df, ema_period, bb_period, bb_std):
     """Testa um conjunto específico de parâmetros"""
     try:
-        # Fazer cópia dos dados
-        test_df = df.copy()
-        
-        # Calcular EMA personalizada
-        test_df['ema_custom'] = test_df['close'].ewm(span=ema_period).mean()
-        test_df['distance_custom'] = ((test_df['close'] - test_df['ema_custom']) / test_df['ema_custom']) * 100
-        
-        # Calcular Bollinger Bands personalizadas
-        rolling_mean = test_df['distance_custom'].rolling(window=bb_period).mean()
-        rolling_std = test_df['distance_custom'].rolling(window=bb_period).std()
-        
-        test_df['bb_upper_custom'] = rolling_mean + (rolling_std * bb_std)
-        test_df['bb_lower_custom'] = rolling_mean - (rolling_std * bb_std)
-        
-        # Gerar sinais
-        test_df['signal'] = 0
-        test_df['signal_strength'] = 0.0
-        
-        # Condições
-        buy_condition = test_df['distance_custom'] < test_df['bb_lower_custom']
-        sell_condition = test_df['distance_custom'] > test_df['bb_upper_custom']
-        
-        test_df.loc[buy_condition, 'signal'] = 1
-        test_df.loc[sell_condition, 'signal'] = -1
-        
-        # Força do sinal
-        test_df.loc[buy_condition, 'signal_strength'] = abs(
-            (test_df.loc[buy_condition, 'distance_custom'] - test_df.loc[buy_condition, 'bb_lower_custom']) / 
-            test_df.loc[buy_condition, 'bb_lower_custom']
-        )
-        
-        test_df.loc[sell_condition, 'signal_strength'] = abs(
-            (test_df.loc[sell_condition, 'distance_custom'] - test_df.loc[sell_condition, 'bb_upper_custom']) / 
-            test_df.loc[sell_condition, 'bb_upper_custom']
-        )
+        # EMA, distância, bandas e sinais numa única passada (sem copiar o DataFrame)
+        close = df['close'].values
+        out = cached_fused_indicators(close, ema_period, bb_period, bb_std, adjust=True)
+        signal, strength = signal_arrays(out)
         
         # Calcular métricas
-        buy_signals = len(test_df[test_df['signal'] == 1])
-        sell_signals = len(test_df[test_df['signal'] == -1])
+        buy_signals = int(out['exhaustion_buy'].sum())
+        sell_signals = int(out['exhaustion_sell'].sum())
         
         if buy_signals > 0 and sell_signals > 0:
-            avg_buy = test_df[test_df['signal'] == 1]['close'].mean()
-            avg_sell = test_df[test_df['signal'] == -1]['close'].mean()
+            avg_buy = close[out['exhaustion_buy']].mean()
+            avg_sell = close[out['exhaustion_sell']].mean()
             strategy_return = ((avg_sell / avg_buy) - 1) * 100
             
             return {
@@ -68,8 +46,8 @@ def test_single_parameter_set(df, ema_period, bb_period, bb_std):
                 'sell_signals': sell_signals,
                 'total_signals': buy_signals + sell_signals,
                 'strategy_return': strategy_return,
-                'signal_frequency': (buy_signals + sell_signals) / len(test_df) * 100,
-                'avg_strength': test_df[test_df['signal'] != 0]['signal_strength'].mean()
+                'signal_frequency': (buy_signals + sell_signals) / len(close) * 100,
+                'avg_strength': strength[signal != 0].mean()
             }
     
     except Exception as e:
@@ -84,13 +62,10 @@ def quick_optimization(csv_file, sample_size=5000):
     cprint("=" * 50, "blue")
     
     # Carregar dados
-    df = pd.read_csv(csv_file)
-    df.columns = df.columns.str.lower()
-    df['timestamp'] = pd.to_datetime(df['datetime'])
-    df = df.dropna()
+    df = load_csv_data(csv_file)
     
-    # Usar amostra para acelerar
-    if len(df) > sample_size:
+    # Usar amostra para acelerar (sample_size=None usa o histórico completo)
+    if sample_size and len(df) > sample_size:
         df = df.tail(sample_size)  # Usar dados mais recentes
         cprint(f"📊 Usando amostra de {len(df)} períodos (dados recentes)", "cyan")
     else:
@@ -101,18 +76,20 @@ def quick_optimization(csv_file, sample_size=5000):
     bb_periods = [50, 100, 200]
     bb_stds = [1.5, 2.0, 2.5]
     
-    results = []
     total_tests = len(ema_periods) * len(bb_periods) * len(bb_stds)
     
     cprint(f"🧪 Testando {total_tests} combinações...", "yellow")
     
-    for i, ema in enumerate(ema_periods):
-        for j, bb_period in enumerate(bb_periods):
-            for k, bb_std in enumerate(bb_stds):
-                result = test_single_parameter_set(df, ema, bb_period, bb_std)
-                if result:
-                    results.append(result)
+    # Varredura vetorizada (mesmos números de test_single_parameter_set)
+    start_time = time.time()
+    sweep = run_parameter_sweep(df['close'].values, ema_periods, bb_periods, bb_stds, adjust=True)
+    results = sweep.results()
+    cprint(f"⚡ Varredura concluída em {time.time() - start_time:.2f}s", "cyan")
     
+    return report_results(results)
+
+def report_results(results):
+    """Mostra o top 5 e a configuração recomendada, retorna a melhor"""
     if not results:
         cprint("❌ Nenhum resultado válido encontrado", "red")
         return
@@ -144,11 +121,11 @@ def quick_optimization(csv_file, sample_size=5000):
     
     return best
 
-def test_multiple_files():
-    """Testa otimização em múltiplos arquivos"""
+def test_multiple_files(sample_size=5000, max_workers=None, checkpoint_file=CHECKPOINT_FILE):
+    """Testa otimização em múltiplos arquivos (em paralelo, com checkpoint para retomar)"""
     import glob
     
-    csv_files = glob.glob("*.csv")
+    csv_files = sorted(glob.glob("*.csv"))
     
     if not csv_files:
         cprint("❌ Nenhum arquivo CSV encontrado!", "red")
@@ -157,11 +134,25 @@ def test_multiple_files():
     cprint("🌙 OTIMIZAÇÃO MULTI-ARQUIVO", "white", "on_blue")
     cprint("=" * 50, "blue")
     
+    # Mesma grade de quick_optimization, uma unidade de trabalho por (arquivo, EMA)
+    ema_periods = [5, 9, 14, 21]
+    bb_periods = [50, 100, 200]
+    bb_stds = [1.5, 2.0, 2.5]
+    
+    def show_progress(csv_file, ema_period, results):
+        cprint(f"✅ Pronto: {csv_file} EMA {ema_period} ({len(results)} configurações válidas)", "cyan")
+    
+    start_time = time.time()
+    results_by_file = parallel_sweep(csv_files, ema_periods, bb_periods, bb_stds, adjust=True,
+                                     sample_size=sample_size, max_workers=max_workers,
+                                     checkpoint_file=checkpoint_file, on_result=show_progress)
+    cprint(f"⚡ {len(csv_files)} arquivos otimizados em {time.time() - start_time:.2f}s", "cyan")
+    
     all_results = {}
     
     for csv_file in csv_files:
-        cprint(f"\n📁 Processando: {csv_file}", "white")
-        result = quick_optimization(csv_file)
+        cprint(f"\n📁 Resultados: {csv_file}", "white")
+        result = report_results(results_by_file[csv_file])
         if result:
             all_results[csv_file] = result
     
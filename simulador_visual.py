@@ -13,6 +13,7 @@ try:
     from src.data.custom_indicators import *
 except ImportError:
     from src.data.custom_indicators_simple import *
+from src.data.streaming_indicators import StreamingExhaustionIndicator
 from src.core.config import MONITORED_TOKENS
 from termcolor import colored, cprint
 import pandas as pd
@@ -111,14 +112,15 @@ def simulate_trading_session(token, periods=20):
             cprint(f"❌ Dados insuficientes para {token}", "white", "on_red")
             return
         
-        # Aplicar indicadores
-        data = calculate_distance_mme9(data)
-        data = calculate_bollinger_on_distance(data)
-        data = detect_exhaustion_signals(data)
-        
         # Simular últimos períodos
         start_idx = max(200, len(data) - periods)
         
+        # Indicadores incrementais: aquece com o histórico e atualiza 1 candle por vez
+        close_col = 'close' if 'close' in data.columns else 'Close'
+        closes = data[close_col].values
+        indicator = StreamingExhaustionIndicator()
+        row = indicator.warm_up(closes[:start_idx])
+        
         portfolio_value = 1000  # Começar com $1000 simulados
         position = 0  # 0 = sem posição, 1 = comprado, -1 = vendido
         entry_price = 0
@@ -129,8 +131,7 @@ def simulate_trading_session(token, periods=20):
         print("=" * 80)
         
         for i in range(start_idx, len(data)):
-            current_data = data.iloc[:i+1]
-            row = current_data.iloc[-1]
+            row = indicator.update(closes[i])
             
             print(f"\n⏰ Período {i+1-start_idx+1}/{periods}")
             print(f"💲 Preço: ${row['close']:.6f}")
@@ -219,12 +220,11 @@ def simulate_trading_session(token, periods=20):
         
         # Fechar posição final se necessário
         if position != 0:
-            final_row = data.iloc[-1]
             if position == 1:
-                final_profit = (final_row['close'] - entry_price) / entry_price * portfolio_value
+                final_profit = (row['close'] - entry_price) / entry_price * portfolio_value
                 print(f"📊 P&L da posição aberta: ${final_profit:+.2f}")
             else:
-                final_profit = (entry_price - final_row['close']) / entry_price * portfolio_value
+                final_profit = (entry_price - row['close']) / entry_price * portfolio_value
                 print(f"📊 P&L da posição aberta: ${final_profit:+.2f}")
         
     except Exception as e:
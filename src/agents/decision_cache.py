@@ -0,0 +1,162 @@
+"""
+🌙 Moon Dev's AI Decision Cache
+Persistent SQLite cache for LLM trading decisions, keyed by a canonical hash
+of the quantized strategy context, with TTL + LRU eviction and hit/miss stats.
+Built with love by Moon Dev 🚀
+"""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from termcolor import cprint
+
+from ..core.config import (
+    DECISION_CACHE_FILE,
+    DECISION_CACHE_TTL_HOURS,
+    DECISION_CACHE_MAX_ENTRIES,
+    DECISION_CACHE_DEFAULT_PRECISION,
+    DECISION_CACHE_PRECISION,
+)
+
+
+def quantize_features(features, precision=None, default_precision=DECISION_CACHE_DEFAULT_PRECISION):
+    """
+    Canonical form of a feature dict: floats become integer multiples of their
+    rounding step, NaN becomes None and everything else is kept as is.
+    """
+    precision = DECISION_CACHE_PRECISION if precision is None else precision
+    quantized = {}
+    for name, value in features.items():
+        if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+            quantized[name] = value
+            continue
+        value = float(value)
+        if math.isnan(value):
+            quantized[name] = None
+        elif math.isinf(value):
+            quantized[name] = 'inf' if value > 0 else '-inf'
+        else:
+            quantized[name] = int(round(value / precision.get(name, default_precision)))
+    return quantized
+
+
+class DecisionCache:
+    """
+    Maps (namespace, quantized features) -> decision (any JSON value).
+
+    The namespace should hold everything that changes the answer besides the
+    features (agent, model, token...). Expired entries count as misses; when
+    the table grows past max_entries the least recently used rows are dropped.
+    """
+
+    def __init__(self, path=DECISION_CACHE_FILE, ttl_hours=DECISION_CACHE_TTL_HOURS,
+                 max_entries=DECISION_CACHE_MAX_ENTRIES, precision=None):
+        self.path = path
+        self.ttl = ttl_hours * 3600 if ttl_hours else None
+        self.max_entries = max_entries
+        self.precision = precision
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evicted': 0}
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS decisions (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_decisions_last_used ON decisions(last_used)')
+        self.conn.commit()
+
+    def make_key(self, namespace, features):
+        """sha256 of the canonical JSON of namespace + quantized features"""
+        canonical = json.dumps(
+            {'namespace': namespace, 'features': quantize_features(features, self.precision)},
+            sort_keys=True, separators=(',', ':'),
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, namespace, features):
+        """Cached decision or None"""
+        key = self.make_key(namespace, features)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT value, created_at FROM decisions WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self.conn.execute('DELETE FROM decisions WHERE key = ?', (key,))
+                self.conn.commit()
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self.conn.execute('UPDATE decisions SET last_used = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+            self.stats['hits'] += 1
+        return json.loads(value)
+
+    def put(self, namespace, features, decision):
+        """Store a decision, evicting least recently used rows if needed"""
+        key = self.make_key(namespace, features)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO decisions (key, namespace, value, created_at, last_used) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, namespace, json.dumps(decision), now, now),
+            )
+            self.stats['writes'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        count = self.conn.execute('SELECT COUNT(*) FROM decisions').fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        # Drop a little extra so we don't evict on every single write
+        excess += self.max_entries // 10
+        cursor = self.conn.execute(
+            'DELETE FROM decisions WHERE key IN '
+            '(SELECT key FROM decisions ORDER BY last_used ASC LIMIT ?)', (excess,)
+        )
+        self.stats['evicted'] += cursor.rowcount
+
+    def clear(self, namespace=None):
+        with self.lock:
+            if namespace is None:
+                self.conn.execute('DELETE FROM decisions')
+            else:
+                self.conn.execute('DELETE FROM decisions WHERE namespace = ?', (namespace,))
+            self.conn.commit()
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def print_stats(self):
+        stats = self.stats
+        cprint(f"🧠 Decision cache: {stats['hits']} hits | {stats['misses']} misses "
+               f"({self.hit_rate()*100:.1f}% hit rate) | {stats['expired']} expired | "
+               f"{stats['evicted']} evicted", "white", "on_blue")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
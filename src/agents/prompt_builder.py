@@ -0,0 +1,94 @@
+"""
+🌙 Moon Dev's Prompt Builder
+Turns the latest candles + strategy columns into a small fixed-schema CSV
+block for the AI, straight from NumPy arrays (no to_dict / giant str()).
+The strategy columns are the fused kernel outputs the agent already computed
+for the pre-filter, so the prompt shows exactly the values behind the signal.
+Built with love by Moon Dev 🚀
+"""
+
+import numpy as np
+
+from ..core.config import STRATEGY_MME_PERIOD, STRATEGY_BB_PERIOD, STRATEGY_BB_STD, AI_PROMPT_BARS
+from ..data.feature_cache import cached_fused_indicators
+from ..data.fused_indicators import signal_arrays
+
+# Fixed schema, always in this order (empty cell = not available)
+PROMPT_COLUMNS = [
+    'time', 'open', 'high', 'low', 'close', 'volume',
+    'rsi', 'dist_ema9_pct', 'bb_upper', 'bb_lower', 'signal',
+]
+
+# Accept both the Birdeye frame (Open, Close...) and the store/CSV frame (open, close...)
+TIME_COLUMNS = ['Datetime (UTC)', 'timestamp', 'datetime', 'date']
+
+
+def _column(data, name):
+    for candidate in (name, name.capitalize(), name.upper()):
+        if candidate in data.columns:
+            return data[candidate].to_numpy()
+    return None
+
+
+def _fmt(value):
+    if value is None:
+        return ''
+    value = float(value)
+    if np.isnan(value):
+        return ''
+    return f"{value:.6g}"
+
+
+def strategy_indicators(data):
+    """Fused kernel outputs (EMA, distance, bands, exhaustion) for the strategy settings, or None"""
+    close = _column(data, 'close')
+    if close is None or len(close) == 0:
+        return None
+    return cached_fused_indicators(close, STRATEGY_MME_PERIOD, STRATEGY_BB_PERIOD, STRATEGY_BB_STD, adjust=False)
+
+
+def market_data_block(data, indicators=None, bars=AI_PROMPT_BARS):
+    """
+    CSV block with the last `bars` candles: OHLCV, RSI and the EMA-distance
+    Bollinger columns (signal: 1 = below lower band, -1 = above upper band).
+    indicators: strategy_indicators(data) when the caller already has them.
+    Indicators use the full history; only the tail is formatted.
+    """
+    close = _column(data, 'close')
+    if close is None or len(close) == 0:
+        return "No market data"
+    if indicators is None:
+        indicators = strategy_indicators(data)
+    distance = indicators['distance']
+    upper = indicators['bb_upper']
+    lower = indicators['bb_lower']
+    signal, _ = signal_arrays(indicators)
+
+    tail = slice(max(0, len(close) - bars), len(close))
+    time_values = next((data[col].to_numpy() for col in TIME_COLUMNS if col in data.columns), None)
+    # Strings 'YYYY-MM-DD HH:MM:SS' or datetime64 (compact precision policies) both end up as 'YYYY-MM-DD HH:MM'
+    times = [str(t)[:16].replace('T', ' ') for t in time_values[tail]] if time_values is not None else [''] * (tail.stop - tail.start)
+
+    columns = {
+        'open': _column(data, 'open'),
+        'high': _column(data, 'high'),
+        'low': _column(data, 'low'),
+        'close': close,
+        'volume': _column(data, 'volume'),
+        'rsi': _column(data, 'rsi'),
+        'dist_ema9_pct': distance,
+        'bb_upper': upper,
+        'bb_lower': lower,
+    }
+    tails = {name: (values[tail] if values is not None else None) for name, values in columns.items()}
+    signals = signal[tail]
+
+    lines = [','.join(PROMPT_COLUMNS)]
+    for row, time_value in enumerate(times):
+        cells = [time_value]
+        for name in PROMPT_COLUMNS[1:-1]:
+            values = tails[name]
+            cells.append(_fmt(values[row]) if values is not None else '')
+        cells.append(str(int(signals[row])))
+        lines.append(','.join(cells))
+    return '\n'.join(lines)
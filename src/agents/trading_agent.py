@@ -66,99 +66,330 @@ Remember:
 - Cash must be stored as USDC using USDC_ADDRESS: {USDC_ADDRESS}
 """
 
+# 📦 Batch mode: several tokens answered in one JSON request
+BATCH_PROMPT = """
+You will receive several tokens. Analyse each one independently with the rules above and
+answer ONLY with a JSON object keyed by token address:
+{
+    "<token_address>": {"action": "BUY" | "SELL" | "NOTHING", "confidence": 0-100, "reasoning": "..."},
+    ...
+}
+"""
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+
+import asyncio
 import openai
 import os
+import numpy as np
 import pandas as pd
 import json
 from termcolor import colored, cprint
 from dotenv import load_dotenv
 from ..core.config import *
 from ..core import nice_funcs as n  # Import nice_funcs as n
+from ..core import http_client
 from ..data.ohlcv_collector import collect_all_tokens
+from .decision_cache import DecisionCache
+from .prompt_builder import market_data_block, strategy_indicators
 from datetime import datetime, timedelta
 import time
 
 # Load environment variables
 load_dotenv()
 
+def _trailing_run(mask):
+    """How many bars at the end of mask are True in a row"""
+    if mask.all():
+        return len(mask)
+    return int(np.argmin(mask[::-1]))
+
+def strategy_features(indicators):
+    """
+    Last-bar strategy state for the AI pre-filter and the decision cache key (no prices),
+    from the strategy_indicators outputs the prompt block also uses
+    """
+    if indicators is None or len(indicators['distance']) == 0:
+        return None
+    buy = indicators['exhaustion_buy']
+    sell = indicators['exhaustion_sell']
+    was_buy = len(buy) > 1 and bool(buy[-2])
+    was_sell = len(sell) > 1 and bool(sell[-2])
+    return {
+        'distance_ema9': float(indicators['distance'][-1]),
+        'bb_upper': float(indicators['bb_upper'][-1]),
+        'bb_lower': float(indicators['bb_lower'][-1]),
+        'exhaustion_buy_now': bool(buy[-1]),
+        'exhaustion_sell_now': bool(sell[-1]),
+        'reversal_up': was_buy and not buy[-1],
+        'reversal_down': was_sell and not sell[-1],
+        'periods_exhaustion_up': _trailing_run(sell),
+        'periods_exhaustion_down': _trailing_run(buy),
+    }
+
 class TradingAgent:
-    def __init__(self):
-        """Initialize the AI Trading Agent with Moon Dev's magic ✨"""
+    def __init__(self, decision_cache=None):
+        """
+        Initialize the AI Trading Agent with Moon Dev's magic ✨
+        decision_cache: DecisionCache shared across runs (owned and closed by the caller), None = no cache
+        """
         api_key = os.getenv("DEEPSEEK_API_KEY")
         if not api_key:
             raise ValueError("🚨 DEEPSEEK_API_KEY not found in environment variables!")
             
         # Configure OpenAI client for DeepSeek
+        self.api_key = api_key
         self.client = openai.OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url=DEEPSEEK_BASE_URL
         )
         self.recommendations_df = pd.DataFrame(columns=['token', 'action', 'confidence', 'reasoning'])
+        self.decision_cache = decision_cache
         print("🤖 Moon Dev's AI Trading Agent initialized with DeepSeek!")
         
-    def analyze_market_data(self, token, market_data):
+    def _analysis_messages(self, market_data):
+        """Prompt for a single token analysis"""
+        # Extrair o resumo da estratégia se disponível
+        strategy_summary = market_data.get('strategy_summary', 'Resumo da estratégia não disponível')
+        return [
+            {
+                "role": "user", 
+                "content": (
+                    f"{TRADING_PROMPT}\n\nStrategy Analysis:\n{strategy_summary}\n\n"
+                    f"Recent Market Data (last {AI_PROMPT_BARS} bars, CSV):\n{market_data.get('market_block', 'Não disponível')}"
+                )
+            }
+        ]
+    
+    def _cached_analysis(self, token, features):
+        """Cached answer for this token in an equivalent strategy state, or None"""
+        if not (self.decision_cache and features):
+            return None
+        content = self.decision_cache.get(f"trading_agent:{AI_MODEL}:{token}", features)
+        if content:
+            cprint(f"🧠 Reusing cached AI decision for {token[:4]}", "white", "on_blue")
+        return content
+    
+    def _cache_analysis(self, token, features, content):
+        if self.decision_cache and features:
+            self.decision_cache.put(f"trading_agent:{AI_MODEL}:{token}", features, content)
+    
+    def _record_analysis(self, token, content):
+        """Parse a model answer (first line = action) into recommendations_df"""
+        lines = content.split('\n')
+        action = lines[0].strip() if lines else "NOTHING"
+        
+        # Extract confidence from the response (assuming it's mentioned as a percentage)
+        confidence = 0
+        for line in lines:
+            if 'confidence' in line.lower():
+                # Extract number from string like "Confidence: 75%"
+                try:
+                    confidence = int(''.join(filter(str.isdigit, line)))
+                except:
+                    confidence = 50  # Default if not found
+        
+        # Add to recommendations DataFrame with proper reasoning
+        reasoning = '\n'.join(lines[1:]) if len(lines) > 1 else "No detailed reasoning provided"
+        self.recommendations_df = pd.concat([
+            self.recommendations_df,
+            pd.DataFrame([{
+                'token': token,
+                'action': action,
+                'confidence': confidence,
+                'reasoning': reasoning
+            }])
+        ], ignore_index=True)
+        
+        print(f"🎯 Moon Dev's AI Analysis Complete for {token[:4]}!")
+    
+    def _record_error(self, token, error):
+        print(f"❌ Error in AI analysis for {token[:4]}: {str(error)}")
+        # Still add to DataFrame even on error, but mark as NOTHING with 0 confidence
+        self.recommendations_df = pd.concat([
+            self.recommendations_df,
+            pd.DataFrame([{
+                'token': token,
+                'action': "NOTHING",
+                'confidence': 0,
+                'reasoning': f"Error during analysis: {str(error)}"
+            }])
+        ], ignore_index=True)
+    
+    def analyze_market_data(self, token, market_data, features=None):
         """Analyze market data using DeepSeek with custom strategy"""
         try:
-            # Extrair o resumo da estratégia se disponível
-            strategy_summary = market_data.get('strategy_summary', 'Resumo da estratégia não disponível')
-            
-            response = self.client.chat.completions.create(
-                model=AI_MODEL,
-                max_tokens=AI_MAX_TOKENS,
-                temperature=AI_TEMPERATURE,
-                messages=[
-                    {
-                        "role": "user", 
-                        "content": f"{TRADING_PROMPT}\n\nStrategy Analysis:\n{strategy_summary}\n\nRaw Market Data:\n{str(market_data)[:1000]}..."
-                    }
-                ]
-            )
-            
-            # Parse the response from DeepSeek
-            content = response.choices[0].message.content
-            
-            lines = content.split('\n')
-            action = lines[0].strip() if lines else "NOTHING"
-            
-            # Extract confidence from the response (assuming it's mentioned as a percentage)
-            confidence = 0
-            for line in lines:
-                if 'confidence' in line.lower():
-                    # Extract number from string like "Confidence: 75%"
-                    try:
-                        confidence = int(''.join(filter(str.isdigit, line)))
-                    except:
-                        confidence = 50  # Default if not found
+            content = self._cached_analysis(token, features)
             
-            # Add to recommendations DataFrame with proper reasoning
-            reasoning = '\n'.join(lines[1:]) if len(lines) > 1 else "No detailed reasoning provided"
-            self.recommendations_df = pd.concat([
-                self.recommendations_df,
-                pd.DataFrame([{
-                    'token': token,
-                    'action': action,
-                    'confidence': confidence,
-                    'reasoning': reasoning
-                }])
-            ], ignore_index=True)
+            if content is None:
+                response = self.client.chat.completions.create(
+                    model=AI_MODEL,
+                    max_tokens=AI_MAX_TOKENS,
+                    temperature=AI_TEMPERATURE,
+                    messages=self._analysis_messages(market_data),
+                    timeout=AI_REQUEST_TIMEOUT
+                )
+                
+                # Parse the response from DeepSeek
+                content = response.choices[0].message.content
+                self._cache_analysis(token, features, content)
             
-            print(f"🎯 Moon Dev's AI Analysis Complete for {token[:4]}!")
+            self._record_analysis(token, content)
             return content
             
         except Exception as e:
-            print(f"❌ Error in AI analysis: {str(e)}")
-            # Still add to DataFrame even on error, but mark as NOTHING with 0 confidence
-            self.recommendations_df = pd.concat([
-                self.recommendations_df,
-                pd.DataFrame([{
-                    'token': token,
-                    'action': "NOTHING",
-                    'confidence': 0,
-                    'reasoning': f"Error during analysis: {str(e)}"
-                }])
-            ], ignore_index=True)
+            self._record_error(token, e)
             return None
     
+    async def _analyze_one_async(self, client, semaphore, token, market_data, features):
+        """One token through the async client (bounded by the semaphore, with a timeout)"""
+        content = self._cached_analysis(token, features)
+        if content is None:
+            async with semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=AI_MODEL,
+                        max_tokens=AI_MAX_TOKENS,
+                        temperature=AI_TEMPERATURE,
+                        messages=self._analysis_messages(market_data)
+                    ),
+                    timeout=AI_REQUEST_TIMEOUT
+                )
+            content = response.choices[0].message.content
+            self._cache_analysis(token, features, content)
+        return {token: content}
+    
+    async def _analyze_batch_async(self, client, semaphore, jobs):
+        """Several tokens in one structured JSON request"""
+        results = {}
+        pending = []
+        for token, market_data, features in jobs:
+            content = self._cached_analysis(token, features)
+            if content is None:
+                pending.append((token, market_data, features))
+            else:
+                results[token] = content
+        if not pending:
+            return results
+        
+        sections = "\n\n".join(
+            f"### TOKEN {token}\nStrategy Analysis:\n{market_data.get('strategy_summary', 'Não disponível')}\n"
+            f"Recent Market Data (CSV):\n{market_data.get('market_block', 'Não disponível')}"
+            for token, market_data, _ in pending
+        )
+        prompt = (
+            f"{TRADING_PROMPT}\n\n{BATCH_PROMPT}\n\nTokens: {[token for token, _, _ in pending]}\n\n{sections}"
+        )
+        try:
+            async with semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=AI_MODEL,
+                        max_tokens=min(AI_MAX_TOKENS * len(pending), AI_MAX_OUTPUT_TOKENS),
+                        temperature=AI_TEMPERATURE,
+                        messages=[{"role": "user", "content": prompt}]
+                    ),
+                    timeout=AI_REQUEST_TIMEOUT
+                )
+            answer = response.choices[0].message.content
+            parsed = json.loads(answer[answer.find('{'):answer.rfind('}') + 1])
+        except Exception as e:
+            # Keep this chunk's cache hits, only the uncached tokens are reported as errors
+            print(f"❌ AI batch request failed: {type(e).__name__}: {str(e)}")
+            return results
+        
+        for token, _, features in pending:
+            item = parsed.get(token)
+            if not isinstance(item, dict):
+                continue  # Reported as an error by the caller
+            # Same text layout as a single-token answer so parsing and caching stay identical
+            content = (f"{str(item.get('action', 'NOTHING')).upper()}\n"
+                       f"Confidence: {item.get('confidence', 0)}%\n"
+                       f"{item.get('reasoning', '')}")
+            self._cache_analysis(token, features, content)
+            results[token] = content
+        return results
+    
+    async def analyze_tokens_async(self, jobs, batch=False):
+        """
+        Analyze (token, market_data, features) jobs concurrently.
+        At most AI_MAX_CONCURRENT_REQUESTS requests are in flight, each one is
+        cut at AI_REQUEST_TIMEOUT and anything still running after
+        AI_ANALYSIS_DEADLINE is cancelled. Returns {token: content or None}.
+        """
+        client = openai.AsyncOpenAI(api_key=self.api_key, base_url=DEEPSEEK_BASE_URL)
+        semaphore = asyncio.Semaphore(AI_MAX_CONCURRENT_REQUESTS)
+        
+        if batch:
+            chunks = [jobs[i:i + AI_BATCH_SIZE] for i in range(0, len(jobs), AI_BATCH_SIZE)]
+            coros = [self._analyze_batch_async(client, semaphore, chunk) for chunk in chunks]
+        else:
+            coros = [self._analyze_one_async(client, semaphore, *job) for job in jobs]
+        
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        contents = {}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=AI_ANALYSIS_DEADLINE)
+            for task in pending:
+                task.cancel()
+            if pending:
+                cprint(f"⏱️ Cancelled {len(pending)} AI request(s) past the {AI_ANALYSIS_DEADLINE}s deadline", "white", "on_yellow")
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    contents.update(task.result())
+                else:
+                    print(f"❌ AI request failed: {type(error).__name__}: {str(error)}")
+        finally:
+            await client.close()
+        
+        # Record in the original token order; anything missing becomes NOTHING
+        for token, _, _ in jobs:
+            content = contents.get(token)
+            if content is None:
+                self._record_error(token, "no answer (timeout, cancellation or API error)")
+            else:
+                self._record_analysis(token, content)
+        return {token: contents.get(token) for token, _, _ in jobs}
+    
+    def analyze_tokens(self, jobs, mode=AI_ANALYSIS_MODE):
+        """Analyze every job with the configured mode: 'serial', 'async' or 'batch'"""
+        start_time = time.time()
+        if mode == 'serial' or len(jobs) <= 1:
+            results = {token: self.analyze_market_data(token, market_data, features)
+                       for token, market_data, features in jobs}
+        else:
+            results = asyncio.run(self.analyze_tokens_async(jobs, batch=(mode == 'batch')))
+        cprint(f"⚡ Analysed {len(jobs)} token(s) in {time.time() - start_time:.1f}s ({mode})", "white", "on_blue")
+        return results
+    
+    def is_candidate(self, token, features):
+        """Pre-filter: only tokens where the strategy can act are worth an AI call"""
+        if AI_CANDIDATE_FILTER == 'off' or features is None:
+            return True
+        if (features['exhaustion_buy_now'] or features['exhaustion_sell_now'] or
+                features['reversal_up'] or features['reversal_down']):
+            return True
+        # Open positions are always analysed so the AI can decide to exit
+        try:
+            return n.get_token_balance_usd(token) > 0
+        except Exception as e:
+            print(f"⚠️ Couldn't check position for {token[:4]}, analysing anyway: {str(e)}")
+            return True
+    
+    def skip_token(self, token):
+        """Record a filtered token as NOTHING without calling the AI"""
+        self.recommendations_df = pd.concat([
+            self.recommendations_df,
+            pd.DataFrame([{
+                'token': token,
+                'action': "NOTHING",
+                'confidence': 0,
+                'reasoning': "Skipped by pre-filter: no exhaustion/reversal on the last bar and no open position"
+            }])
+        ], ignore_index=True)
+    
     def allocate_portfolio(self, total_size):
         """Allocate portfolio based on recommendations"""
         try:
@@ -312,6 +543,22 @@ def main():
     
     INTERVAL = RUN_INTERVAL_MINUTES * 60  # Convert minutes to seconds
     
+    # One getMultipleAccounts call so order sizing never waits on get_decimals
+    try:
+        n.token_registry.warm(MONITORED_TOKENS)
+    except Exception as e:
+        cprint(f"⚠️ Token registry warm-up failed, decimals will be fetched on demand: {str(e)}", "white", "on_yellow")
+    
+    # One sqlite connection for the whole session, every run's agent shares it
+    decision_cache = DecisionCache() if DECISION_CACHE_ENABLED else None
+    try:
+        run_loop(INTERVAL, decision_cache)
+    finally:
+        if decision_cache:
+            decision_cache.close()
+
+def run_loop(interval, decision_cache):
+    """Collect, analyze and trade every interval seconds until interrupted"""
     while True:
         try:
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -322,11 +569,22 @@ def main():
             market_data = collect_all_tokens()
             
             # Initialize AI agent
-            agent = TradingAgent()
+            agent = TradingAgent(decision_cache)
             
             # Analyze each token's data
+            skipped_tokens = 0
+            jobs = []
             for token, data in market_data.items():
-                cprint(f"\n🤖 AI Agent Analyzing Token: {token}", "white", "on_green")
+                # One kernel pass per token: pre-filter + decision cache key + prompt columns
+                indicators = strategy_indicators(data)
+                features = strategy_features(indicators)
+                if not agent.is_candidate(token, features):
+                    cprint(f"🚦 Skipping {token[:4]}: no exhaustion signal and no open position", "white", "on_blue")
+                    agent.skip_token(token)
+                    skipped_tokens += 1
+                    continue
+                
+                cprint(f"\n🤖 AI Agent Preparing Token: {token}", "white", "on_green")
                 
                 # Mostrar resumo da estratégia primeiro
                 if hasattr(data, 'attrs') and 'strategy_summary' in data.attrs:
@@ -337,14 +595,20 @@ def main():
                 # Preparar dados para análise
                 analysis_data = {
                     'strategy_summary': data.attrs.get('strategy_summary', 'Não disponível') if hasattr(data, 'attrs') else 'Não disponível',
-                    'raw_data': data.to_dict()
+                    'market_block': market_data_block(data, indicators)
                 }
-                
-                analysis = agent.analyze_market_data(token, analysis_data)
+                jobs.append((token, analysis_data, features))
+            
+            # All candidates at once (async / batched per AI_ANALYSIS_MODE)
+            analyses = agent.analyze_tokens(jobs)
+            for token, analysis in analyses.items():
                 print(f"\n🤖 AI Analysis for contract: {token}")
                 print(analysis)
                 print("\n" + "="*50 + "\n")
             
+            if skipped_tokens:
+                cprint(f"🚦 Pre-filter avoided {skipped_tokens}/{len(market_data)} AI calls this run", "white", "on_blue")
+            
             # Show recommendations summary (without reasoning)
             cprint("\n📊 Moon Dev's Trading Recommendations:", "white", "on_blue")
             summary_df = agent.recommendations_df[['token', 'action', 'confidence']].copy()
@@ -379,26 +643,26 @@ def main():
                 print(json.dumps(allocation, indent=4))
                 
                 cprint("\n🎯 Executing allocations...", "white", "on_blue")
+                n.token_prices([token for token in allocation if token != USDC_ADDRESS])  # one request, entries hit the cache
                 agent.execute_allocations(allocation)
                 cprint("\n✨ All allocations executed!", "white", "on_blue")
             else:
                 cprint("\n⚠️ No allocations to execute!", "white", "on_yellow")
             
+            http_client.get_client().print_latency_stats()
+            n.execution_engine.print_fill_stats()
+            n.execution_engine.quotes.print_stats()
+            if agent.decision_cache:
+                agent.decision_cache.print_stats()
+            
             next_run = datetime.now() + timedelta(minutes=RUN_INTERVAL_MINUTES)
             cprint(f"\n⏳ AI Agent run complete. Next run at {next_run.strftime('%Y-%m-%d %H:%M:%S')}", "white", "on_green")
             
-            # Clean up temp data before sleeping
-            cprint("\n🧹 Cleaning up temporary data...", "white", "on_blue")
-            try:
-                for file in os.listdir('temp_data'):
-                    if file.endswith('_latest.csv'):
-                        os.remove(os.path.join('temp_data', file))
-                cprint("✨ Temp data cleaned successfully!", "white", "on_green")
-            except Exception as e:
-                cprint(f"⚠️ Error cleaning temp data: {str(e)}", "white", "on_yellow")
+            # Candles stay in the OHLCV store between runs so the next cycle
+            # only downloads the bars that closed since this one
             
             # Sleep until next interval
-            time.sleep(INTERVAL)
+            time.sleep(interval)
                 
         except KeyboardInterrupt:
             cprint("\n👋 Moon Dev AI Agent shutting down gracefully...", "white", "on_blue")
@@ -407,7 +671,7 @@ def main():
             cprint(f"\n❌ Error: {str(e)}", "white", "on_red")
             cprint("🔧 Moon Dev suggests checking the logs and trying again!", "white", "on_blue")
             # Still sleep and continue on error
-            time.sleep(INTERVAL)
+            time.sleep(interval)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -73,13 +73,7 @@ def bot():
 
             try:
 
-                for i in range(orders_per_open):
-                    n.market_buy(symbol, chunk_size, slippage)
-                    # cprint green background black text
-                    cprint(f'chunk buy submitted of {symbol[-4:]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                    time.sleep(1)
-
-                time.sleep(tx_sleep)
+                n.buy_chunks(symbol, chunk_size, orders_per_open, slippage, prefetch_next=n.another_full_round(size_needed))
 
                 pos = n.get_position(symbol)
                 price = n.token_price(symbol)
@@ -95,13 +89,7 @@ def bot():
                 try:
                     cprint(f'trying again to make the order in 30 seconds.....', 'light_blue', 'on_light_magenta')
                     time.sleep(30)
-                    for i in range(orders_per_open):
-                        n.market_buy(symbol, chunk_size, slippage)
-                        # cprint green background black text
-                        cprint(f'chunk buy submitted of {symbol[-4:]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                        time.sleep(1)
-
-                    time.sleep(tx_sleep)
+                    n.buy_chunks(symbol, chunk_size, orders_per_open, slippage, prefetch_next=n.another_full_round(size_needed))
                     pos = n.get_position(symbol)
                     price = n.token_price(symbol)
                     pos_usd = pos * price
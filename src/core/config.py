@@ -41,6 +41,13 @@ SLEEP_AFTER_CLOSE = 600  # Prevent overtrading
 slippage = 199  # 50% slippage, 500 = 5% and 50 = .5% slippage
 PRIORITY_FEE = 100000  # ~0.02 USD at current SOL prices
 orders_per_open = 3  # Multiple orders for better fill rates
+EXECUTION_MAX_WORKERS = 4  # ⚡ Swaps built/signed/submitted at the same time
+TX_CONFIRM_TIMEOUT = 60  # Seconds to wait for a signature before counting it as timed out
+TX_CONFIRM_POLL_INTERVAL = 0.5  # Seconds between getSignatureStatuses polls
+TX_CONFIRM_COMMITMENT = 'confirmed'  # processed, confirmed or finalized
+BLOCKHASH_CACHE_TTL = 2  # Seconds the execution context reuses getLatestBlockhash (expiry checks)
+QUOTE_MAX_AGE = 10  # 💱 Seconds a prefetched Jupiter quote stays usable
+QUOTE_MAX_PRICE_MOVE = 0.005  # Drop a cached quote when the pair's latest quote moved more than this (0.5%)
 
 # Market maker settings 📊
 buy_under = .0946
@@ -50,6 +57,36 @@ sell_over = 1
 DAYSBACK_4_DATA = 10  # Aumentado para 10 dias para ter dados suficientes para Bollinger 200
 DATA_TIMEFRAME = '3m'  # 1m, 3m, 5m, 15m, 30m, 1H, 2H, 4H, 6H, 8H, 12H, 1D, 3D, 1W, 1M
 SAVE_OHLCV_DATA = False  # 🌙 Set to True to save data permanently, False will only use temp data during run
+OHLCV_STORE_DIR = 'data/ohlcv_store'  # 🗄️ Columnar (.npy) store for permanent data and the bundled CSV histories
+TEMP_OHLCV_STORE_DIR = 'temp_data/ohlcv_store'  # Store used when SAVE_OHLCV_DATA is False (wiped on exit)
+FEATURE_CACHE_ENABLED = True  # 🗃️ Reuse computed strategy features (EMA/BB/exhaustion) across runs of the backtest scripts
+FEATURE_CACHE_DIR = 'data/feature_cache'  # Content-addressed .npy entries (memory-mapped on reuse)
+FEATURE_CACHE_MAX_MB = 512  # Least recently used entries are deleted above this total size
+DATA_PRECISION = 'float64'  # 🗜️ 'float64' = full precision, 'indicators32' = float32 indicators + int8 signals, 'compact' = float32 prices too (check with validar_precisao.py)
+PRECISION_MAX_SIGNAL_MISMATCH = 0.001  # Max fraction of bars whose signal may differ from float64 for a policy to pass validation
+INCREMENTAL_OHLCV_FETCH = True  # ⚡ Only ask Birdeye for candles newer than the last stored bar
+OHLCV_BASE_TIMEFRAME = '3m'  # 🧱 Finest timeframe downloaded per token, coarser ones (15m, 1H, 4H...) are resampled from it
+OHLCV_SYNC_INTERVAL = 15  # Seconds a freshly synced series is reused before asking Birdeye again (timeframe switches are free)
+BIRDEYE_OHLCV_MAX_BARS = 1000  # Candles per Birdeye OHLCV request, longer ranges are paged
+CONCURRENT_COLLECTION = True  # 🧵 Collect all MONITORED_TOKENS in parallel
+COLLECTION_MAX_WORKERS = 8  # Max tokens fetched at the same time
+BIRDEYE_RATE_LIMIT_PER_SEC = 5  # Birdeye requests per second shared by all workers (check your plan's limit)
+PRICE_CACHE_TTL_SECONDS = 5  # 💲 Prices younger than this are reused instead of calling Birdeye again
+MULTI_PRICE_BATCH_SIZE = 100  # Max addresses per Birdeye multi_price request
+TOKEN_REGISTRY_FILE = 'data/token_registry.json'  # 📒 Mint decimals cache (warmed for MONITORED_TOKENS at startup)
+SOLANA_RPC_URL = 'https://api.mainnet-beta.solana.com/'  # Public RPC used for mint metadata lookups
+WALLET_SNAPSHOT_MAX_AGE = 30  # 👛 Seconds a wallet holdings snapshot serves position checks (our own trades refresh it)
+DUST_USD_VALUE = 0.05  # Holdings worth less than this don't count as a position
+POSITION_MAX_AGE = 5  # 📍 Seconds the position tracker's on-chain balances are reused (our own trades refresh them)
+POSITION_POLL_INTERVAL = 1  # Seconds between balance polls while waiting for a fill to land
+POSITION_WAIT_TIMEOUT = 20  # Max seconds to wait for a confirmed fill to show up in the balance
+
+# HTTP client settings 📡 (all Birdeye / Jupiter / Solana RPC calls)
+HTTP_TIMEOUT = 10  # Seconds before a request is abandoned
+HTTP_MAX_RETRIES = 3  # Retries on 429/5xx and connection errors
+HTTP_BACKOFF_BASE = 0.5  # First backoff in seconds, doubles every retry (with jitter)
+HTTP_BACKOFF_MAX = 8  # Cap for a single backoff
+HTTP_POOL_SIZE = 10  # Keep-alive connections per host
 
 # Configurações da Estratégia Distância MME9 + Bollinger Bands 🎯
 STRATEGY_MME_PERIOD = 9  # Período da MME para calcular distância
@@ -60,7 +97,39 @@ STRATEGY_MIN_EXHAUSTION_PERIODS = 2  # Mínimo de períodos em exaustão antes d
 # AI Model Settings 🤖 - DeepSeek
 AI_MODEL = "deepseek-chat"  # DeepSeek model: deepseek-chat, deepseek-coder
 AI_MAX_TOKENS = 1024  # Max tokens for response
+AI_MAX_OUTPUT_TOKENS = 8192  # Model's output limit (deepseek-chat: 8K), caps 'batch' requests
 AI_TEMPERATURE = 0.7  # Creativity vs precision (0-1)
+AI_ANALYSIS_MODE = 'async'  # 'async' = one request per token in parallel, 'batch' = several tokens per JSON request, 'serial' = one by one
+AI_MAX_CONCURRENT_REQUESTS = 5  # Max AI requests in flight at once
+AI_BATCH_SIZE = 10  # Tokens per request in 'batch' mode
+AI_REQUEST_TIMEOUT = 60  # Seconds before a single AI request is abandoned
+AI_ANALYSIS_DEADLINE = 120  # Seconds for the whole analysis phase, slower requests are cancelled
+AI_PROMPT_BARS = 20  # Candles sent to the AI as a compact CSV block (OHLCV + strategy columns)
+
+# AI Candidate Filter 🚦 - which bars/tokens are worth an LLM call
+# 'strict'     = backtest: buy exhaustion while flat, sell exhaustion while in position
+#                live: tokens with exhaustion/reversal on the last bar or an open position
+# 'exhaustion' = backtest: any exhaustion while flat, every bar while in position (live: same as strict)
+# 'off'        = ask the AI on every bar / token
+AI_CANDIDATE_FILTER = 'strict'
+
+# AI Decision Cache 🧠 - reuse answers when the strategy context hasn't really changed
+DECISION_CACHE_ENABLED = True
+DECISION_CACHE_FILE = 'data/decision_cache.sqlite'  # SQLite file shared by the live agent and backtests
+DECISION_CACHE_TTL_HOURS = 24  # Entries older than this are ignored (None = never expire)
+DECISION_CACHE_MAX_ENTRIES = 50000  # Least recently used entries are evicted above this
+DECISION_CACHE_DEFAULT_PRECISION = 0.01  # Rounding step for continuous features not listed below
+DECISION_CACHE_PRECISION = {  # Rounding step per feature (bigger = more cache hits, coarser context)
+    'distance_ema9': 0.05,
+    'bb_upper': 0.05,
+    'bb_lower': 0.05,
+    'exhaustion_strength_buy': 0.05,
+    'exhaustion_strength_sell': 0.05,
+    'rsi': 1.0,
+    'volume_ratio': 0.1,
+    'price_change_1period': 0.1,
+    'price_change_5periods': 0.25,
+}
 
 USDC_ADDRESS = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
 
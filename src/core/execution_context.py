@@ -0,0 +1,83 @@
+"""
+🌙 Moon Dev's Execution Context
+Everything a trade needs that is expensive to rebuild: the parsed keypair,
+a JSON-RPC client on the pooled keep-alive HTTP session and a short-lived
+recent-blockhash cache. Build it once and pass it to the trade functions.
+Built with love by Moon Dev 🚀
+"""
+
+import json
+import os
+import threading
+import time
+
+from src.core.config import BLOCKHASH_CACHE_TTL
+from src.core import http_client as http
+from src.core.utils.env import load_env
+
+MAX_PROCESSING_AGE = 150  # blocks a blockhash stays valid for
+
+
+class ExecutionContext:
+    """Keypair + RPC client + blockhash cache shared by every order"""
+
+    def __init__(self, rpc_url=None, private_key=None, blockhash_ttl=BLOCKHASH_CACHE_TTL):
+        self._rpc_url = rpc_url
+        self._private_key = private_key
+        self.blockhash_ttl = blockhash_ttl
+        self._keypair = None
+        self._blockhash = None
+        self.lock = threading.Lock()
+
+    @property
+    def rpc_url(self):
+        if self._rpc_url is None:
+            load_env()
+            self._rpc_url = os.getenv("RPC_ENDPOINT")
+            if not self._rpc_url:
+                raise ValueError("🚨 RPC_ENDPOINT not found in environment variables!")
+        return self._rpc_url
+
+    @property
+    def keypair(self):
+        """Parsed once, reused by every signature"""
+        if self._keypair is None:
+            with self.lock:
+                if self._keypair is None:
+                    from solders.keypair import Keypair
+                    load_env()
+                    private_key = self._private_key or os.getenv("SOLANA_PRIVATE_KEY")
+                    if not private_key:
+                        raise ValueError("🚨 SOLANA_PRIVATE_KEY not found in environment variables!")
+                    self._keypair = Keypair.from_base58_string(private_key)
+        return self._keypair
+
+    @property
+    def pubkey(self):
+        return str(self.keypair.pubkey())
+
+    def rpc(self, method, params):
+        """JSON-RPC call over the pooled keep-alive session (retries + latency stats included)"""
+        payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+        response = http.post(self.rpc_url, headers={"Content-Type": "application/json"}, data=payload).json()
+        if 'error' in response:
+            raise RuntimeError(f"{method} failed: {response['error']}")
+        return response['result']
+
+    def latest_blockhash(self, max_age=None):
+        """{'blockhash', 'last_valid_block_height', 'fetched_at'}, refreshed after blockhash_ttl seconds"""
+        max_age = self.blockhash_ttl if max_age is None else max_age
+        cached = self._blockhash
+        if cached and time.time() - cached['fetched_at'] <= max_age:
+            return cached
+        value = self.rpc('getLatestBlockhash', [{"commitment": "confirmed"}])['value']
+        self._blockhash = {
+            'blockhash': value['blockhash'],
+            'last_valid_block_height': value['lastValidBlockHeight'],
+            'fetched_at': time.time(),
+        }
+        return self._blockhash
+
+    def block_height(self, max_age=None):
+        """Current block height, derived from the cached latest blockhash (no extra RPC call)"""
+        return self.latest_blockhash(max_age)['last_valid_block_height'] - MAX_PROCESSING_AGE
@@ -0,0 +1,221 @@
+"""
+🌙 Moon Dev's Execution Engine
+Builds and signs Jupiter swap transactions in parallel (quotes come from the
+shared QuoteManager, key and RPC from an ExecutionContext), submits them
+together and waits for them with getSignatureStatuses polling instead of
+fixed sleeps.
+Every fill is timed (build / submit / confirmation) for latency stats.
+Built with love by Moon Dev 🚀
+"""
+
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from termcolor import cprint
+
+from src.core.config import (
+    PRIORITY_FEE,
+    EXECUTION_MAX_WORKERS,
+    TX_CONFIRM_TIMEOUT,
+    TX_CONFIRM_POLL_INTERVAL,
+    TX_CONFIRM_COMMITMENT,
+)
+from src.core import http_client as http
+from src.core.quote_manager import QuoteManager
+from src.core.execution_context import ExecutionContext
+
+JUPITER_SWAP_URL = 'https://quote-api.jup.ag/v6/swap'
+COMMITMENT_LEVELS = {'processed': 0, 'confirmed': 1, 'finalized': 2}
+MAX_SIGNATURES_PER_CALL = 256  # getSignatureStatuses limit
+
+
+class ExecutionEngine:
+    """Concurrent swap submission with confirmation tracking"""
+
+    def __init__(self, ctx=None, max_workers=EXECUTION_MAX_WORKERS,
+                 confirm_timeout=TX_CONFIRM_TIMEOUT, poll_interval=TX_CONFIRM_POLL_INTERVAL,
+                 commitment=TX_CONFIRM_COMMITMENT, quotes=None):
+        self.ctx = ctx or ExecutionContext()
+        self.quotes = quotes or QuoteManager(max_workers=max_workers)
+        self.max_workers = max_workers
+        self.confirm_timeout = confirm_timeout
+        self.poll_interval = poll_interval
+        self.commitment = commitment
+        self.fills = []
+        self.lock = threading.Lock()
+
+    def build_swap(self, input_mint, output_mint, amount, slippage, ctx=None):
+        """
+        Jupiter quote + swap transaction signed with the context's key.
+        Returns (base64 signed transaction, last valid block height).
+        """
+        from solders.transaction import VersionedTransaction
+
+        ctx = ctx or self.ctx
+        quote = self.quotes.get(input_mint, output_mint, amount, slippage)
+        swap = http.post(JUPITER_SWAP_URL,
+                         headers={"Content-Type": "application/json"},
+                         data=json.dumps({
+                             "quoteResponse": quote,
+                             "userPublicKey": ctx.pubkey,
+                             "prioritizationFeeLamports": PRIORITY_FEE,
+                         })).json()
+        unsigned = VersionedTransaction.from_bytes(base64.b64decode(swap['swapTransaction']))
+        signed = VersionedTransaction(unsigned.message, [ctx.keypair])
+        return base64.b64encode(bytes(signed)).decode(), swap.get('lastValidBlockHeight')
+
+    def submit(self, signed_tx, ctx=None):
+        """sendTransaction (skip preflight, like the old send_raw_transaction call), returns the signature"""
+        ctx = ctx or self.ctx
+        return ctx.rpc('sendTransaction', [signed_tx, {"encoding": "base64", "skipPreflight": True}])
+
+    def swap(self, input_mint, output_mint, amount, slippage, ctx=None):
+        """Build, sign and submit one swap without waiting for it"""
+        signed, _ = self.build_swap(input_mint, output_mint, amount, slippage, ctx)
+        return self.submit(signed, ctx)
+
+    def wait_for(self, signatures, timeout=None, ctx=None, expiries=None):
+        """
+        Poll getSignatureStatuses until every signature reaches the target
+        commitment, fails, expires or times out. expiries ({signature: last
+        valid block height}) lets a signature whose blockhash is gone stop
+        early, checked against the context's cached blockhash.
+        Returns {signature: ('confirmed' | 'failed' | 'expired' | 'timeout', seconds waited)}.
+        """
+        ctx = ctx or self.ctx
+        timeout = self.confirm_timeout if timeout is None else timeout
+        expiries = expiries or {}
+        target = COMMITMENT_LEVELS[self.commitment]
+        start = time.perf_counter()
+        pending = list(signatures)
+        results = {}
+
+        while pending:
+            for offset in range(0, len(pending), MAX_SIGNATURES_PER_CALL):
+                batch = pending[offset:offset + MAX_SIGNATURES_PER_CALL]
+                try:
+                    statuses = ctx.rpc('getSignatureStatuses', [batch])['value']
+                except Exception as e:
+                    cprint(f"⚠️ Signature status poll failed: {str(e)}", "white", "on_yellow")
+                    statuses = [None] * len(batch)
+                elapsed = time.perf_counter() - start
+                for signature, status in zip(batch, statuses):
+                    if not status:
+                        continue
+                    if status.get('err') is not None:
+                        results[signature] = ('failed', elapsed)
+                    elif COMMITMENT_LEVELS.get(status.get('confirmationStatus'), -1) >= target:
+                        results[signature] = ('confirmed', elapsed)
+
+            pending = [signature for signature in pending if signature not in results]
+            if pending and any(expiries.get(signature) for signature in pending):
+                try:
+                    height = ctx.block_height()
+                except Exception:
+                    height = None
+                if height is not None:
+                    for signature in pending:
+                        if expiries.get(signature) and height > expiries[signature]:
+                            results[signature] = ('expired', time.perf_counter() - start)
+                    pending = [signature for signature in pending if signature not in results]
+
+            if pending and time.perf_counter() - start >= timeout:
+                for signature in pending:
+                    results[signature] = ('timeout', time.perf_counter() - start)
+                break
+            if pending:
+                time.sleep(self.poll_interval)
+
+        return results
+
+    def prefetch(self, orders, slippage):
+        """
+        Fetch one quote per (input_mint, output_mint, amount) order in the
+        background. Call it right before the next round of the same orders
+        (after confirmations and balance checks), so the quotes are still
+        fresh when execute takes them.
+        """
+        counts = {}
+        for order in orders:
+            counts[tuple(order)] = counts.get(tuple(order), 0) + 1
+        for order, count in counts.items():
+            self.quotes.prefetch(*order, slippage, count=count)
+
+    def execute(self, orders, slippage, wait=True, ctx=None):
+        """
+        Run a batch of (input_mint, output_mint, amount) swaps: build + sign
+        them concurrently, submit them in parallel and (optionally) wait for
+        confirmations. Returns one fill dict per order, in order.
+        """
+        ctx = ctx or self.ctx
+        fills = [{'input': i, 'output': o, 'amount': a, 'signature': None, 'status': 'pending'}
+                 for i, o, a in orders]
+
+        def run(fill):
+            started = time.perf_counter()
+            try:
+                signed, last_valid = self.build_swap(fill['input'], fill['output'], fill['amount'], slippage, ctx)
+                fill['build_time'] = time.perf_counter() - started
+                fill['last_valid_block_height'] = last_valid
+                fill['signature'] = self.submit(signed, ctx)
+                fill['submit_time'] = time.perf_counter() - started
+                fill['status'] = 'submitted'
+            except Exception as e:
+                fill['status'] = 'error'
+                fill['error'] = str(e)
+            return fill
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(fills)) or 1) as executor:
+            list(executor.map(run, fills))
+
+        # Two chunks that came out as the same transaction only land once: count that signature once
+        submitted = []
+        seen = set()
+        for fill in fills:
+            if not fill['signature']:
+                continue
+            if fill['signature'] in seen:
+                fill['status'] = 'duplicate'
+                continue
+            seen.add(fill['signature'])
+            submitted.append(fill)
+
+        if wait and submitted:
+            confirmations = self.wait_for(
+                [fill['signature'] for fill in submitted], ctx=ctx,
+                expiries={fill['signature']: fill['last_valid_block_height'] for fill in submitted},
+            )
+            for fill in submitted:
+                status, waited = confirmations[fill['signature']]
+                fill['status'] = status
+                fill['confirm_time'] = waited
+                fill['fill_time'] = fill['submit_time'] + waited
+
+        with self.lock:
+            self.fills.extend(fills)
+        return fills
+
+    def fill_stats(self):
+        """Counts per status plus average / max time from build start to confirmation"""
+        with self.lock:
+            fills = list(self.fills)
+        stats = {'orders': len(fills)}
+        for fill in fills:
+            stats[fill['status']] = stats.get(fill['status'], 0) + 1
+        times = [fill['fill_time'] for fill in fills if fill['status'] == 'confirmed']
+        if times:
+            stats['avg_fill_time'] = sum(times) / len(times)
+            stats['max_fill_time'] = max(times)
+        return stats
+
+    def print_fill_stats(self):
+        stats = self.fill_stats()
+        if not stats['orders']:
+            return
+        cprint(f"⚡ Execution: {stats['orders']} orders | {stats.get('confirmed', 0)} confirmed | "
+               f"{stats.get('failed', 0)} failed | {stats.get('expired', 0)} expired | {stats.get('timeout', 0)} timeout | "
+               f"{stats.get('duplicate', 0)} duplicates | {stats.get('error', 0)} errors | avg fill {stats.get('avg_fill_time', 0):.2f}s | "
+               f"max fill {stats.get('max_fill_time', 0):.2f}s", "white", "on_blue")
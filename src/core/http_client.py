@@ -0,0 +1,179 @@
+"""
+🌙 Moon Dev's HTTP Client
+One place for every Birdeye / Jupiter / Solana RPC call:
+keep-alive pools per host, default timeouts, retries with backoff + jitter,
+token-bucket rate limits per API key and per-endpoint latency counters.
+Built with love by Moon Dev 🚀
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from termcolor import cprint
+
+from src.core.config import (
+    HTTP_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_POOL_SIZE,
+)
+from src.core.utils.rate_limiter import TokenBucket
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HTTPClient:
+    """Pooled, retrying HTTP client shared by nice_funcs"""
+
+    def __init__(self, timeout=HTTP_TIMEOUT, max_retries=HTTP_MAX_RETRIES,
+                 backoff_base=HTTP_BACKOFF_BASE, backoff_max=HTTP_BACKOFF_MAX,
+                 pool_size=HTTP_POOL_SIZE):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+
+        self.sessions = {}    # host -> requests.Session
+        self.limiters = {}    # api key -> TokenBucket
+        self.stats = {}       # endpoint -> latency counters
+        self.lock = threading.Lock()
+
+    def session_for(self, url):
+        """Keep-alive session for the URL's host (created on first use)"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                # requests is only imported once the first request goes out
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(host, adapter)
+                self.sessions[host] = session
+            return session
+
+    def set_rate_limit(self, api_key, requests_per_second, burst=None):
+        """Throttle every request sent with this API key"""
+        if not api_key:
+            return
+        with self.lock:
+            self.limiters[api_key] = TokenBucket(requests_per_second, burst)
+
+    def _limiter_for(self, headers, rate_key):
+        key = rate_key
+        if key is None and headers:
+            for name, value in headers.items():
+                if name.lower() == 'x-api-key':
+                    key = value
+                    break
+        return self.limiters.get(key) if key else None
+
+    def _backoff(self, attempt, response=None):
+        """Exponential backoff with full jitter, honouring Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record(self, endpoint, elapsed, retries, error):
+        with self.lock:
+            stat = self.stats.setdefault(endpoint, {
+                'count': 0, 'errors': 0, 'retries': 0, 'total_time': 0.0, 'max_time': 0.0
+            })
+            stat['count'] += 1
+            stat['retries'] += retries
+            stat['total_time'] += elapsed
+            stat['max_time'] = max(stat['max_time'], elapsed)
+            if error:
+                stat['errors'] += 1
+
+    def request(self, method, url, rate_key=None, **kwargs):
+        """
+        Send a request, retrying 429/5xx and connection errors.
+        Returns the last response (callers keep checking status_code) and
+        re-raises the last exception if the connection never succeeds.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self._limiter_for(kwargs.get('headers'), rate_key)
+        session = self.session_for(url)
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+
+        import requests
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    self._record(endpoint, time.perf_counter() - start, attempt, True)
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response))
+                attempt += 1
+                continue
+
+            self._record(endpoint, time.perf_counter() - start, attempt, response.status_code >= 400)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def latency_stats(self):
+        """Per-endpoint counters with average latency in seconds"""
+        with self.lock:
+            return {
+                endpoint: dict(stat, avg_time=stat['total_time'] / stat['count'] if stat['count'] else 0.0)
+                for endpoint, stat in self.stats.items()
+            }
+
+    def print_latency_stats(self):
+        stats = self.latency_stats()
+        if not stats:
+            return
+        cprint("\n📡 Moon Dev's API latency report:", "white", "on_blue")
+        for endpoint, stat in sorted(stats.items()):
+            print(f"  {endpoint}: {stat['count']} calls | avg {stat['avg_time']*1000:.0f}ms | "
+                  f"max {stat['max_time']*1000:.0f}ms | retries {stat['retries']} | errors {stat['errors']}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
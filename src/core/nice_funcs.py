@@ -4,45 +4,73 @@ Built with love by Moon Dev 🚀
 """
 
 from src.core.config import *
-import requests
-import pandas as pd
 import pprint
 import re as reggie
 import sys
 import os
 import time
 import json
-import numpy as np
+import threading
 import datetime
 # import pandas_ta as ta  # Comentado temporariamente devido a problemas de compatibilidade
 from datetime import datetime, timedelta
 from termcolor import colored, cprint
-# import solders  # Removido temporariamente
-from dotenv import load_dotenv
 import shutil
 import atexit
-
-# Load environment variables
-load_dotenv()
-
-# Get API keys from environment
-BIRDEYE_API_KEY = os.getenv("BIRDEYE_API_KEY")
-if not BIRDEYE_API_KEY:
-    raise ValueError("🚨 BIRDEYE_API_KEY not found in environment variables!")
+from src.core import http_client as http
+from src.core.utils.env import load_env
+from src.core.wallet_snapshot import WalletSnapshot
+from src.core.token_registry import TokenRegistry
+from src.core.execution_context import ExecutionContext
+from src.core.execution_engine import ExecutionEngine
+from src.core.position_tracker import PositionTracker
+
+# 💤 Importing this module has no side effects: pandas/numpy are imported inside
+# the functions that need them, and .env, the Birdeye key check, the rate limit
+# and temp_data/ are only set up on the first Birdeye call (see birdeye_api_key)
 
 sample_address = "2yXTyarttn2pTZ6cwt4DqmrRuBw1G7pmFv9oT6MStdKP"
 
 BASE_URL = "https://public-api.birdeye.so/defi"
 
-# Create temp directory and register cleanup
-os.makedirs('temp_data', exist_ok=True)
+_runtime_ready = False
+_runtime_lock = threading.Lock()
 
 def cleanup_temp_data():
     if os.path.exists('temp_data'):
         print("🧹 Moon Dev cleaning up temporary data...")
         shutil.rmtree('temp_data')
 
-atexit.register(cleanup_temp_data)
+def _init_runtime():
+    """One-time setup before the first Birdeye request"""
+    global _runtime_ready
+    if _runtime_ready:
+        return
+    with _runtime_lock:
+        if _runtime_ready:
+            return
+        load_env()
+        api_key = os.getenv("BIRDEYE_API_KEY")
+        if not api_key:
+            raise ValueError("🚨 BIRDEYE_API_KEY not found in environment variables!")
+
+        # Every Birdeye call shares one token bucket, even across collector threads
+        http.get_client().set_rate_limit(api_key, BIRDEYE_RATE_LIMIT_PER_SEC)
+
+        # Create temp directory and register cleanup
+        os.makedirs('temp_data', exist_ok=True)
+        atexit.register(cleanup_temp_data)
+        _runtime_ready = True
+
+def birdeye_api_key():
+    _init_runtime()
+    return os.getenv("BIRDEYE_API_KEY")
+
+def __getattr__(name):
+    # n.BIRDEYE_API_KEY keeps working, resolved on first access
+    if name == 'BIRDEYE_API_KEY':
+        return birdeye_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Custom function to print JSON in a human-readable format
 def print_pretty_json(data):
@@ -64,9 +92,9 @@ def token_overview(address):
 
     print(f'Getting the token overview for {address}')
     overview_url = f"{BASE_URL}/token_overview?address={address}"
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
+    headers = {"X-API-KEY": birdeye_api_key()}
 
-    response = requests.get(overview_url, headers=headers)
+    response = http.get(overview_url, headers=headers)
     result = {}
 
     if response.status_code == 200:
@@ -89,8 +117,8 @@ def token_overview(address):
         result['buy_percentage'] = buy_percentage
         result['sell_percentage'] = sell_percentage
 
-        # Check if trade1h is bigger than MIN_TRADES_LAST_HOUR
-        result['minimum_trades_met'] = True if trade1h >= MIN_TRADES_LAST_HOUR else False
+        # Check if trade1h is bigger than minimum_trades_in_last_hour
+        result['minimum_trades_met'] = True if trade1h >= minimum_trades_in_last_hour else False
 
         # Extract price changes over different timeframes
         price_changes = {k: v for k, v in overview_data.items() if 'priceChange' in k}
@@ -184,10 +212,10 @@ def token_security_info(address):
 
     # API endpoint for getting token security information
     url = f"{BASE_URL}/token_security?address={address}"
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
+    headers = {"X-API-KEY": birdeye_api_key()}
 
     # Sending a GET request to the API
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         # Parse the JSON response
@@ -210,10 +238,10 @@ def token_creation_info(address):
     '''
     # API endpoint for getting token creation information
     url = f"{BASE_URL}/token_creation_info?address={address}"
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
+    headers = {"X-API-KEY": birdeye_api_key()}
 
     # Sending a GET request to the API
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         # Parse the JSON response
@@ -222,88 +250,76 @@ def token_creation_info(address):
     else:
         print("Failed to retrieve token creation info:", response.status_code)
 
-def market_buy(token, amount, slippage):
-    import requests
-    import sys
-    import json
-    import base64
-    from solders.keypair import Keypair
-    from solders.transaction import VersionedTransaction
-    from solana.rpc.api import Client
-    from solana.rpc.types import TxOpts
-
-    KEY = Keypair.from_base58_string(os.getenv("SOLANA_PRIVATE_KEY"))
-    if not KEY:
-        raise ValueError("🚨 SOLANA_PRIVATE_KEY not found in environment variables!")
-    #print('key success')
+def market_buy(token, amount, slippage, ctx=None):
+    """USDC -> token swap, returns the transaction signature (doesn't wait for confirmation)"""
     SLIPPAGE = slippage # 5000 is 50%, 500 is 5% and 50 is .5%
-
     QUOTE_TOKEN = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v" # usdc
 
-    http_client = Client(os.getenv("RPC_ENDPOINT"))
-    #print('http client success')
-    if not http_client:
-        raise ValueError("🚨 RPC_ENDPOINT not found in environment variables!")
-
-    quote = requests.get(f'https://quote-api.jup.ag/v6/quote?inputMint={QUOTE_TOKEN}&outputMint={token}&amount={amount}&slippageBps={SLIPPAGE}').json()
-    #print(quote)
-
-    txRes = requests.post('https://quote-api.jup.ag/v6/swap',
-                          headers={"Content-Type": "application/json"},
-                          data=json.dumps({
-                              "quoteResponse": quote,
-                              "userPublicKey": str(KEY.pubkey()),
-                              "prioritizationFeeLamports": PRIORITY_FEE  # or replace 'auto' with your specific lamport value
-                          })).json()
-    #print(txRes)
-    swapTx = base64.b64decode(txRes['swapTransaction'])
-    #print(swapTx)
-    tx1 = VersionedTransaction.from_bytes(swapTx)
-    tx = VersionedTransaction(tx1.message, [KEY])
-    txId = http_client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=True)).value
+    txId = execution_engine.swap(QUOTE_TOKEN, token, amount, SLIPPAGE, ctx)
     print(f"https://solscan.io/tx/{str(txId)}")
+    wallet_snapshot.invalidate()  # our balances just changed
+    position_tracker.invalidate()
+    return txId
 
 
-
-def market_sell(QUOTE_TOKEN, amount, slippage):
-    import requests
-    import sys
-    import json
-    import base64
-    from solders.keypair import Keypair
-    from solders.transaction import VersionedTransaction
-    from solana.rpc.api import Client
-    from solana.rpc.types import TxOpts
-
-    KEY = Keypair.from_base58_string(os.getenv("SOLANA_PRIVATE_KEY"))
-    if not KEY:
-        raise ValueError("🚨 SOLANA_PRIVATE_KEY not found in environment variables!")
-    
+def market_sell(QUOTE_TOKEN, amount, slippage, ctx=None):
+    """token -> USDC swap, returns the transaction signature (doesn't wait for confirmation)"""
     SLIPPAGE = slippage  # 5000 is 50%, 500 is 5% and 50 is .5%
 
     # token would be usdc for sell orders cause we are selling
     token = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC
 
-    http_client = Client(os.getenv("RPC_ENDPOINT"))
-    if not http_client:
-        raise ValueError("🚨 RPC_ENDPOINT not found in environment variables!")
-
-    quote = requests.get(f'https://quote-api.jup.ag/v6/quote?inputMint={QUOTE_TOKEN}&outputMint={token}&amount={amount}&slippageBps={SLIPPAGE}').json()
-    
-    txRes = requests.post('https://quote-api.jup.ag/v6/swap',
-                          headers={"Content-Type": "application/json"},
-                          data=json.dumps({
-                              "quoteResponse": quote,
-                              "userPublicKey": str(KEY.pubkey()),
-                              "prioritizationFeeLamports": PRIORITY_FEE
-                          })).json()
-    
-    swapTx = base64.b64decode(txRes['swapTransaction'])
-    tx1 = VersionedTransaction.from_bytes(swapTx)
-    tx = VersionedTransaction(tx1.message, [KEY])
-    txId = http_client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=True)).value
+    txId = execution_engine.swap(QUOTE_TOKEN, token, amount, SLIPPAGE, ctx)
     print(f"https://solscan.io/tx/{str(txId)}")
+    wallet_snapshot.invalidate()  # our balances just changed
+    position_tracker.invalidate()
+    return txId
+
+
+def execute_chunks(orders, slippage, label='chunk', watch=None, ctx=None, prefetch_next=False):
+    """
+    Send (input_mint, output_mint, amount) swaps together and wait for their
+    confirmations (replaces the sleep between orders + tx_sleep). With watch
+    (a mint), also waits until the position tracker sees its balance move.
+    prefetch_next: the same orders follow next round, have their quotes ready.
+    Raises if none of them could be submitted, so callers keep their retry path.
+    """
+    previous = position_tracker.balance(watch, max_age=0) if watch else None
+    fills = execution_engine.execute(orders, slippage, ctx=ctx)
+    wallet_snapshot.invalidate()  # our balances just changed
+    position_tracker.invalidate()
+
+    if watch and any(fill['status'] == 'confirmed' for fill in fills):
+        position_tracker.wait_for_change(watch, previous, timeout=POSITION_WAIT_TIMEOUT)
+
+    # Quotes for the next round fetch while the caller re-reads position and price
+    if prefetch_next:
+        execution_engine.prefetch(orders, slippage)
+
+    for i, fill in enumerate(fills):
+        if fill['signature']:
+            cprint(f"{label} {i+1}/{len(fills)} {fill['status']} in {fill.get('fill_time', fill.get('submit_time', 0)):.1f}s "
+                   f"https://solscan.io/tx/{fill['signature']}", 'white', 'on_blue')
+        else:
+            cprint(f"{label} {i+1}/{len(fills)} error: {fill.get('error')}", 'white', 'on_red')
+
+    if not any(fill['signature'] for fill in fills):
+        raise RuntimeError(f"no {label} order could be submitted")
+    return fills
+
+def buy_chunks(symbol, chunk_size, count, slippage, ctx=None, prefetch_next=False):
+    """count USDC -> symbol buys of chunk_size, sent at once"""
+    return execute_chunks([(USDC_ADDRESS, symbol, chunk_size)] * count, slippage, label='chunk buy', watch=symbol,
+                          ctx=ctx, prefetch_next=prefetch_next)
 
+def sell_chunks(symbol, sizes, slippage, ctx=None, prefetch_next=False):
+    """symbol -> USDC sells, one per size, sent at once"""
+    return execute_chunks([(symbol, USDC_ADDRESS, size) for size in sizes], slippage, label='chunk sell', watch=symbol,
+                          ctx=ctx, prefetch_next=prefetch_next)
+
+def another_full_round(size_needed):
+    """True when, after this round of orders_per_open chunks, the next round still buys full max_usd_order_size chunks"""
+    return size_needed > (orders_per_open + 1) * max_usd_order_size
 
 
 def get_time_range():
@@ -332,81 +348,150 @@ def get_time_range(days_back):
 
     return time_from, time_to
 
-def get_data(address, days_back_4_data, timeframe):
-    time_from, time_to = get_time_range(days_back_4_data)
+def _birdeye_frame(timestamps, columns):
+    """Build the Birdeye-style OHLCV frame (Datetime (UTC), Open..Volume) from store arrays"""
+    import numpy as np
+    import pandas as pd
+    from src.data.precision import get_policy
+    policy = get_policy()
+    times = pd.to_datetime(np.asarray(timestamps), unit='s')
+    dtype = policy['prices']
+    df = pd.DataFrame({
+        # Compact policies keep datetime64 (8 bytes/row) instead of Python strings
+        'Datetime (UTC)': times if policy['compact_labels'] else times.strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': np.array(columns['open'], dtype=dtype),
+        'High': np.array(columns['high'], dtype=dtype),
+        'Low': np.array(columns['low'], dtype=dtype),
+        'Close': np.array(columns['close'], dtype=dtype),
+        'Volume': np.array(columns['volume'], dtype=dtype)
+    })
 
-    # Check temp data first
-    temp_file = f"temp_data/{address}_latest.csv"
-    if os.path.exists(temp_file):
-        print(f"📂 Moon Dev found cached data for {address[:4]}")
-        return pd.read_csv(temp_file)
+    # Pad if needed
+    if 0 < len(df) < 40:
+        print(f"🌙 MoonDev Alert: Padding data to ensure minimum 40 rows for analysis! 🚀")
+        rows_to_add = 40 - len(df)
+        first_row_replicated = pd.concat([df.iloc[0:1]] * rows_to_add, ignore_index=True)
+        df = pd.concat([first_row_replicated, df], ignore_index=True)
+
+    # Calculate indicators
+    df['MA20'] = df['Close'].rolling(window=20).mean()
+    delta = df['Close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    df['RSI'] = 100 - (100 / (1 + gain / loss))
+    df['MA40'] = df['Close'].rolling(window=40).mean()
+
+    df['Price_above_MA20'] = df['Close'] > df['MA20']
+    df['Price_above_MA40'] = df['Close'] > df['MA40']
+    df['MA20_above_MA40'] = df['MA20'] > df['MA40']
 
-    url = f"https://public-api.birdeye.so/defi/ohlcv?address={address}&type={timeframe}&time_from={time_from}&time_to={time_to}"
+    return df
 
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        json_response = response.json()
-        items = json_response.get('data', {}).get('items', [])
-
-        processed_data = [{
-            'Datetime (UTC)': datetime.utcfromtimestamp(item['unixTime']).strftime('%Y-%m-%d %H:%M:%S'),
-            'Open': item['o'],
-            'High': item['h'],
-            'Low': item['l'],
-            'Close': item['c'],
-            'Volume': item['v']
-        } for item in items]
-
-        df = pd.DataFrame(processed_data)
-
-        # Remove any rows with dates far in the future
-        current_date = datetime.now()
-        df['datetime_obj'] = pd.to_datetime(df['Datetime (UTC)'])
-        df = df[df['datetime_obj'] <= current_date]
-        df = df.drop('datetime_obj', axis=1)
-
-        # Pad if needed
-        if len(df) < 40:
-            print(f"🌙 MoonDev Alert: Padding data to ensure minimum 40 rows for analysis! 🚀")
-            rows_to_add = 40 - len(df)
-            first_row_replicated = pd.concat([df.iloc[0:1]] * rows_to_add, ignore_index=True)
-            df = pd.concat([first_row_replicated, df], ignore_index=True)
-
-        print(f"📊 MoonDev's Data Analysis Ready! Processing {len(df)} candles... 🎯")
-
-        # Always save to temp for current run
-        df.to_csv(temp_file)
+def _sync_candles(store, address, time_from, time_to, timeframe):
+    """
+    Make the stored candles of address/timeframe cover time_from..time_to.
+    Series synced less than OHLCV_SYNC_INTERVAL seconds ago are reused as is,
+    long ranges are downloaded in pages of BIRDEYE_OHLCV_MAX_BARS candles.
+    Returns False when Birdeye failed and the stored data can't be used.
+    """
+    import numpy as np
+    from src.data.resampler import timeframe_seconds
+
+    # Only ask for candles from the last stored bar onwards. The last bar is
+    # requested again because it was still forming when it was stored.
+    meta = store.meta(address, timeframe)
+    last_unix_time = store.last_timestamp(address, timeframe) if INCREMENTAL_OHLCV_FETCH else None
+    incremental = last_unix_time is not None and last_unix_time >= time_from
+    # History stored for a shorter days_back than asked now: fetch the older bars too
+    history_start = store.history_start(address, timeframe) if incremental else None
+    backfill = history_start is not None and history_start > time_from
+    if incremental and not backfill and time.time() - meta.get('updated_at', 0) < OHLCV_SYNC_INTERVAL:
+        return True
+    if not incremental:
+        ranges = [(time_from, time_to)]
+    else:
+        ranges = ([(time_from, history_start - 1)] if backfill else []) + [(last_unix_time, time_to)]
+
+    seconds = timeframe_seconds(timeframe)
+    headers = {"X-API-KEY": birdeye_api_key()}
+    items = []
+    for fetch_from, fetch_to in ranges:
+        page = BIRDEYE_OHLCV_MAX_BARS * seconds if seconds else fetch_to - fetch_from + 1
+        for page_from in range(fetch_from, fetch_to + 1, page):
+            page_to = min(page_from + page - 1, fetch_to)
+            url = f"https://public-api.birdeye.so/defi/ohlcv?address={address}&type={timeframe}&time_from={page_from}&time_to={page_to}"
+            response = http.get(url, headers=headers)
+            if response.status_code != 200:
+                print(f"❌ MoonDev Error: Failed to fetch data for address {address}. Status code: {response.status_code}")
+                if response.status_code == 401:
+                    print("🔑 Check your BIRDEYE_API_KEY in .env file!")
+                if not incremental:
+                    return False
+                print(f"📂 Moon Dev using stored data for {address[:4]}")
+                return True
+            items.extend(response.json().get('data', {}).get('items', []))
+
+    # Remove any rows with dates far in the future
+    items = [item for item in items if item['unixTime'] <= time_to]
+
+    timestamps = np.array([item['unixTime'] for item in items], dtype=np.int64)
+    columns = {
+        'open': np.array([item['o'] for item in items], dtype=np.float64),
+        'high': np.array([item['h'] for item in items], dtype=np.float64),
+        'low': np.array([item['l'] for item in items], dtype=np.float64),
+        'close': np.array([item['c'] for item in items], dtype=np.float64),
+        'volume': np.array([item['v'] for item in items], dtype=np.float64)
+    }
+
+    if incremental:
+        added = store.merge(address, timeframe, timestamps, columns, source='birdeye',
+                            covered_from=time_from if backfill else None)
+        print(f"⚡ Moon Dev fetched {len(timestamps)} candles for {address[:4]} ({added} new)")
+    elif len(timestamps):
+        store.write(address, timeframe, timestamps, columns, source='birdeye', covered_from=time_from)
         print(f"🔄 Moon Dev cached data for {address[:4]}")
+    return True
 
-        # Calculate indicators
-        df['MA20'] = ta.sma(df['Close'], length=20)
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        df['MA40'] = ta.sma(df['Close'], length=40)
+def get_data(address, days_back_4_data, timeframe):
+    import numpy as np
+    import pandas as pd
+    from src.data.ohlcv_store import get_live_store
+    from src.data.resampler import can_resample, read_bars
 
-        df['Price_above_MA20'] = df['Close'] > df['MA20']
-        df['Price_above_MA40'] = df['Close'] > df['MA40']
-        df['MA20_above_MA40'] = df['MA20'] > df['MA40']
+    time_from, time_to = get_time_range(days_back_4_data)
+    store = get_live_store()
 
-        return df
-    else:
-        print(f"❌ MoonDev Error: Failed to fetch data for address {address}. Status code: {response.status_code}")
-        if response.status_code == 401:
-            print("🔑 Check your BIRDEYE_API_KEY in .env file!")
+    # Coarser timeframes are resampled from the base series, so every
+    # timeframe of a token shares one download
+    source = OHLCV_BASE_TIMEFRAME if can_resample(OHLCV_BASE_TIMEFRAME, timeframe) else timeframe
+    if not _sync_candles(store, address, time_from, time_to, source):
+        return pd.DataFrame()
+
+    if not store.has(address, source):
+        print(f"❌ MoonDev Error: No candles returned for address {address}")
         return pd.DataFrame()
 
+    # Serve the requested window from the store
+    timestamps, columns = read_bars(store, address, timeframe, base_timeframe=source)
+    start = np.searchsorted(timestamps, time_from, side='left')
+    window = {col: values[start:] for col, values in columns.items()}
+
+    print(f"📊 MoonDev's Data Analysis Ready! Processing {len(timestamps) - start} candles... 🎯")
+    return _birdeye_frame(timestamps[start:], window)
+
 
 
 def fetch_wallet_holdings_og(address):
+    import pandas as pd
 
-    API_KEY = BIRDEYE_API_KEY  # Assume this is your API key; replace it with the actual one
+    API_KEY = birdeye_api_key()  # Assume this is your API key; replace it with the actual one
 
     # Initialize an empty DataFrame
     df = pd.DataFrame(columns=['Mint Address', 'Amount', 'USD Value'])
 
     url = f"https://public-api.birdeye.so/v1/wallet/token_list?wallet={address}"
     headers = {"x-chain": "solana", "X-API-KEY": API_KEY}
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         json_response = response.json()
@@ -416,7 +501,7 @@ def fetch_wallet_holdings_og(address):
             df = df[['address', 'uiAmount', 'valueUsd']]
             df = df.rename(columns={'address': 'Mint Address', 'uiAmount': 'Amount', 'valueUsd': 'USD Value'})
             df = df.dropna()
-            df = df[df['USD Value'] > 0.05]
+            df = df[df['USD Value'] > DUST_USD_VALUE]
         else:
             cprint("No data available in the response.", 'white', 'on_red')
 
@@ -437,9 +522,24 @@ def fetch_wallet_holdings_og(address):
 
     return df
 
+# 🔑 Keypair, RPC session and blockhash cache built once (nothing happens until the first trade)
+execution_context = ExecutionContext()
+
+# ⚡ Parallel swap submission + confirmation polling for every order
+execution_engine = ExecutionEngine(execution_context)
+
+# 📍 On-chain balances of our token accounts, one batched RPC per refresh
+position_tracker = PositionTracker(address)
+
+# 👛 Holdings fetched once and indexed by mint, shared by every position check
+wallet_snapshot = WalletSnapshot(fetch_wallet_holdings_og)
+
+# 📒 Decimals never change: registry file + in-memory dict, RPC only for unknown mints
+token_registry = TokenRegistry()
+
 def fetch_wallet_token_single(address, token_mint_address):
 
-    df = fetch_wallet_holdings_og(address)
+    df = wallet_snapshot.holdings(address)
 
     # filter by token mint address
     df = df[df['Mint Address'] == token_mint_address]
@@ -447,18 +547,54 @@ def fetch_wallet_token_single(address, token_mint_address):
     return df
 
 
-def token_price(address):
-    url = f"https://public-api.birdeye.so/defi/price?address={address}"
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
-    response = requests.get(url, headers=headers)
-    price_data = response.json()
+# 💲 address -> (fetched_at, price), shared by every price check in the process
+_price_cache = {}
+_price_cache_lock = threading.Lock()
 
-    print(price_data)
+def token_prices(addresses, max_age=PRICE_CACHE_TTL_SECONDS):
+    """
+    Prices for many mints with one Birdeye multi_price request per
+    MULTI_PRICE_BATCH_SIZE addresses. Prices fetched less than max_age
+    seconds ago come from the in-process cache.
+    Returns {address: price or None}.
+    """
+    addresses = list(dict.fromkeys(addresses))
+    now = time.time()
+    prices = {}
+    missing = []
+    with _price_cache_lock:
+        for address in addresses:
+            cached = _price_cache.get(address)
+            if cached and now - cached[0] <= max_age:
+                prices[address] = cached[1]
+            else:
+                missing.append(address)
+
+    headers = {"X-API-KEY": birdeye_api_key()}
+    for start in range(0, len(missing), MULTI_PRICE_BATCH_SIZE):
+        batch = missing[start:start + MULTI_PRICE_BATCH_SIZE]
+        url = f"{BASE_URL}/multi_price?list_address={','.join(batch)}"
+        try:
+            response = http.get(url, headers=headers)
+            price_data = response.json()
+        except Exception as e:
+            cprint(f"❌ Error fetching prices for {len(batch)} tokens: {str(e)}", "white", "on_red")
+            price_data = {}
 
-    if price_data['success']:
-        return price_data['data']['value']
-    else:
-        return None
+        data = (price_data.get('data') or {}) if price_data.get('success') else {}
+        fetched_at = time.time()
+        with _price_cache_lock:
+            for address in batch:
+                item = data.get(address)
+                price = item.get('value') if item else None
+                prices[address] = price
+                if price is not None:
+                    _price_cache[address] = (fetched_at, price)
+
+    return prices
+
+def token_price(address):
+    return token_prices([address]).get(address)
     
 # price = token_price('2zMMhcVQEXDtdE6vsFS7S7D5oUodfJHE8vd1gnBouauv')
 # print(price)
@@ -476,67 +612,23 @@ def get_position(token_mint_address):
     Returns:
     - The balance of the specified token if found, otherwise a message indicating the token is not in the wallet.
     """
-    dataframe = fetch_wallet_token_single(address, token_mint_address)
-
-    #dataframe = pd.read_csv('data/token_per_addy.csv')
+    balance = position_tracker.balance(token_mint_address)
 
     print('-----------------')
-    #print(dataframe)
 
-    #print(dataframe)
-
-    # Check if the DataFrame is empty
-    if dataframe.empty:
-        print("The DataFrame is empty. No positions to show.")
-        return 0  # Indicating no balance found
-
-    # Ensure 'Mint Address' column is treated as string for reliable comparison
-    dataframe['Mint Address'] = dataframe['Mint Address'].astype(str)
-
-    # Check if the token mint address exists in the DataFrame
-    if dataframe['Mint Address'].isin([token_mint_address]).any():
-        # Get the balance for the specified token
-        balance = dataframe.loc[dataframe['Mint Address'] == token_mint_address, 'Amount'].iloc[0]
-        #print(f"Balance for {token_mint_address[-4:]} token: {balance}")
-        return balance
-    else:
-        # If the token mint address is not found in the DataFrame, return a message indicating so
+    # Same dust filter as the wallet token list (positions worth less than DUST_USD_VALUE don't count)
+    price = token_price(token_mint_address) if balance else None
+    if balance == 0 or (price is not None and balance * price <= DUST_USD_VALUE):
         print("Token mint address not found in the wallet.")
         return 0  # Indicating no balance found
 
+    return balance
 
-def get_decimals(token_mint_address):
-    import requests
-    import base64
-    import json
-    # Solana Mainnet RPC endpoint
-    url = "https://api.mainnet-beta.solana.com/"
-    headers = {"Content-Type": "application/json"}
-
-    # Request payload to fetch account information
-    payload = json.dumps({
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getAccountInfo",
-        "params": [
-            token_mint_address,
-            {
-                "encoding": "jsonParsed"
-            }
-        ]
-    })
 
-    # Make the request to Solana RPC
-    response = requests.post(url, headers=headers, data=payload)
-    response_json = response.json()
-
-    # Parse the response to extract the number of decimals
-    decimals = response_json['result']['value']['data']['parsed']['info']['decimals']
-    #print(f"Decimals for {token_mint_address[-4:]} token: {decimals}")
-
-    return decimals
+def get_decimals(token_mint_address):
+    return token_registry.decimals(token_mint_address)
 
-def pnl_close(token_mint_address):
+def pnl_close(token_mint_address, ctx=None):
 
     ''' this will check to see if price is > sell 1, sell 2, sell 3 and sell accordingly '''
 
@@ -555,7 +647,7 @@ def pnl_close(token_mint_address):
     usd_value = balance * price
 
     tp = sell_at_multiple * USDC_SIZE
-    sl = ((1+stop_loss_percentage) * USDC_SIZE)
+    sl = ((1+stop_loss_perctentage) * USDC_SIZE)
     sell_size = balance
     decimals = 0
     decimals = get_decimals(token_mint_address)
@@ -571,15 +663,9 @@ def pnl_close(token_mint_address):
         cprint(f'for {token_mint_address[:4]} value is {usd_value} and tp is {tp} so closing...', 'white', 'on_green')
         try:
 
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_green')
-            time.sleep(2)
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_green')
-            time.sleep(2)
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_green')
-            time.sleep(15)
+            # 3 orders at once, returns when they confirm and the balance moves
+            sell_chunks(token_mint_address, [sell_size] * 3, slippage, ctx)
+            cprint(f'just made 3 orders {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_green')
 
         except:
             cprint('order error.. trying again', 'white', 'on_red')
@@ -614,15 +700,9 @@ def pnl_close(token_mint_address):
             #print(f'for {token_mint_address[-4:]} value is {usd_value} and tp is {tp} so closing...')
             try:
 
-                market_sell(token_mint_address, sell_size)
-                cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-                time.sleep(1)
-                market_sell(token_mint_address, sell_size)
-                cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-                time.sleep(1)
-                market_sell(token_mint_address, sell_size)
-                cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-                time.sleep(15)
+                # 3 orders at once, returns when they confirm and the balance moves
+                sell_chunks(token_mint_address, [sell_size] * 3, slippage, ctx)
+                cprint(f'just made 3 orders {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
 
             except:
                 cprint('order error.. trying again', 'white', 'on_red')
@@ -632,7 +712,7 @@ def pnl_close(token_mint_address):
             price = token_price(token_mint_address)
             usd_value = balance * price
             tp = sell_at_multiple * USDC_SIZE
-            sl = ((1+stop_loss_percentage) * USDC_SIZE)
+            sl = ((1+stop_loss_perctentage) * USDC_SIZE)
             sell_size = balance
 
             sell_size = int(sell_size * 10 **decimals)
@@ -651,20 +731,19 @@ def pnl_close(token_mint_address):
     else:
         print(f'for {token_mint_address[:4]} value is {usd_value} and tp is {tp} so not closing...')
 
-def chunk_kill(token_mint_address, max_usd_order_size, slippage):
+def chunk_kill(token_mint_address, max_usd_order_size, slippage, ctx=None):
     """Kill a position in chunks"""
     cprint(f"\n🔪 Moon Dev's AI Agent initiating position exit...", "white", "on_cyan")
     
     try:
-        # Get current position using address from config
-        df = fetch_wallet_token_single(address, token_mint_address)
-        if df.empty:
+        # Get current position (on-chain balance from the position tracker)
+        token_amount = float(get_position(token_mint_address))
+        if token_amount == 0:
             cprint("❌ No position found to exit", "white", "on_red")
             return
             
-        # Get current token amount and value
-        token_amount = float(df['Amount'].iloc[0])
-        current_usd_value = float(df['USD Value'].iloc[0])
+        # Get current token value
+        current_usd_value = token_amount * float(token_price(token_mint_address) or 0)
         
         # Get token decimals
         decimals = get_decimals(token_mint_address)
@@ -676,32 +755,28 @@ def chunk_kill(token_mint_address, max_usd_order_size, slippage):
             chunk_size = token_amount / 3  # Split remaining into 3 chunks
             cprint(f"\n🔄 Splitting remaining position into chunks of {chunk_size:.2f} tokens", "white", "on_cyan")
             
-            # Execute sell orders in chunks
-            for i in range(3):
-                try:
-                    cprint(f"\n💫 Executing sell chunk {i+1}/3...", "white", "on_cyan")
-                    sell_size = int(chunk_size * 10**decimals)
-                    market_sell(token_mint_address, sell_size, slippage)
-                    cprint(f"✅ Sell chunk {i+1}/3 complete", "white", "on_green")
-                    time.sleep(2)  # Small delay between chunks
-                except Exception as e:
-                    cprint(f"❌ Error in sell chunk: {str(e)}", "white", "on_red")
+            # Execute sell orders in chunks (sent together, waits for confirmations)
+            try:
+                cprint(f"\n💫 Executing 3 sell chunks...", "white", "on_cyan")
+                sell_size = int(chunk_size * 10**decimals)
+                fills = sell_chunks(token_mint_address, [sell_size] * 3, slippage, ctx)
+                confirmed = sum(fill['status'] == 'confirmed' for fill in fills)
+                cprint(f"✅ {confirmed}/3 sell chunks confirmed", "white", "on_green")
+            except Exception as e:
+                cprint(f"❌ Error in sell chunk: {str(e)}", "white", "on_red")
             
-            # Check remaining position
-            time.sleep(5)  # Wait for blockchain to update
-            df = fetch_wallet_token_single(address, token_mint_address)
-            if df.empty:
+            # Check remaining position (sell_chunks already waited for the balance to move)
+            token_amount = float(get_position(token_mint_address))
+            if token_amount == 0:
                 cprint("\n✨ Position successfully closed!", "white", "on_green")
                 return
                 
-            # Update position size for next iteration
-            token_amount = float(df['Amount'].iloc[0])
-            current_usd_value = float(df['USD Value'].iloc[0])
+            # Update position value for next iteration
+            current_usd_value = token_amount * float(token_price(token_mint_address) or 0)
             cprint(f"\n📊 Remaining position: {token_amount:.2f} tokens (${current_usd_value:.2f})", "white", "on_cyan")
             
             if current_usd_value > 0.1:
                 cprint("🔄 Position still open - continuing to close...", "white", "on_cyan")
-                time.sleep(2)
             
         cprint("\n✨ Position successfully closed!", "white", "on_green")
         
@@ -717,7 +792,7 @@ def sell_token(token_mint_address, amount, slippage):
     except Exception as e:
         cprint(f"❌ Error selling token: {str(e)}", "white", "on_red")
 
-def kill_switch(token_mint_address):
+def kill_switch(token_mint_address, ctx=None):
 
     ''' this function closes the position in full
 
@@ -755,15 +830,9 @@ def kill_switch(token_mint_address):
         #print(f'for {token_mint_address[-4:]} closing position cause exit all positions is set to {EXIT_ALL_POSITIONS} and value is {usd_value} and tp is {tp} so closing...')
         try:
 
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-            time.sleep(1)
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-            time.sleep(1)
-            market_sell(token_mint_address, sell_size)
-            cprint(f'just made an order {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
-            time.sleep(15)
+            # 3 orders at once, returns when they confirm and the balance moves
+            sell_chunks(token_mint_address, [sell_size] * 3, slippage, ctx)
+            cprint(f'just made 3 orders {token_mint_address[:4]} selling {sell_size} ...', 'white', 'on_blue')
 
         except:
             cprint('order error.. trying again', 'white', 'on_red')
@@ -797,16 +866,20 @@ def kill_switch(token_mint_address):
 
 def close_all_positions():
 
-    # get all positions
-    open_positions = fetch_wallet_holdings_og(address)
+    # get all positions (fresh snapshot, kill_switch reads balances from it)
+    open_positions = wallet_snapshot.holdings(address, max_age=0)
+
+    # one price request for every position, kill_switch reads them from the cache
+    if not open_positions.empty:
+        token_prices(open_positions['Mint Address'].tolist())
 
     # loop through all positions and close them getting the mint address from Mint Address column
     for index, row in open_positions.iterrows():
         token_mint_address = row['Mint Address']
 
         # Check if the current token mint address is the USDC contract address
-        cprint(f'this is the token mint address {token_mint_address} this is don not trade list {dont_trade_list}', 'white', 'on_magenta')
-        if token_mint_address in dont_trade_list:
+        cprint(f'this is the token mint address {token_mint_address} this is don not trade list {DO_NOT_TRADE_LIST}', 'white', 'on_magenta')
+        if token_mint_address in DO_NOT_TRADE_LIST:
             print(f'Skipping kill switch for USDC contract at {token_mint_address}')
             continue  # Skip the rest of the loop for this iteration
 
@@ -821,6 +894,7 @@ def delete_dont_overtrade_file():
         print('The file does not exist')
 
 def supply_demand_zones(token_address, timeframe, limit):
+    import pandas as pd
 
     print('starting moons supply and demand zone calculations..')
 
@@ -865,7 +939,7 @@ def supply_demand_zones(token_address, timeframe, limit):
     return sd_df
 
 
-def elegant_entry(symbol, buy_under):
+def elegant_entry(symbol, buy_under, ctx=None):
 
     pos = get_position(symbol)
     price = token_price(symbol)
@@ -892,13 +966,7 @@ def elegant_entry(symbol, buy_under):
 
         try:
 
-            for i in range(orders_per_open):
-                market_buy(symbol, chunk_size, slippage)
-                # cprint green background black text
-                cprint(f'chunk buy submitted of {symbol[:4]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                time.sleep(1)
-
-            time.sleep(tx_sleep)
+            buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
 
             pos = get_position(symbol)
             price = token_price(symbol)
@@ -914,13 +982,7 @@ def elegant_entry(symbol, buy_under):
             try:
                 cprint(f'trying again to make the order in 30 seconds.....', 'light_blue', 'on_light_magenta')
                 time.sleep(30)
-                for i in range(orders_per_open):
-                    market_buy(symbol, chunk_size, slippage)
-                    # cprint green background black text
-                    cprint(f'chunk buy submitted of {symbol[:4]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                    time.sleep(1)
-
-                time.sleep(tx_sleep)
+                buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
                 pos = get_position(symbol)
                 price = token_price(symbol)
                 pos_usd = pos * price
@@ -947,7 +1009,7 @@ def elegant_entry(symbol, buy_under):
 
 
 # like the elegant entry but for breakout so its looking for price > BREAKOUT_PRICE
-def breakout_entry(symbol, BREAKOUT_PRICE):
+def breakout_entry(symbol, BREAKOUT_PRICE, ctx=None):
 
     pos = get_position(symbol)
     price = token_price(symbol)
@@ -992,13 +1054,7 @@ def breakout_entry(symbol, BREAKOUT_PRICE):
 
         try:
 
-            for i in range(orders_per_open):
-                market_buy(symbol, chunk_size, slippage)
-                # cprint green background black text
-                cprint(f'chunk buy submitted of {symbol[:4]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                time.sleep(1)
-
-            time.sleep(tx_sleep)
+            buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
 
             pos = get_position(symbol)
             price = token_price(symbol)
@@ -1014,13 +1070,7 @@ def breakout_entry(symbol, BREAKOUT_PRICE):
             try:
                 cprint(f'trying again to make the order in 30 seconds.....', 'light_blue', 'on_light_magenta')
                 time.sleep(30)
-                for i in range(orders_per_open):
-                    market_buy(symbol, chunk_size, slippage)
-                    # cprint green background black text
-                    cprint(f'chunk buy submitted of {symbol[:4]} sz: {chunk_size} you my dawg moon dev', 'white', 'on_blue')
-                    time.sleep(1)
-
-                time.sleep(tx_sleep)
+                buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
                 pos = get_position(symbol)
                 price = token_price(symbol)
                 pos_usd = pos * price
@@ -1047,7 +1097,7 @@ def breakout_entry(symbol, BREAKOUT_PRICE):
 
 
 
-def ai_entry(symbol, amount):
+def ai_entry(symbol, amount, ctx=None):
     """AI agent entry function for Moon Dev's trading system 🤖"""
     cprint("🤖 Moon Dev's AI Trading Agent initiating position entry...", "white", "on_blue")
     
@@ -1088,12 +1138,8 @@ def ai_entry(symbol, amount):
         print(f"Position: {round(pos,2)} | Price: {round(price,8)} | USD Value: ${round(pos_usd,2)}")
 
         try:
-            for i in range(orders_per_open):
-                market_buy(symbol, chunk_size, slippage)
-                cprint(f"🚀 AI Agent placed order {i+1}/{orders_per_open} for {symbol[:8]}", "white", "on_blue")
-                time.sleep(1)
-
-            time.sleep(tx_sleep)
+            fills = buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
+            cprint(f"🚀 AI Agent filled {sum(f['status'] == 'confirmed' for f in fills)}/{orders_per_open} orders for {symbol[:8]}", "white", "on_blue")
             
             # Update position info
             pos = get_position(symbol)
@@ -1121,12 +1167,8 @@ def ai_entry(symbol, amount):
             try:
                 cprint("🔄 AI Agent retrying order in 30 seconds...", "white", "on_blue")
                 time.sleep(30)
-                for i in range(orders_per_open):
-                    market_buy(symbol, chunk_size, slippage)
-                    cprint(f"🚀 AI Agent retry order {i+1}/{orders_per_open} for {symbol[:8]}", "white", "on_blue")
-                    time.sleep(1)
-
-                time.sleep(tx_sleep)
+                fills = buy_chunks(symbol, chunk_size, orders_per_open, slippage, ctx, prefetch_next=another_full_round(size_needed))
+                cprint(f"🚀 AI Agent retry filled {sum(f['status'] == 'confirmed' for f in fills)}/{orders_per_open} orders for {symbol[:8]}", "white", "on_blue")
                 pos = get_position(symbol)
                 price = token_price(symbol)
                 pos_usd = pos * price
@@ -1154,15 +1196,13 @@ def ai_entry(symbol, amount):
 def get_token_balance_usd(token_mint_address):
     """Get the USD value of a token position for Moon Dev's wallet 🌙"""
     try:
-        # Get the position data using existing function
-        df = fetch_wallet_token_single(address, token_mint_address)  # Using address from config
+        # Served from the wallet snapshot (address from config)
+        _, usd_value = wallet_snapshot.position(address, token_mint_address)
         
-        if df.empty:
+        if usd_value == 0:
             print(f"🔍 No position found for {token_mint_address[:8]}")
             return 0.0
             
-        # Get the USD Value from the dataframe
-        usd_value = df['USD Value'].iloc[0]
         return float(usd_value)
         
     except Exception as e:
@@ -0,0 +1,115 @@
+"""
+🌙 Moon Dev's Position Tracker
+On-chain token balances for our wallet, kept in memory. One batched
+JSON-RPC request (getTokenAccountsByOwner for the SPL Token and Token-2022
+programs) refreshes every balance at once, and exit/entry loops block on a
+Condition that wakes them as soon as a balance changes.
+Built with love by Moon Dev 🚀
+"""
+
+import json
+import os
+import threading
+import time
+
+from termcolor import cprint
+
+from src.core.config import SOLANA_RPC_URL, POSITION_MAX_AGE, POSITION_POLL_INTERVAL
+from src.core import http_client as http
+from src.core.utils.env import load_env
+
+TOKEN_PROGRAMS = [
+    'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA',   # SPL Token
+    'TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb',   # Token-2022
+]
+
+
+class PositionTracker:
+    """mint -> ui amount for one owner"""
+
+    def __init__(self, owner, rpc_url=None, max_age=POSITION_MAX_AGE, poll_interval=POSITION_POLL_INTERVAL):
+        self.owner = owner
+        self.rpc_url = rpc_url
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self.balances = {}
+        self.fetched_at = 0.0
+        self.condition = threading.Condition()
+        self.stats = {'refreshes': 0, 'changes': 0}
+
+    def _rpc_url(self):
+        load_env()
+        return self.rpc_url or os.getenv("RPC_ENDPOINT") or SOLANA_RPC_URL
+
+    def _fetch(self):
+        """Every token account of the owner, both token programs in one HTTP request"""
+        payload = json.dumps([
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTokenAccountsByOwner",
+                "params": [self.owner, {"programId": program}, {"encoding": "jsonParsed"}],
+            }
+            for i, program in enumerate(TOKEN_PROGRAMS)
+        ])
+        responses = http.post(self._rpc_url(), headers={"Content-Type": "application/json"}, data=payload).json()
+
+        balances = {}
+        for response in responses:
+            if 'error' in response:
+                raise RuntimeError(f"getTokenAccountsByOwner failed: {response['error']}")
+            for account in response['result']['value']:
+                info = account['account']['data']['parsed']['info']
+                amount = info['tokenAmount'].get('uiAmount') or 0.0
+                balances[info['mint']] = balances.get(info['mint'], 0.0) + float(amount)
+        return balances
+
+    def refresh(self):
+        """Fetch all balances now and wake every waiter if something changed"""
+        balances = self._fetch()
+        with self.condition:
+            changed = balances != self.balances
+            self.balances = balances
+            self.fetched_at = time.time()
+            self.stats['refreshes'] += 1
+            if changed:
+                self.stats['changes'] += 1
+                self.condition.notify_all()
+        return balances
+
+    def invalidate(self):
+        """Next balance() goes to the RPC (call after our own trades)"""
+        with self.condition:
+            self.fetched_at = 0.0
+
+    def balance(self, mint, max_age=None):
+        max_age = self.max_age if max_age is None else max_age
+        if time.time() - self.fetched_at > max_age:
+            self.refresh()
+        return self.balances.get(mint, 0.0)
+
+    def wait_for_change(self, mint, previous, timeout):
+        """
+        Block until the balance of mint differs from previous (returns the new
+        balance) or timeout seconds pass (returns the current balance).
+        Polls the RPC every poll_interval, but also wakes up right away when
+        another thread's refresh sees the change.
+        """
+        deadline = time.time() + timeout
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                cprint(f"⚠️ Position refresh failed: {str(e)}", "white", "on_yellow")
+            with self.condition:
+                current = self.balances.get(mint, 0.0)
+                remaining = deadline - time.time()
+                if current != previous or remaining <= 0:
+                    return current
+                self.condition.wait_for(
+                    lambda: self.balances.get(mint, 0.0) != previous,
+                    timeout=min(self.poll_interval, remaining),
+                )
+                current = self.balances.get(mint, 0.0)
+                if current != previous:
+                    return current
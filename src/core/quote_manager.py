@@ -0,0 +1,147 @@
+"""
+🌙 Moon Dev's Jupiter Quote Manager
+Prefetches Jupiter quotes per (input, output, amount, slippage) in the
+background right before the next round of identical chunks, so that round
+finds its quotes ready. Every cached quote is handed to exactly one
+swap (two swaps built from one quote are the same transaction), and quotes
+that are too old or whose price moved too far from the latest quote for the
+same swap (same amount) are dropped.
+Built with love by Moon Dev 🚀
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from termcolor import cprint
+
+from src.core.config import QUOTE_MAX_AGE, QUOTE_MAX_PRICE_MOVE
+from src.core import http_client as http
+
+JUPITER_QUOTE_URL = 'https://quote-api.jup.ag/v6/quote'
+
+
+def quote_rate(quote):
+    """Output units per input unit of a quote (None if the quote has no amounts)"""
+    try:
+        return int(quote['outAmount']) / int(quote['inAmount'])
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+class QuoteManager:
+    """Prefetching Jupiter quote cache, one quote per swap"""
+
+    def __init__(self, max_age=QUOTE_MAX_AGE, max_price_move=QUOTE_MAX_PRICE_MOVE, max_workers=4):
+        self.max_age = max_age
+        self.max_price_move = max_price_move
+        self.quotes = {}       # key -> [(requested_at, Future[quote]), ...] not handed out yet
+        self.last_rate = {}    # (input, output, amount) -> rate of the newest quote
+        self.stats = {'hits': 0, 'misses': 0, 'prefetches': 0, 'expired': 0, 'moved': 0,
+                      'fetches': 0, 'fetch_time': 0.0, 'used_age': 0.0}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jupiter-quote')
+
+    def _fetch(self, input_mint, output_mint, amount, slippage):
+        started = time.perf_counter()
+        quote = http.get(
+            f'{JUPITER_QUOTE_URL}?inputMint={input_mint}&outputMint={output_mint}'
+            f'&amount={amount}&slippageBps={slippage}'
+        ).json()
+        elapsed = time.perf_counter() - started
+        rate = quote_rate(quote)
+        with self.lock:
+            self.stats['fetches'] += 1
+            self.stats['fetch_time'] += elapsed
+            if rate is not None:
+                self.last_rate[(input_mint, output_mint, str(amount))] = rate
+        return quote
+
+    def _usable(self, key, entry, now):
+        """Cached entry still good? (in-flight requests always are)"""
+        requested_at, future = entry
+        if not future.done():
+            return True
+        if future.exception() is not None:
+            return False
+        if now - requested_at > self.max_age:
+            self.stats['expired'] += 1
+            return False
+        rate = quote_rate(future.result())
+        # Same amount only: a different chunk size has a different price impact, not a market move
+        latest = self.last_rate.get(key[:3])
+        if rate is not None and latest and abs(rate / latest - 1) > self.max_price_move:
+            self.stats['moved'] += 1
+            return False
+        return True
+
+    def _request(self, key):
+        future = self.executor.submit(self._fetch, *key)
+        self.quotes.setdefault(key, []).append((time.time(), future))
+        return future
+
+    def _prune(self, key, now):
+        """Drop the stale quotes of key, returns the usable ones (oldest first)"""
+        entries = [entry for entry in self.quotes.get(key, []) if self._usable(key, entry, now)]
+        if entries:
+            self.quotes[key] = entries
+        else:
+            self.quotes.pop(key, None)
+        return entries
+
+    def get(self, input_mint, output_mint, amount, slippage):
+        """
+        Quote for one swap: takes a prefetched (cached/in-flight) quote out of
+        the cache if a valid one is there, fetches a fresh one otherwise.
+        """
+        key = (input_mint, output_mint, str(amount), slippage)
+        now = time.time()
+        with self.lock:
+            entries = self._prune(key, now)
+            if entries:
+                requested_at, future = entries.pop(0)
+                if not entries:
+                    del self.quotes[key]
+                self.stats['hits'] += 1
+                self.stats['used_age'] += max(0.0, now - requested_at)
+            else:
+                future = None
+                self.stats['misses'] += 1
+        if future is None:
+            return self._fetch(*key)
+        return future.result()
+
+    def prefetch(self, input_mint, output_mint, amount, slippage, count=1):
+        """Start fetching quotes in the background until count valid ones are cached for this swap"""
+        key = (input_mint, output_mint, str(amount), slippage)
+        with self.lock:
+            for _ in range(count - len(self._prune(key, time.time()))):
+                self.stats['prefetches'] += 1
+                self._request(key)
+
+    def invalidate(self, input_mint=None, output_mint=None):
+        """Drop cached quotes (all, or just one pair)"""
+        with self.lock:
+            if input_mint is None:
+                self.quotes.clear()
+            else:
+                for key in [k for k in self.quotes if k[:2] == (input_mint, output_mint)]:
+                    del self.quotes[key]
+
+    def metrics(self):
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['avg_fetch_time'] = stats['fetch_time'] / stats['fetches'] if stats['fetches'] else 0.0
+        stats['avg_used_age'] = stats['used_age'] / stats['hits'] if stats['hits'] else 0.0
+        return stats
+
+    def print_stats(self):
+        stats = self.metrics()
+        if not (stats['hits'] or stats['misses']):
+            return
+        cprint(f"💱 Quotes: {stats['hits']} reused | {stats['misses']} fetched on demand | "
+               f"{stats['prefetches']} prefetched | {stats['expired']} expired | {stats['moved']} price moved | "
+               f"avg latency {stats['avg_fetch_time']*1000:.0f}ms | avg age when used {stats['avg_used_age']:.1f}s",
+               "white", "on_blue")
@@ -0,0 +1,96 @@
+"""
+🌙 Moon Dev's Token Registry
+Mint metadata that never changes (decimals, token program), kept in an
+in-memory dict backed by a JSON file. Unknown mints are fetched with one
+batched getMultipleAccounts RPC call.
+Built with love by Moon Dev 🚀
+"""
+
+import json
+import os
+import threading
+
+from termcolor import cprint
+
+from src.core.config import TOKEN_REGISTRY_FILE, SOLANA_RPC_URL
+from src.core import http_client as http
+
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
+
+class TokenRegistry:
+    """mint -> {'decimals': int, 'program': str}"""
+
+    def __init__(self, path=TOKEN_REGISTRY_FILE, rpc_url=SOLANA_RPC_URL):
+        self.path = path
+        self.rpc_url = rpc_url
+        self.tokens = None     # read from the JSON file on first use
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.tokens is not None:
+            return
+        tokens = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    tokens = json.load(f)
+            except (OSError, ValueError):
+                cprint(f"⚠️ Could not read {self.path}, starting with an empty token registry", "white", "on_yellow")
+        self.tokens = tokens
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.tokens, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _fetch(self, mints):
+        """Parsed mint accounts via getMultipleAccounts, {mint: metadata}"""
+        found = {}
+        for start in range(0, len(mints), MAX_ACCOUNTS_PER_CALL):
+            batch = mints[start:start + MAX_ACCOUNTS_PER_CALL]
+            payload = json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getMultipleAccounts",
+                "params": [batch, {"encoding": "jsonParsed"}],
+            })
+            response = http.post(self.rpc_url, headers={"Content-Type": "application/json"}, data=payload)
+            accounts = response.json()['result']['value']
+            for mint, account in zip(batch, accounts):
+                try:
+                    info = account['data']['parsed']['info']
+                    found[mint] = {'decimals': int(info['decimals']), 'program': account.get('owner')}
+                except (TypeError, KeyError):
+                    cprint(f"⚠️ {mint[:8]} is not a token mint account", "white", "on_yellow")
+        return found
+
+    def warm(self, mints):
+        """Fetch every mint not yet in the registry (one RPC call per 100 mints)"""
+        with self.lock:
+            self._load()
+            missing = [mint for mint in dict.fromkeys(mints) if mint not in self.tokens]
+            if not missing:
+                return 0
+            found = self._fetch(missing)
+            if found:
+                self.tokens.update(found)
+                self._save()
+        cprint(f"📒 Token registry: {len(found)} new mints cached ({len(self.tokens)} total)", "white", "on_blue")
+        return len(found)
+
+    def decimals(self, mint):
+        if self.tokens is None:
+            with self.lock:
+                self._load()
+        token = self.tokens.get(mint)
+        if token is None:
+            self.warm([mint])
+            token = self.tokens.get(mint)
+            if token is None:
+                raise ValueError(f"🚨 Could not fetch decimals for {mint}")
+        return token['decimals']
@@ -0,0 +1,23 @@
+"""
+🌙 Moon Dev's Environment Loader
+Loads .env once, the first time something actually needs a key or endpoint,
+so importing modules never touches the filesystem.
+Built with love by Moon Dev 🚀
+"""
+
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """load_dotenv() on first call, no-op afterwards"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
@@ -0,0 +1,65 @@
+"""
+🌙 Moon Dev's Wallet Snapshot
+Fetches the wallet token list once, indexes it by mint and serves every
+position / balance query from that snapshot until it gets too old or one
+of our own trades invalidates it.
+Built with love by Moon Dev 🚀
+"""
+
+import threading
+import time
+
+from src.core.config import WALLET_SNAPSHOT_MAX_AGE
+
+
+class WalletSnapshot:
+    """
+    fetch(wallet_address) must return a DataFrame with the
+    'Mint Address', 'Amount' and 'USD Value' columns
+    (fetch_wallet_holdings_og). One snapshot is kept per wallet.
+    """
+
+    def __init__(self, fetch, max_age=WALLET_SNAPSHOT_MAX_AGE):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.snapshots = {}   # wallet -> (fetched_at, holdings DataFrame, {mint: (amount, usd_value)})
+        self.stats = {'hits': 0, 'refreshes': 0, 'invalidations': 0}
+        self.lock = threading.Lock()
+
+    def _snapshot(self, wallet_address, max_age=None):
+        max_age = self.max_age if max_age is None else max_age
+        # The lock is held during the fetch so concurrent callers share one download
+        with self.lock:
+            snapshot = self.snapshots.get(wallet_address)
+            if snapshot and time.time() - snapshot[0] <= max_age:
+                self.stats['hits'] += 1
+                return snapshot
+
+            holdings = self.fetch(wallet_address)
+            index = {
+                str(mint): (float(amount), float(usd_value))
+                for mint, amount, usd_value in zip(
+                    holdings['Mint Address'], holdings['Amount'], holdings['USD Value']
+                )
+            }
+            snapshot = (time.time(), holdings, index)
+            self.snapshots[wallet_address] = snapshot
+            self.stats['refreshes'] += 1
+            return snapshot
+
+    def holdings(self, wallet_address, max_age=None):
+        """Full holdings DataFrame (a copy, callers may modify it)"""
+        return self._snapshot(wallet_address, max_age)[1].copy()
+
+    def position(self, wallet_address, mint, max_age=None):
+        """(amount, usd_value) for one mint, (0.0, 0.0) when it's not in the wallet"""
+        return self._snapshot(wallet_address, max_age)[2].get(str(mint), (0.0, 0.0))
+
+    def invalidate(self, wallet_address=None):
+        """Drop the snapshot (all wallets by default), e.g. right after we trade"""
+        with self.lock:
+            if wallet_address is None:
+                self.snapshots.clear()
+            else:
+                self.snapshots.pop(wallet_address, None)
+            self.stats['invalidations'] += 1
@@ -0,0 +1,237 @@
+"""
+🌙 Moon Dev's Backtest Core
+Backtest orientado a eventos para a estratégia de exaustão:
+o contexto de cada candle vira colunas NumPy pré-calculadas, a curva de
+capital é um array pré-alocado e a política de decisão só é chamada nos
+candles candidatos (máscaras vetorizadas sobre os indicadores).
+Built with love by Moon Dev 🚀
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas de calculate_strategy_indicators copiadas para o contexto
+FEATURE_COLUMNS = [
+    'close', 'volume', 'volume_ratio', 'ema9', 'distance_ema9',
+    'bb_upper', 'bb_middle', 'bb_lower',
+    'exhaustion_strength_buy', 'exhaustion_strength_sell', 'rsi',
+]
+
+RECENT_WINDOW = 5       # "exaustão nos últimos 5 períodos" (janela de 6 candles)
+LOOKBACK_WINDOW = 20    # alcance de "períodos desde a última exaustão"
+
+
+def periods_since(flags, lookback=LOOKBACK_WINDOW):
+    """
+    Períodos desde o último True ANTERIOR ao candle atual, dentro de
+    lookback-1 candles (0 se não houver), via índice acumulado.
+    Reproduz o laço de 20 passos de prepare_ai_context.
+    """
+    n = len(flags)
+    index = np.arange(n)
+    last_seen = np.maximum.accumulate(np.where(flags, index, -1))
+    previous = np.concatenate(([-1], last_seen[:-1]))
+    distance = index - previous
+    earliest = np.maximum(0, index - lookback)
+    found = (previous > earliest) & (previous >= 0)
+    return np.where(found, distance, 0)
+
+
+def recent_any(flags, window=RECENT_WINDOW):
+    """True se houve flag no candle atual ou nos `window` anteriores"""
+    counts = np.cumsum(np.asarray(flags, dtype=np.int64))
+    shifted = np.concatenate((np.zeros(window + 1, dtype=np.int64), counts[:-(window + 1)]))
+    return (counts - shifted) > 0
+
+
+def pct_change(close, periods):
+    """Variação % contra `periods` candles atrás (0 no começo da série)"""
+    change = np.zeros(len(close))
+    change[periods:] = (close[periods:] - close[:-periods]) / close[:-periods] * 100
+    return change
+
+
+def build_context_features(df):
+    """Converte o DataFrame com indicadores em colunas NumPy com todo o contexto da IA"""
+    # float32 das políticas compactas continua float32, o resto vira float64
+    features = {col: df[col].to_numpy(dtype=np.promote_types(df[col].dtype, np.float32)) for col in FEATURE_COLUMNS}
+    features['timestamp'] = df['timestamp'].to_numpy()
+
+    exhaustion_buy = df['exhaustion_buy'].to_numpy(dtype=bool)
+    exhaustion_sell = df['exhaustion_sell'].to_numpy(dtype=bool)
+    features['exhaustion_buy'] = exhaustion_buy
+    features['exhaustion_sell'] = exhaustion_sell
+
+    features['recent_exhaustion_buy'] = recent_any(exhaustion_buy)
+    features['recent_exhaustion_sell'] = recent_any(exhaustion_sell)
+    features['periods_since_buy_exhaustion'] = periods_since(exhaustion_buy)
+    features['periods_since_sell_exhaustion'] = periods_since(exhaustion_sell)
+
+    close = features['close']
+    features['price_change_1period'] = pct_change(close, 1)
+    features['price_change_5periods'] = pct_change(close, 5)
+    return features
+
+
+def context_at(features, i):
+    """Monta o dict de contexto (mesmas chaves de prepare_ai_context) para o candle i"""
+    return {
+        'timestamp': pd.Timestamp(features['timestamp'][i]).strftime('%Y-%m-%d %H:%M:%S'),
+        'price': float(features['close'][i]),
+        'volume': float(features['volume'][i]),
+        'volume_ratio': float(features['volume_ratio'][i]),
+
+        'ema9': float(features['ema9'][i]),
+        'distance_ema9': float(features['distance_ema9'][i]),
+        'bb_upper': float(features['bb_upper'][i]),
+        'bb_middle': float(features['bb_middle'][i]),
+        'bb_lower': float(features['bb_lower'][i]),
+
+        'exhaustion_buy_now': bool(features['exhaustion_buy'][i]),
+        'exhaustion_sell_now': bool(features['exhaustion_sell'][i]),
+        'exhaustion_strength_buy': float(features['exhaustion_strength_buy'][i]),
+        'exhaustion_strength_sell': float(features['exhaustion_strength_sell'][i]),
+
+        'recent_exhaustion_buy': bool(features['recent_exhaustion_buy'][i]),
+        'recent_exhaustion_sell': bool(features['recent_exhaustion_sell'][i]),
+        'periods_since_buy_exhaustion': int(features['periods_since_buy_exhaustion'][i]),
+        'periods_since_sell_exhaustion': int(features['periods_since_sell_exhaustion'][i]),
+
+        'rsi': float(features['rsi'][i]),
+        'price_change_1period': float(features['price_change_1period'][i]),
+        'price_change_5periods': float(features['price_change_5periods'][i]),
+    }
+
+
+CANDIDATE_MODES = ('strict', 'exhaustion', 'off')
+
+
+def candidate_masks(features, mode='strict'):
+    """
+    Máscaras dos candles em que vale consultar a política: (sem posição, comprado).
+
+    strict     -> exaustão de venda sem posição / exaustão de compra comprado
+    exhaustion -> qualquer exaustão sem posição / todo candle comprado
+    off        -> todos os candles
+    """
+    exhaustion_buy = features['exhaustion_buy']
+    exhaustion_sell = features['exhaustion_sell']
+    every_bar = np.ones(len(exhaustion_buy), dtype=bool)
+    if mode == 'strict':
+        return exhaustion_buy, exhaustion_sell
+    if mode == 'exhaustion':
+        return exhaustion_buy | exhaustion_sell, every_bar
+    if mode == 'off':
+        return every_bar, every_bar
+    raise ValueError(f"Modo de filtro desconhecido: {mode} (use {', '.join(CANDIDATE_MODES)})")
+
+
+def run_event_backtest(features, decide, initial_balance, start=250, on_trade=None, candidates='strict'):
+    """
+    Backtest long-only orientado a eventos.
+
+    decide(i, in_position) -> 'BUY' | 'SELL' | 'HOLD' só é chamado nos
+    candles candidatos do modo escolhido (ver candidate_masks); nos demais
+    o backtest avança direto, como se a decisão fosse HOLD.
+    on_trade(trade_or_entry) é avisado a cada entrada/saída.
+
+    Retorna {'trades', 'equity' (array a partir de `start`), 'balance',
+    'open_position', 'decisions'}.
+    """
+    close = features['close']
+    n = len(close)
+    start = min(start, n)
+    flat_mask, long_mask = candidate_masks(features, candidates)
+    buy_candidates = np.flatnonzero(flat_mask[start:]) + start
+    sell_candidates = np.flatnonzero(long_mask[start:]) + start
+
+    equity = np.empty(n - start, dtype=np.float64)
+    balance = float(initial_balance)
+    trades = []
+    decisions = 0
+
+    position = None
+    cursor = start          # próximo candle ainda não avaliado
+    segment_start = start   # começo do trecho com a mesma posição
+
+    while cursor < n:
+        pool = sell_candidates if position else buy_candidates
+        k = np.searchsorted(pool, cursor)
+        if k == len(pool):
+            break
+        i = int(pool[k])
+        cursor = i + 1
+
+        decisions += 1
+        action = decide(i, position is not None)
+
+        if action == 'BUY' and position is None:
+            # Trecho sem posição até aqui: capital constante
+            equity[segment_start - start:i - start] = balance
+            segment_start = i
+            position = {
+                'entry_index': i,
+                'entry_price': float(close[i]),
+                'shares': balance / close[i],
+            }
+            if on_trade:
+                on_trade(dict(position, type='BUY', entry_exhaustion=bool(features['exhaustion_buy'][i])))
+
+        elif action == 'SELL' and position is not None:
+            # Trecho comprado (inclui o candle da venda antes de sair)
+            equity[segment_start - start:i - start] = position['shares'] * close[segment_start:i]
+            segment_start = i
+            trade = _close_trade(features, position, i)
+            balance = position['shares'] * float(close[i])
+            trades.append(trade)
+            position = None
+            if on_trade:
+                on_trade(dict(trade, type='SELL'))
+
+    # Preencher o restante da curva
+    if position is not None:
+        equity[segment_start - start:] = position['shares'] * close[segment_start:]
+    else:
+        equity[segment_start - start:] = balance
+
+    return {
+        'trades': trades,
+        'equity': equity,
+        'balance': balance,
+        'open_position': position,
+        'decisions': decisions,
+    }
+
+
+def _close_trade(features, position, i):
+    """Registro do trade no mesmo formato de AISmartTrader.execute_trade"""
+    entry = position['entry_index']
+    entry_price = position['entry_price']
+    shares = position['shares']
+    price = float(features['close'][i])
+    return {
+        'entry_time': pd.Timestamp(features['timestamp'][entry]).strftime('%Y-%m-%d %H:%M:%S'),
+        'exit_time': pd.Timestamp(features['timestamp'][i]).strftime('%Y-%m-%d %H:%M:%S'),
+        'entry_price': entry_price,
+        'exit_price': price,
+        'shares': shares,
+        'pnl': (price - entry_price) * shares,
+        'pnl_pct': ((price / entry_price) - 1) * 100,
+        'entry_exhaustion': bool(features['exhaustion_buy'][entry]),
+        'exit_exhaustion': bool(features['exhaustion_sell'][i]),
+        'entry_strength': float(features['exhaustion_strength_buy'][entry]),
+        'exit_strength': float(features['exhaustion_strength_sell'][i]),
+    }
+
+
+def close_open_position(result, features):
+    """Fecha a posição aberta no último candle (como o fim de run_backtest)"""
+    position = result['open_position']
+    if position is None:
+        return None
+    last = len(features['close']) - 1
+    trade = _close_trade(features, position, last)
+    result['trades'].append(trade)
+    result['balance'] = position['shares'] * float(features['close'][last])
+    result['open_position'] = None
+    return trade
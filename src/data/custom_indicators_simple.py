@@ -8,6 +8,10 @@ import pandas as pd
 import numpy as np
 from termcolor import colored, cprint
 
+from .feature_cache import cached_fused_indicators
+from .precision import SIGNAL_BUY, SIGNAL_SELL, indicator_dtype, signal_dtype, signal_labels
+from .rolling_stats import bollinger_bands
+
 def calculate_ema(series, period):
     """
     Calcula Exponential Moving Average (EMA) manualmente
@@ -24,15 +28,13 @@ def calculate_sma(series, period):
 
 def calculate_bollinger_bands(series, period=20, std_dev=2):
     """
-    Calcula Bollinger Bands manualmente
+    Calcula Bollinger Bands manualmente (média e desvio móveis numa passada só)
     """
-    sma = calculate_sma(series, period)
-    std = series.rolling(window=period).std()
-    
-    upper_band = sma + (std * std_dev)
-    lower_band = sma - (std * std_dev)
+    upper_band, sma, lower_band = bollinger_bands(series.values, period, std_dev)
     
-    return upper_band, sma, lower_band
+    return (pd.Series(upper_band, index=series.index),
+            pd.Series(sma, index=series.index),
+            pd.Series(lower_band, index=series.index))
 
 def calculate_distance_mme9(df):
     """
@@ -58,22 +60,17 @@ def calculate_distance_mme9(df):
 def calculate_bollinger_on_distance(df, period=200, std_dev=2):
     """
     Aplica Bollinger Bands no indicador distanciaMME9
+    (MME9, distância e bandas saem do kernel fundido numa única passada)
     """
     try:
-        if 'distanciaMME9_pct' not in df.columns:
-            cprint("⚠️ Calculando distância MME9 primeiro...", "yellow")
-            df = calculate_distance_mme9(df)
+        out = cached_fused_indicators(df['close'].values, 9, period, std_dev, adjust=False, dtype=indicator_dtype())
         
-        # Calcular Bollinger Bands na distância
-        upper, middle, lower = calculate_bollinger_bands(
-            df['distanciaMME9_pct'], 
-            period=period, 
-            std_dev=std_dev
-        )
-        
-        df['BB_upper'] = upper
-        df['BB_middle'] = middle
-        df['BB_lower'] = lower
+        df['MME9'] = out['ema']
+        df['distanciaMME9'] = (df['close'].values - out['ema']).astype(out['ema'].dtype, copy=False)
+        df['distanciaMME9_pct'] = out['distance']
+        df['BB_upper'] = out['bb_upper']
+        df['BB_middle'] = out['bb_middle']
+        df['BB_lower'] = out['bb_lower']
         
         cprint(f"✅ Bollinger Bands ({period}, {std_dev}) aplicadas na distância!", "white", "on_green")
         return df
@@ -82,41 +79,41 @@ def calculate_bollinger_on_distance(df, period=200, std_dev=2):
         cprint(f"❌ Erro ao calcular Bollinger Bands: {str(e)}", "white", "on_red")
         return df
 
+def band_signals(distance, upper, lower):
+    """
+    Sinal (1 abaixo da banda inferior, -1 acima da superior, 0 dentro) e força
+    (distância relativa até a banda) como arrays NumPy, sem colunas intermediárias
+    """
+    distance = np.asarray(distance)
+    upper = np.asarray(upper)
+    lower = np.asarray(lower)
+    signal = np.zeros(len(distance), dtype=signal_dtype())
+    strength = np.zeros(len(distance), dtype=indicator_dtype())
+    
+    buy_condition = distance < lower  # Abaixo da banda inferior
+    sell_condition = distance > upper  # Acima da banda superior
+    
+    signal[buy_condition] = SIGNAL_BUY
+    signal[sell_condition] = SIGNAL_SELL
+    strength[buy_condition] = np.abs((distance[buy_condition] - lower[buy_condition]) / lower[buy_condition])
+    strength[sell_condition] = np.abs((distance[sell_condition] - upper[sell_condition]) / upper[sell_condition])
+    return signal, strength
+
 def generate_signals(df):
     """
     Gera sinais de compra/venda baseados na estratégia
     """
     try:
-        # Inicializar colunas de sinais
-        df['signal'] = 0
-        df['signal_type'] = 'HOLD'
-        df['signal_strength'] = 0.0
+        # Colunas NumPy nos dtypes da política de precisão (sinal int8 e rótulos Categorical no modo compacto)
+        signal, strength = band_signals(df['distanciaMME9_pct'].values, df['BB_upper'].values, df['BB_lower'].values)
         
-        # Condições para sinais
-        buy_condition = df['distanciaMME9_pct'] < df['BB_lower']  # Abaixo da banda inferior
-        sell_condition = df['distanciaMME9_pct'] > df['BB_upper']  # Acima da banda superior
-        
-        # Aplicar sinais
-        df.loc[buy_condition, 'signal'] = 1
-        df.loc[buy_condition, 'signal_type'] = 'BUY'
-        
-        df.loc[sell_condition, 'signal'] = -1
-        df.loc[sell_condition, 'signal_type'] = 'SELL'
-        
-        # Calcular força do sinal (distância das bandas)
-        df.loc[buy_condition, 'signal_strength'] = abs(
-            (df.loc[buy_condition, 'distanciaMME9_pct'] - df.loc[buy_condition, 'BB_lower']) / 
-            df.loc[buy_condition, 'BB_lower']
-        )
-        
-        df.loc[sell_condition, 'signal_strength'] = abs(
-            (df.loc[sell_condition, 'distanciaMME9_pct'] - df.loc[sell_condition, 'BB_upper']) / 
-            df.loc[sell_condition, 'BB_upper']
-        )
+        df['signal'] = signal
+        df['signal_type'] = signal_labels(signal)
+        df['signal_strength'] = strength
         
         # Contar sinais
-        buy_signals = len(df[df['signal'] == 1])
-        sell_signals = len(df[df['signal'] == -1])
+        buy_signals = int((signal == SIGNAL_BUY).sum())
+        sell_signals = int((signal == SIGNAL_SELL).sum())
         
         cprint(f"✅ Sinais gerados: {buy_signals} BUY, {sell_signals} SELL", "white", "on_green")
         return df
@@ -178,20 +175,16 @@ def run_complete_analysis(df):
     cprint("\n🌙 INICIANDO ANÁLISE COMPLETA DA ESTRATÉGIA MOON DEV", "white", "on_blue")
     cprint("=" * 60, "blue")
     
-    # Passo 1: Calcular distância MME9
-    cprint("\n📊 Passo 1: Calculando distância MME9...", "cyan")
-    df = calculate_distance_mme9(df)
-    
-    # Passo 2: Aplicar Bollinger Bands
-    cprint("\n📊 Passo 2: Aplicando Bollinger Bands (200, 2)...", "cyan")
+    # Passo 1: Distância MME9 + Bollinger Bands (uma passada só)
+    cprint("\n📊 Passo 1: Calculando distância MME9 e Bollinger Bands (200, 2)...", "cyan")
     df = calculate_bollinger_on_distance(df, period=200, std_dev=2)
     
-    # Passo 3: Gerar sinais
-    cprint("\n📊 Passo 3: Gerando sinais de trading...", "cyan")
+    # Passo 2: Gerar sinais
+    cprint("\n📊 Passo 2: Gerando sinais de trading...", "cyan")
     df = generate_signals(df)
     
-    # Passo 4: Analisar performance
-    cprint("\n📊 Passo 4: Analisando performance...", "cyan")
+    # Passo 3: Analisar performance
+    cprint("\n📊 Passo 3: Analisando performance...", "cyan")
     df, performance = analyze_strategy_performance(df)
     
     cprint("\n🎉 ANÁLISE COMPLETA FINALIZADA!", "white", "on_green")
@@ -0,0 +1,163 @@
+"""
+🌙 Moon Dev's Feature Cache
+Cache em disco, endereçado por conteúdo, das saídas do kernel da estratégia
+(MME, distância, bandas, exaustão). A chave é o hash dos fechamentos + os
+parâmetros + a versão do código dos indicadores; cada entrada é um diretório
+de .npy lidos por memory map. Quando o total passa de FEATURE_CACHE_MAX_MB as
+entradas usadas há mais tempo são apagadas (LRU).
+Built with love by Moon Dev 🚀
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+from termcolor import cprint
+
+from ..core.config import FEATURE_CACHE_ENABLED, FEATURE_CACHE_DIR, FEATURE_CACHE_MAX_MB
+from . import fused_indicators as kernel
+from . import rolling_stats
+
+_code_version = None
+
+
+def code_version():
+    """Hash do código dos indicadores: mudar a conta invalida o cache sozinho"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for module in (kernel, rolling_stats):
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def content_hash(values):
+    """Hash do conteúdo de um array (mesmos dados -> mesma chave, venha de onde vier)"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.blake2b(values.view(np.uint8), digest_size=16).hexdigest()
+
+
+class FeatureCache:
+    """(hash dos fechamentos, ema, bb, desvios, adjust, dtype, versão) -> dict de arrays"""
+
+    def __init__(self, root=FEATURE_CACHE_DIR, max_mb=FEATURE_CACHE_MAX_MB):
+        self.root = root
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+    def key(self, data_hash, ema_period, bb_period, bb_std, adjust, dtype):
+        params = [data_hash, int(ema_period), int(bb_period), float(bb_std), bool(adjust),
+                  np.dtype(dtype).name, code_version()]
+        return hashlib.sha256(json.dumps(params).encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """Arrays (memory map, só leitura) de uma entrada, ou None"""
+        path = self._path(key)
+        meta_file = os.path.join(path, 'meta.json')
+        try:
+            out = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in kernel.FUSED_OUTPUTS}
+            os.utime(meta_file)  # último uso, ordem do LRU
+        except (OSError, ValueError):
+            return None
+        return out
+
+    def put(self, key, out, params=None):
+        """Grava a entrada num diretório temporário e troca de uma vez (seguro entre processos)"""
+        path = self._path(key)
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            return
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp_path)
+        size = 0
+        for name in kernel.FUSED_OUTPUTS:
+            file_path = os.path.join(tmp_path, f'{name}.npy')
+            np.save(file_path, out[name])
+            size += os.path.getsize(file_path)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'size': size, 'created_at': time.time(), 'params': params}, f)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self.evict()
+
+    def _entries(self):
+        """[(último uso, tamanho, caminho)] de todas as entradas completas"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for shard in os.listdir(self.root):
+            shard_path = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                meta_file = os.path.join(shard_path, name, 'meta.json')
+                if name.endswith('.tmp'):
+                    continue
+                try:
+                    with open(meta_file) as f:
+                        size = json.load(f)['size']
+                    entries.append((os.path.getmtime(meta_file), size, os.path.join(shard_path, name)))
+                except (OSError, ValueError, KeyError):
+                    continue
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Apaga as entradas usadas há mais tempo até o total caber em max_bytes"""
+        with self.lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                self.stats['evicted'] += 1
+
+    def features(self, close, ema_period, bb_period, bb_std, adjust=False, dtype=np.float64):
+        """Saídas de fused_indicators para estes fechamentos, do cache quando possível"""
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        key = self.key(content_hash(close), ema_period, bb_period, bb_std, adjust, dtype)
+        out = self.get(key)
+        if out is not None and len(out['ema']) == len(close):
+            self.stats['hits'] += 1
+            return out
+
+        self.stats['misses'] += 1
+        out = kernel.fused_indicators(close, ema_period, bb_period, bb_std, adjust=adjust, dtype=dtype)
+        params = {'rows': len(close), 'ema_period': ema_period, 'bb_period': bb_period,
+                  'bb_std': bb_std, 'adjust': adjust, 'dtype': np.dtype(dtype).name}
+        try:
+            self.put(key, out, params)
+        except OSError as e:
+            cprint(f"⚠️ Não foi possível gravar no cache de features: {str(e)}", "white", "on_yellow")
+        return out
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+feature_cache = FeatureCache()
+
+
+def cached_fused_indicators(close, ema_period, bb_period, bb_std, adjust=False, dtype=np.float64):
+    """fused_indicators com o cache em disco (FEATURE_CACHE_ENABLED=False calcula sempre)"""
+    if not FEATURE_CACHE_ENABLED:
+        return kernel.fused_indicators(close, ema_period, bb_period, bb_std, adjust=adjust, dtype=dtype)
+    return feature_cache.features(close, ema_period, bb_period, bb_std, adjust=adjust, dtype=dtype)
@@ -0,0 +1,198 @@
+"""
+🌙 Moon Dev's Fused Strategy Kernel
+Distância MME + Bollinger Bands + exaustão num único kernel: MME, distância %,
+bandas (superior/média/inferior), máscaras de exaustão e forças são escritas
+em arrays pré-alocados. Com numba instalado o kernel percorre os fechamentos
+uma única vez; sem numba cai num caminho NumPy (MME do pandas + rolling_stats)
+que escreve direto nos mesmos buffers.
+Built with love by Moon Dev 🚀
+"""
+
+import math
+
+import numpy as np
+
+from .rolling_stats import rolling_mean_std
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Nome -> dtype dos arrays de saída (None = dtype de ponto flutuante escolhido em allocate_outputs)
+FUSED_OUTPUTS = {
+    'ema': None,
+    'distance': None,
+    'bb_upper': None,
+    'bb_middle': None,
+    'bb_lower': None,
+    'exhaustion_buy': np.bool_,
+    'exhaustion_sell': np.bool_,
+    'strength_buy': None,
+    'strength_sell': None,
+}
+
+# Recalcula média/M2 da janela a cada RESYNC_WINDOWS janelas (erro de arredondamento)
+RESYNC_WINDOWS = 50
+
+
+def _fused_kernel(close, alpha, adjust, bb_period, bb_std,
+                  ema, distance, upper, middle, lower,
+                  buy, sell, strength_buy, strength_sell):
+    """
+    Uma passada sobre close: MME (adjust=True igual a ewm(span).mean(),
+    adjust=False igual a calculate_ema), distância %, média/variância da janela
+    por Welford deslizante e as regras de exaustão. As contas são feitas em
+    float64 mesmo quando as saídas são float32. Compilado por numba quando
+    disponível.
+    """
+    n = close.shape[0]
+    decay = 1.0 - alpha
+    numerator = 0.0
+    denominator = 0.0
+    value = 0.0
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    since_resync = 0
+    resync_every = bb_period * RESYNC_WINDOWS
+
+    for i in range(n):
+        price = close[i]
+
+        # MME
+        if adjust:
+            numerator = price + decay * numerator
+            denominator = 1.0 + decay * denominator
+            value = numerator / denominator
+        elif i == 0:
+            value = price
+        else:
+            value = alpha * price + decay * value
+        ema[i] = value
+
+        # Relê o valor gravado: com saídas float32 a janela soma e remove exatamente o mesmo número
+        distance[i] = (price - value) / value * 100.0
+        d = distance[i]
+
+        # Janela deslizante da distância (Welford)
+        if count < bb_period:
+            count += 1
+            delta = d - mean
+            mean += delta / count
+            m2 += delta * (d - mean)
+        else:
+            old = distance[i - bb_period]
+            new_mean = mean + (d - old) / bb_period
+            m2 += (d - old) * (d - new_mean + old - mean)
+            mean = new_mean
+            since_resync += 1
+            if since_resync >= resync_every:
+                mean = 0.0
+                for j in range(i - bb_period + 1, i + 1):
+                    mean += distance[j]
+                mean /= bb_period
+                m2 = 0.0
+                for j in range(i - bb_period + 1, i + 1):
+                    m2 += (distance[j] - mean) ** 2
+                since_resync = 0
+
+        if count < bb_period:
+            upper[i] = np.nan
+            middle[i] = np.nan
+            lower[i] = np.nan
+            buy[i] = False
+            sell[i] = False
+            strength_buy[i] = 0.0
+            strength_sell[i] = 0.0
+            continue
+
+        std = math.sqrt(m2 / (bb_period - 1)) if m2 > 0.0 else 0.0
+        band_upper = mean + std * bb_std
+        band_lower = mean - std * bb_std
+        upper[i] = band_upper
+        middle[i] = mean
+        lower[i] = band_lower
+
+        # Exaustão: distância abaixo da banda inferior / acima da superior
+        buy[i] = d < band_lower
+        sell[i] = d > band_upper
+        strength_buy[i] = abs((d - band_lower) / band_lower) if d < band_lower else 0.0
+        strength_sell[i] = abs((d - band_upper) / band_upper) if d > band_upper else 0.0
+
+
+if njit is not None:
+    _fused_kernel = njit(cache=True, nogil=True, error_model='numpy')(_fused_kernel)
+
+
+def _fused_numpy(close, alpha, adjust, bb_period, bb_std,
+                 ema, distance, upper, middle, lower,
+                 buy, sell, strength_buy, strength_sell):
+    """Mesmo resultado do kernel, vetorizado e escrevendo nos buffers de saída"""
+    import pandas as pd
+
+    # MME no loop em C do pandas (a recursão não vetoriza em NumPy)
+    ema_values = pd.Series(close, copy=False).ewm(alpha=alpha, adjust=adjust).mean().values
+    ema[:] = ema_values
+
+    np.subtract(close, ema_values, out=distance)
+    np.divide(distance, ema_values, out=distance)
+    np.multiply(distance, 100.0, out=distance)
+
+    # Média e desvio da janela numa passada (janelas com NaN ficam NaN, como no pandas)
+    rolling_mean_std(distance, bb_period, out_mean=middle, out_std=upper)
+    np.multiply(upper, bb_std, out=upper)
+    np.subtract(middle, upper, out=lower)
+    np.add(middle, upper, out=upper)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.less(distance, lower, out=buy)
+        np.greater(distance, upper, out=sell)
+        for mask, band, strength in ((buy, lower, strength_buy), (sell, upper, strength_sell)):
+            strength.fill(0.0)
+            np.subtract(distance, band, out=strength, where=mask)
+            np.divide(strength, band, out=strength, where=mask)
+            np.abs(strength, out=strength)
+
+
+def allocate_outputs(n, dtype=np.float64):
+    """
+    Buffers de saída para n candles (reutilizáveis entre chamadas do mesmo tamanho).
+    dtype=np.float32 guarda MME/distância/bandas/forças pela metade da memória.
+    """
+    return {name: np.empty(n, dtype=kind or dtype) for name, kind in FUSED_OUTPUTS.items()}
+
+
+def fused_indicators(close, ema_period, bb_period, bb_std, adjust=False, out=None, dtype=np.float64):
+    """
+    Calcula toda a estratégia Distância MME + Bollinger de uma vez.
+
+    adjust=False reproduz calculate_ema (custom_indicators_simple);
+    adjust=True reproduz ewm(span=ema_period).mean() dos scripts de backtest.
+    out: dict de allocate_outputs(len(close)) para reutilizar memória.
+    dtype: ponto flutuante das saídas quando out não é passado.
+    Retorna o dict de arrays (chaves em FUSED_OUTPUTS).
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = close.shape[0]
+    if out is None:
+        out = allocate_outputs(n, dtype)
+    elif any(out[name].shape != (n,) for name in FUSED_OUTPUTS):
+        raise ValueError(f"Buffers de saída precisam ter {n} posições")
+
+    args = (
+        close, 2.0 / (ema_period + 1), bool(adjust), int(bb_period), float(bb_std),
+        *(out[name] for name in FUSED_OUTPUTS),
+    )
+    # NaN nos fechamentos quebraria a janela deslizante do kernel (o caminho NumPy trata)
+    if njit is not None and not np.isnan(close).any():
+        _fused_kernel(*args)
+    else:
+        _fused_numpy(*args)
+    return out
+
+
+def signal_arrays(out):
+    """Sinal (1 compra, -1 venda, 0 nada) e força combinados a partir das saídas"""
+    signal = out['exhaustion_buy'].astype(np.int8) - out['exhaustion_sell']
+    return signal, out['strength_buy'] + out['strength_sell']
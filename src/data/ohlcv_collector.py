@@ -12,6 +12,7 @@ from datetime import datetime
 import os
 from termcolor import colored, cprint
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 def collect_token_data(token, days_back=DAYSBACK_4_DATA, timeframe=DATA_TIMEFRAME):
     """Collect OHLCV data for a single token"""
@@ -27,14 +28,8 @@ def collect_token_data(token, days_back=DAYSBACK_4_DATA, timeframe=DATA_TIMEFRAM
             
         cprint(f"📊 Moon Dev's AI Agent processed {len(data)} candles for analysis", "white", "on_blue")
         
-        # Save data if configured
-        if SAVE_OHLCV_DATA:
-            save_path = f"data/{token}_latest.csv"
-        else:
-            save_path = f"temp_data/{token}_latest.csv"
-            
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        # Candles are already persisted by get_data in the columnar store
+        # (permanent when SAVE_OHLCV_DATA is True, temp_data otherwise)
         
         # Aplicar indicadores customizados da estratégia
         strategy_summary = generate_strategy_summary(data)
@@ -42,28 +37,36 @@ def collect_token_data(token, days_back=DAYSBACK_4_DATA, timeframe=DATA_TIMEFRAM
         # Adicionar resumo da estratégia aos dados
         data.attrs['strategy_summary'] = strategy_summary
         
-        # Save to CSV
-        data.to_csv(save_path)
-        cprint(f"💾 Moon Dev's AI Agent cached data for {token[:4]}", "white", "on_green")
-        
         return data
         
     except Exception as e:
         cprint(f"❌ Moon Dev's AI Agent encountered an error: {str(e)}", "white", "on_red")
         return None
 
-def collect_all_tokens():
+def collect_all_tokens(concurrent=CONCURRENT_COLLECTION, max_workers=COLLECTION_MAX_WORKERS):
     """Collect OHLCV data for all monitored tokens"""
     market_data = {}
     
     cprint("\n🔍 Moon Dev's AI Agent starting market data collection...", "white", "on_blue")
+    start_time = time.time()
     
-    for token in MONITORED_TOKENS:
-        data = collect_token_data(token)
-        if data is not None:
-            market_data[token] = data
+    if concurrent and len(MONITORED_TOKENS) > 1:
+        # Bounded pool; Birdeye's rate limit is enforced inside get_data
+        workers = max(1, min(max_workers, len(MONITORED_TOKENS)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(MONITORED_TOKENS, executor.map(collect_token_data, MONITORED_TOKENS)))
+        
+        # Keep MONITORED_TOKENS order
+        for token in MONITORED_TOKENS:
+            if results[token] is not None:
+                market_data[token] = results[token]
+    else:
+        for token in MONITORED_TOKENS:
+            data = collect_token_data(token)
+            if data is not None:
+                market_data[token] = data
             
-    cprint("\n✨ Moon Dev's AI Agent completed market data collection!", "white", "on_green")
+    cprint(f"\n✨ Moon Dev's AI Agent completed market data collection in {time.time() - start_time:.1f}s!", "white", "on_green")
     
     return market_data
 
@@ -0,0 +1,272 @@
+"""
+🌙 Moon Dev's Columnar OHLCV Store
+Keeps OHLCV history on disk as one memory-mapped .npy file per column,
+keyed by (symbol, timeframe), so loading a dataset never re-parses a CSV.
+Built with love by Moon Dev 🚀
+"""
+
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import OHLCV_STORE_DIR, TEMP_OHLCV_STORE_DIR, SAVE_OHLCV_DATA
+from .precision import price_dtype
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+TIMESTAMP_COLUMN = 'unix_time'
+
+# BTC-5m-30wks-data.csv -> ('BTC', '5m')
+CSV_NAME_PATTERN = re.compile(r'^(?P<symbol>[A-Za-z0-9]+)-(?P<timeframe>\d+[a-zA-Z]+)-')
+
+
+class OHLCVStore:
+    """
+    Columnar OHLCV store.
+
+    Layout: {root}/{symbol}/{timeframe}/unix_time.npy (int64 epoch seconds),
+    open/high/low/close/volume.npy (float64) and a meta.json with the row
+    count, the first and last bar times, the range the history covers and,
+    for imported CSVs, the source fingerprint.
+    """
+
+    def __init__(self, root=OHLCV_STORE_DIR):
+        self.root = root
+
+    def path_for(self, symbol, timeframe):
+        return os.path.join(self.root, symbol, timeframe)
+
+    def meta(self, symbol, timeframe):
+        """Return the meta.json dict for a key, or None if nothing is stored"""
+        meta_file = os.path.join(self.path_for(symbol, timeframe), 'meta.json')
+        if not os.path.exists(meta_file):
+            return None
+        try:
+            with open(meta_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has(self, symbol, timeframe):
+        meta = self.meta(symbol, timeframe)
+        return meta is not None and meta.get('rows', 0) > 0
+
+    def timeframes(self, symbol):
+        """Timeframes stored for a symbol"""
+        path = os.path.join(self.root, symbol)
+        if not os.path.isdir(path):
+            return []
+        return [timeframe for timeframe in sorted(os.listdir(path)) if self.has(symbol, timeframe)]
+
+    def write(self, symbol, timeframe, timestamps, columns, source=None, covered_from=None):
+        """
+        Replace the stored arrays for (symbol, timeframe).
+        covered_from: start of the requested range the bars came from, so a
+        series with no older bars (young token) isn't asked for them again.
+        """
+        path = self.path_for(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+
+        timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        arrays = {TIMESTAMP_COLUMN: timestamps}
+        for col in OHLCV_COLUMNS:
+            values = np.ascontiguousarray(columns[col], dtype=np.float64)
+            if len(values) != len(timestamps):
+                raise ValueError(f"Column {col} has {len(values)} rows, expected {len(timestamps)}")
+            arrays[col] = values
+
+        # Write each column to a temp file and swap it in, meta.json goes last
+        for name, values in arrays.items():
+            final_file = os.path.join(path, f'{name}.npy')
+            tmp_file = final_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_file, final_file)
+
+        meta = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'rows': int(len(timestamps)),
+            'first_unix_time': int(timestamps[0]) if len(timestamps) else None,
+            'last_unix_time': int(timestamps[-1]) if len(timestamps) else None,
+            'covered_from': int(min(covered_from, timestamps[0])) if covered_from is not None and len(timestamps) else None,
+            'updated_at': time.time(),
+            'source': source,
+        }
+        meta_file = os.path.join(path, 'meta.json')
+        with open(meta_file + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_file + '.tmp', meta_file)
+
+    def last_timestamp(self, symbol, timeframe):
+        """Epoch seconds of the newest stored bar, or None"""
+        meta = self.meta(symbol, timeframe)
+        if meta is None or not meta.get('rows'):
+            return None
+        return meta.get('last_unix_time')
+
+    def history_start(self, symbol, timeframe):
+        """Epoch seconds the stored history reaches back to (covered range or first bar), or None"""
+        meta = self.meta(symbol, timeframe)
+        if meta is None or not meta.get('rows'):
+            return None
+        if meta.get('covered_from') is not None:
+            return meta['covered_from']
+        if meta.get('first_unix_time') is not None:
+            return meta['first_unix_time']
+        # Stored before first_unix_time was kept in meta.json
+        timestamps, _ = self.read_arrays(symbol, timeframe)
+        return int(timestamps[0])
+
+    def merge(self, symbol, timeframe, timestamps, columns, source=None, covered_from=None):
+        """
+        Add new bars in place (newer ones or a backfill of older history).
+        Bars with a timestamp already stored overwrite the old values, which
+        replaces the still-forming last candle with its updated version.
+        covered_from: start of the range requested for a backfill (see write).
+        Returns the number of bars that were not stored before.
+        """
+        new_ts = np.asarray(timestamps, dtype=np.int64)
+        history_start = self.history_start(symbol, timeframe)
+        if covered_from is not None and history_start is not None:
+            covered_from = min(covered_from, history_start)
+        elif covered_from is None:
+            covered_from = history_start
+        if len(new_ts) == 0:
+            if covered_from is not None and covered_from != history_start:
+                self._update_meta(symbol, timeframe, covered_from=int(covered_from))
+            return 0
+
+        # Sort and drop duplicates inside the new batch (last one wins)
+        order = np.argsort(new_ts, kind='stable')
+        new_ts = new_ts[order]
+        keep = np.append(new_ts[1:] != new_ts[:-1], True)
+        new_ts = new_ts[keep]
+        new_cols = {col: np.asarray(columns[col], dtype=np.float64)[order][keep] for col in OHLCV_COLUMNS}
+
+        old_ts, old_cols = self.read_arrays(symbol, timeframe, mmap=False)
+        if old_ts is None or len(old_ts) == 0:
+            self.write(symbol, timeframe, new_ts, new_cols, source=source, covered_from=covered_from)
+            return len(new_ts)
+
+        # Old bars with the same timestamp are replaced by the new ones
+        keep_old = ~np.isin(old_ts, new_ts)
+        merged_ts = np.concatenate([old_ts[keep_old], new_ts])
+        merged = {col: np.concatenate([old_cols[col][keep_old], new_cols[col]]) for col in OHLCV_COLUMNS}
+
+        # Only re-sort when the batch does not simply extend the history
+        if len(new_ts) < len(merged_ts) and new_ts[0] < merged_ts[len(merged_ts) - len(new_ts) - 1]:
+            order = np.argsort(merged_ts, kind='stable')
+            merged_ts = merged_ts[order]
+            merged = {col: values[order] for col, values in merged.items()}
+
+        added = len(merged_ts) - len(old_ts)
+        self.write(symbol, timeframe, merged_ts, merged, source=source, covered_from=covered_from)
+        return added
+
+    def _update_meta(self, symbol, timeframe, **fields):
+        """Change meta.json fields without rewriting the arrays"""
+        meta = self.meta(symbol, timeframe)
+        meta.update(fields)
+        meta_file = os.path.join(self.path_for(symbol, timeframe), 'meta.json')
+        with open(meta_file + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_file + '.tmp', meta_file)
+
+    def read_arrays(self, symbol, timeframe, mmap=True):
+        """Return (timestamps, {column: array}) as memory-mapped read-only arrays"""
+        meta = self.meta(symbol, timeframe)
+        if meta is None:
+            return None, None
+
+        path = self.path_for(symbol, timeframe)
+        mode = 'r' if mmap else None
+        timestamps = np.load(os.path.join(path, f'{TIMESTAMP_COLUMN}.npy'), mmap_mode=mode)
+        columns = {col: np.load(os.path.join(path, f'{col}.npy'), mmap_mode=mode) for col in OHLCV_COLUMNS}
+        return timestamps, columns
+
+    def load(self, symbol, timeframe, precision=None):
+        """
+        Load a key as a DataFrame with a datetime64 'timestamp' column and OHLCV
+        in the precision policy's price dtype (float64 unless DATA_PRECISION says otherwise).
+        Timeframes that are not stored are resampled from a finer stored one.
+        """
+        timestamps, columns = self.read_arrays(symbol, timeframe)
+        if timestamps is None:
+            # Not stored at this timeframe: aggregate a finer stored one (e.g. BTC 1h from 5m)
+            from .resampler import read_bars
+            timestamps, columns = read_bars(self, symbol, timeframe)
+            if timestamps is None:
+                return None
+        return arrays_to_frame(timestamps, columns, precision)
+
+    def import_csv(self, file_path, symbol=None, timeframe=None):
+        """Parse a CSV once and store it; later calls are served from the .npy files"""
+        if symbol is None or timeframe is None:
+            symbol, timeframe = parse_csv_key(file_path)
+
+        stat = os.stat(file_path)
+        source = {
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+        }
+
+        meta = self.meta(symbol, timeframe)
+        if meta is not None and meta.get('source') == source:
+            return symbol, timeframe
+
+        df = pd.read_csv(file_path)
+        df.columns = df.columns.str.lower()
+        time_col = 'datetime' if 'datetime' in df.columns else 'date'
+
+        missing_cols = [col for col in OHLCV_COLUMNS if col not in df.columns]
+        if time_col not in df.columns or missing_cols:
+            raise ValueError(f"{file_path} is missing columns: {missing_cols or [time_col]}")
+
+        df = df.dropna()
+        timestamps = pd.to_datetime(df[time_col]).values.astype('datetime64[s]').astype(np.int64)
+        self.write(symbol, timeframe, timestamps, {col: df[col].values for col in OHLCV_COLUMNS}, source=source)
+        return symbol, timeframe
+
+
+def arrays_to_frame(timestamps, columns, precision=None):
+    """Build a DataFrame from stored arrays (copies out of the memory map)"""
+    dtype = price_dtype(precision)
+    frame = {'timestamp': pd.to_datetime(np.asarray(timestamps), unit='s')}
+    for col in OHLCV_COLUMNS:
+        frame[col] = np.array(columns[col], dtype=dtype)
+    return pd.DataFrame(frame)
+
+
+def parse_csv_key(file_path):
+    """Derive (symbol, timeframe) from a bundled CSV name like BTC-5m-30wks-data.csv"""
+    name = os.path.basename(file_path)
+    match = CSV_NAME_PATTERN.match(name)
+    if match:
+        return match.group('symbol').upper(), match.group('timeframe')
+    return os.path.splitext(name)[0], 'csv'
+
+
+def get_live_store():
+    """Store used by the live collector, honouring SAVE_OHLCV_DATA"""
+    return OHLCVStore(OHLCV_STORE_DIR if SAVE_OHLCV_DATA else TEMP_OHLCV_STORE_DIR)
+
+
+def load_csv_data(file_path, store=None, precision=None, timeframe=None):
+    """
+    Load a historical OHLCV CSV through the columnar store.
+    The first call parses the CSV; later runs only map the .npy columns.
+    The .npy files always keep float64, precision only affects the returned frame.
+    timeframe: coarser bars to build from the CSV (e.g. '1h' from BTC-5m), memoized in memory.
+    """
+    store = store or OHLCVStore()
+    symbol, csv_timeframe = store.import_csv(file_path)
+    if timeframe is not None and timeframe != csv_timeframe:
+        from .resampler import read_bars
+        timestamps, columns = read_bars(store, symbol, timeframe, base_timeframe=csv_timeframe)
+        return arrays_to_frame(timestamps, columns, precision)
+    return store.load(symbol, csv_timeframe, precision)
@@ -0,0 +1,124 @@
+"""
+🌙 Moon Dev's Parallel Optimizer
+Distribui unidades de trabalho (arquivo, bloco de parâmetros) num
+ProcessPoolExecutor, devolve os resultados conforme ficam prontos e grava
+um checkpoint JSONL para retomar uma varredura interrompida.
+Built with love by Moon Dev 🚀
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from termcolor import cprint
+
+from .ohlcv_store import OHLCVStore
+from .parameter_sweep import run_parameter_sweep
+
+
+def load_checkpoint(checkpoint_file):
+    """Lê {chave: resultado} de um checkpoint JSONL (linhas corrompidas são ignoradas)"""
+    done = {}
+    if not checkpoint_file or not os.path.exists(checkpoint_file):
+        return done
+    with open(checkpoint_file) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            done[entry['key']] = entry['result']
+    return done
+
+
+def run_work_units(worker, units, max_workers=None, checkpoint_file=None, on_result=None):
+    """
+    Executa worker(*args) para cada (key, args) em processos separados.
+
+    Os resultados chegam em ordem de conclusão: cada um é gravado no
+    checkpoint (se houver) e repassado a on_result(key, result). Chaves já
+    presentes no checkpoint não são executadas de novo.
+    Retorna {key: result} com todas as unidades.
+    """
+    results = load_checkpoint(checkpoint_file)
+    pending = [(key, args) for key, args in units if key not in results]
+
+    if results:
+        cprint(f"♻️ Retomando do checkpoint: {len(units) - len(pending)}/{len(units)} unidades prontas", "cyan")
+    if not pending:
+        return results
+
+    checkpoint = None
+    if checkpoint_file:
+        os.makedirs(os.path.dirname(checkpoint_file) or '.', exist_ok=True)
+        checkpoint = open(checkpoint_file, 'a')
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(worker, *args): key for key, args in pending}
+            for future in as_completed(futures):
+                key = futures[future]
+                result = future.result()
+                results[key] = result
+                if checkpoint:
+                    checkpoint.write(json.dumps({'key': key, 'result': result}) + '\n')
+                    checkpoint.flush()
+                if on_result:
+                    on_result(key, result)
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    return results
+
+
+def _sweep_unit(store_root, symbol, timeframe, sample_size, ema_period, bb_periods, bb_stds, adjust):
+    """Worker: mapeia os fechamentos do store (páginas compartilhadas entre processos) e varre um bloco"""
+    _, columns = OHLCVStore(store_root).read_arrays(symbol, timeframe, mmap=True)
+    close = columns['close']
+    if sample_size:
+        close = close[-sample_size:]
+    sweep = run_parameter_sweep(close, [ema_period], bb_periods, bb_stds, adjust=adjust)
+    return sweep.results()
+
+
+def parallel_sweep(csv_files, ema_periods, bb_periods, bb_stds, adjust=True, sample_size=None,
+                   max_workers=None, checkpoint_file=None, on_result=None, store=None):
+    """
+    Varre a mesma grade de parâmetros em vários CSVs, uma unidade por (arquivo, EMA).
+
+    Cada CSV é importado uma vez para o OHLCVStore; os workers recebem apenas
+    a chave e abrem as colunas .npy via mmap, então nenhum DataFrame é
+    serializado e todos os processos leem as mesmas páginas de memória.
+    on_result(csv_file, ema_period, results) é chamado a cada unidade concluída.
+    Retorna {csv_file: [resultados no formato de test_single_parameter_set]}.
+    """
+    store = store or OHLCVStore()
+    bb_periods = [int(p) for p in bb_periods]
+    bb_stds = [float(s) for s in bb_stds]
+
+    units = []
+    unit_info = {}
+    for csv_file in csv_files:
+        symbol, timeframe = store.import_csv(csv_file)
+        meta = store.meta(symbol, timeframe)
+        # A versão dos dados entra na chave para o checkpoint não reaproveitar resultados velhos
+        data_version = f"{meta['rows']}:{meta.get('last_unix_time')}"
+        for ema_period in ema_periods:
+            key = (f"{os.path.basename(csv_file)}|{data_version}|n={sample_size}|ema={int(ema_period)}|"
+                   f"bb={bb_periods}|std={bb_stds}|adjust={adjust}")
+            args = (store.root, symbol, timeframe, sample_size, int(ema_period), bb_periods, bb_stds, adjust)
+            units.append((key, args))
+            unit_info[key] = (csv_file, int(ema_period))
+
+    def unit_done(key, result):
+        if on_result:
+            on_result(*unit_info[key], result)
+
+    results = run_work_units(_sweep_unit, units, max_workers=max_workers,
+                             checkpoint_file=checkpoint_file, on_result=unit_done)
+
+    by_file = {csv_file: [] for csv_file in csv_files}
+    for key, _ in units:
+        by_file[unit_info[key][0]].extend(results[key])
+    return by_file
@@ -0,0 +1,150 @@
+"""
+🌙 Moon Dev's Parameter Sweep Engine
+Testa grades inteiras de parâmetros (EMA × BB período × BB desvios) de uma vez:
+cada EMA é calculada uma única vez, as estatísticas móveis uma vez por
+(EMA, período BB) e todos os desvios são avaliados em broadcast NumPy.
+Built with love by Moon Dev 🚀
+"""
+
+import numpy as np
+import pandas as pd
+
+from .rolling_stats import rolling_mean_std
+
+# Métricas do tensor de resultados, na mesma ordem/nome de test_single_parameter_set
+SWEEP_METRICS = [
+    'buy_signals',
+    'sell_signals',
+    'total_signals',
+    'strategy_return',
+    'signal_frequency',
+    'avg_strength',
+]
+
+
+class SweepResult:
+    """
+    Resultado de uma varredura: metrics[nome] é um tensor 3-D indexado por
+    (ema_periods, bb_periods, bb_stds). Combinações sem sinais de compra E
+    venda ficam com NaN, como o None de test_single_parameter_set.
+    """
+
+    def __init__(self, ema_periods, bb_periods, bb_stds, metrics):
+        self.ema_periods = list(ema_periods)
+        self.bb_periods = list(bb_periods)
+        self.bb_stds = list(bb_stds)
+        self.metrics = metrics
+
+    @property
+    def shape(self):
+        return (len(self.ema_periods), len(self.bb_periods), len(self.bb_stds))
+
+    @property
+    def valid(self):
+        """Máscara 3-D das combinações com sinais de compra e venda"""
+        return ~np.isnan(self.metrics['strategy_return'])
+
+    def _record(self, i, j, k):
+        result = {
+            'ema_period': int(self.ema_periods[i]),
+            'bb_period': int(self.bb_periods[j]),
+            'bb_std': float(self.bb_stds[k]),
+        }
+        for name in SWEEP_METRICS:
+            value = self.metrics[name][i, j, k]
+            result[name] = int(value) if name.endswith('_signals') else float(value)
+        return result
+
+    def results(self):
+        """Lista de dicts (um por combinação válida) no formato dos otimizadores"""
+        return [self._record(i, j, k) for i, j, k in zip(*np.nonzero(self.valid))]
+
+    def best(self, metric='strategy_return'):
+        """Melhor combinação pelo critério escolhido (ou None)"""
+        if not self.valid.any():
+            return None
+        values = np.where(self.valid, self.metrics[metric], -np.inf)
+        return self._record(*np.unravel_index(np.argmax(values), values.shape))
+
+
+def _band_side(close, distance, rolling_mean, rolling_std, stds, side):
+    """
+    Sinais de um lado das bandas para todos os desvios.
+    Só os candles cujo z-score pode cruzar a banda mais estreita são testados,
+    e o teste em si é o mesmo do pandas (distância < banda inferior / > superior).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (distance - rolling_mean) / rolling_std
+    k_min = stds.min()
+    if side == 'buy':
+        candidates = np.nonzero(z < -k_min + 1e-6)[0]
+    else:
+        candidates = np.nonzero(z > k_min - 1e-6)[0]
+
+    d = distance[candidates]
+    band_offset = rolling_std[candidates][None, :] * stds[:, None]
+    if side == 'buy':
+        band = rolling_mean[candidates][None, :] - band_offset
+        signal = d[None, :] < band
+    else:
+        band = rolling_mean[candidates][None, :] + band_offset
+        signal = d[None, :] > band
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        strength = np.where(signal, np.abs((d[None, :] - band) / band), 0.0).sum(axis=1)
+    return signal.sum(axis=1), signal @ close[candidates], strength
+
+
+def _evaluate_bands(close, distance, rolling_mean, rolling_std, stds):
+    """Avalia todos os desvios de uma vez (um valor por desvio em cada métrica)"""
+    n = len(close)
+    buy_signals, buy_close_sum, buy_strength = _band_side(close, distance, rolling_mean, rolling_std, stds, 'buy')
+    sell_signals, sell_close_sum, sell_strength = _band_side(close, distance, rolling_mean, rolling_std, stds, 'sell')
+    total_signals = buy_signals + sell_signals
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_buy = buy_close_sum / buy_signals
+        avg_sell = sell_close_sum / sell_signals
+        strategy_return = ((avg_sell / avg_buy) - 1) * 100
+        avg_strength = (buy_strength + sell_strength) / total_signals
+
+    valid = (buy_signals > 0) & (sell_signals > 0)
+    return {
+        'buy_signals': np.where(valid, buy_signals, np.nan),
+        'sell_signals': np.where(valid, sell_signals, np.nan),
+        'total_signals': np.where(valid, total_signals, np.nan),
+        'strategy_return': np.where(valid, strategy_return, np.nan),
+        'signal_frequency': np.where(valid, total_signals / n * 100, np.nan),
+        'avg_strength': np.where(valid, avg_strength, np.nan),
+    }
+
+
+def run_parameter_sweep(close, ema_periods, bb_periods, bb_stds, adjust=True):
+    """
+    Varre todas as combinações de parâmetros sobre uma série de fechamentos.
+
+    adjust=True reproduz ewm(span=p).mean() (otimizador_simples);
+    adjust=False reproduz calculate_ema (custom_indicators_simple).
+    """
+    close_series = pd.Series(np.asarray(close, dtype=np.float64))
+    close_values = close_series.values
+    stds = np.asarray(bb_stds, dtype=np.float64)
+
+    shape = (len(ema_periods), len(bb_periods), len(bb_stds))
+    metrics = {name: np.full(shape, np.nan) for name in SWEEP_METRICS}
+
+    for i, ema_period in enumerate(ema_periods):
+        # Uma EMA por período
+        ema = close_series.ewm(span=ema_period, adjust=adjust).mean()
+        distance = (close_series - ema) / ema * 100
+        distance_values = distance.values
+
+        for j, bb_period in enumerate(bb_periods):
+            # Estatísticas móveis (média e desvio numa passada) uma vez por (EMA, período BB)
+            rolling_mean, rolling_std = rolling_mean_std(distance_values, bb_period)
+
+            evaluated = _evaluate_bands(close_values, distance_values, rolling_mean, rolling_std, stds)
+            for name, values in evaluated.items():
+                metrics[name][i, j, :] = values
+
+    return SweepResult(ema_periods, bb_periods, bb_stds, metrics)
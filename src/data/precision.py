@@ -0,0 +1,97 @@
+"""
+🌙 Moon Dev's Precision Policy
+Modelo de dados enxuto para backtests longos: preços e indicadores em
+float32 quando a precisão permite, sinais como enum int8 em vez das strings
+'BUY'/'SELL'/'HOLD' e timestamps em int64 (datetime64). A política vem de
+DATA_PRECISION e pode ser validada contra o resultado em float64.
+Built with love by Moon Dev 🚀
+"""
+
+import numpy as np
+
+from ..core.config import DATA_PRECISION, PRECISION_MAX_SIGNAL_MISMATCH
+
+# Enum dos sinais (cabe em int8)
+SIGNAL_SELL = -1
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_LABELS = ['SELL', 'HOLD', 'BUY']  # código do Categorical = sinal + 1
+
+# prices: OHLCV dos DataFrames; indicators: MME/distância/bandas/forças;
+# signals: coluna de sinal; compact_labels: signal_type como Categorical (códigos int8)
+PRECISION_POLICIES = {
+    'float64': {'prices': np.float64, 'indicators': np.float64, 'signals': np.int64, 'compact_labels': False},
+    'indicators32': {'prices': np.float64, 'indicators': np.float32, 'signals': np.int8, 'compact_labels': True},
+    'compact': {'prices': np.float32, 'indicators': np.float32, 'signals': np.int8, 'compact_labels': True},
+}
+
+
+def get_policy(name=None):
+    """Política pelo nome (None = DATA_PRECISION da config)"""
+    name = DATA_PRECISION if name is None else name
+    if name not in PRECISION_POLICIES:
+        raise ValueError(f"Política de precisão desconhecida: {name} (use {', '.join(PRECISION_POLICIES)})")
+    return PRECISION_POLICIES[name]
+
+
+def price_dtype(policy=None):
+    return get_policy(policy)['prices']
+
+
+def indicator_dtype(policy=None):
+    return get_policy(policy)['indicators']
+
+
+def signal_dtype(policy=None):
+    return get_policy(policy)['signals']
+
+
+def signal_labels(signal, policy=None):
+    """
+    'BUY'/'SELL'/'HOLD' por candle: array de strings na política float64,
+    Categorical (1 byte por candle) nas compactas - comparações como
+    df['signal_type'] == 'BUY' continuam funcionando.
+    """
+    signal = np.asarray(signal)
+    if not get_policy(policy)['compact_labels']:
+        return np.select([signal == SIGNAL_BUY, signal == SIGNAL_SELL], ['BUY', 'SELL'], 'HOLD').astype(object)
+
+    import pandas as pd
+    return pd.Categorical.from_codes(signal.astype(np.int8) + 1, categories=SIGNAL_LABELS)
+
+
+def frame_nbytes(df):
+    """Memória real do DataFrame (inclui objetos string)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compare_with_float64(close, ema_period, bb_period, bb_std, adjust=False, policy=None):
+    """
+    Roda o kernel da estratégia em float64 e na política escolhida sobre os
+    mesmos fechamentos. Retorna o erro absoluto máximo de cada indicador, os
+    candles cujo sinal mudou e se a política passa no limite
+    PRECISION_MAX_SIGNAL_MISMATCH.
+    """
+    from .fused_indicators import fused_indicators, signal_arrays
+
+    settings = get_policy(policy)
+    close = np.asarray(close, dtype=np.float64)
+    reference = fused_indicators(close, ema_period, bb_period, bb_std, adjust=adjust)
+    candidate = fused_indicators(close.astype(settings['prices']), ema_period, bb_period, bb_std,
+                                 adjust=adjust, dtype=settings['indicators'])
+
+    errors = {}
+    for name, values in reference.items():
+        if values.dtype.kind == 'f':
+            diff = np.abs(candidate[name].astype(np.float64) - values)
+            errors[name] = float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0
+
+    mismatches = int((signal_arrays(reference)[0] != signal_arrays(candidate)[0]).sum())
+    mismatch_rate = mismatches / len(close) if len(close) else 0.0
+    return {
+        'policy': DATA_PRECISION if policy is None else policy,
+        'max_abs_error': errors,
+        'signal_mismatches': mismatches,
+        'signal_mismatch_rate': mismatch_rate,
+        'ok': mismatch_rate <= PRECISION_MAX_SIGNAL_MISMATCH,
+    }
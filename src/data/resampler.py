@@ -0,0 +1,160 @@
+"""
+🌙 Moon Dev's OHLCV Resampler
+Only the finest timeframe of a symbol has to be stored; coarser bars
+(3m -> 15m -> 1H -> 4H ...) are aggregated from it with vectorized NumPy
+reductions and memoized until new base bars land in the store.
+Built with love by Moon Dev 🚀
+"""
+
+import re
+import threading
+
+import numpy as np
+
+from .ohlcv_store import OHLCV_COLUMNS
+
+# Birdeye / CSV style timeframes: 3m, 15m, 1H, 4H, 1D, 1W (case-insensitive for h/d/w)
+TIMEFRAME_PATTERN = re.compile(r'^(?P<count>\d+)(?P<unit>[mhdwHDW])$')
+UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# Epoch (1970-01-01) was a Thursday, weekly bars start on Monday
+WEEK_ORIGIN = 4 * 86400
+
+
+def timeframe_seconds(timeframe):
+    """'15m' -> 900, '4H' -> 14400; None for timeframes without a fixed length (1M)"""
+    match = TIMEFRAME_PATTERN.match(timeframe)
+    if not match:
+        return None
+    return int(match.group('count')) * UNIT_SECONDS[match.group('unit').lower()]
+
+
+def can_resample(base_timeframe, timeframe):
+    """True when timeframe bars are whole multiples of base_timeframe bars"""
+    base = timeframe_seconds(base_timeframe)
+    target = timeframe_seconds(timeframe)
+    return base is not None and target is not None and target > base and target % base == 0
+
+
+def resample_arrays(timestamps, columns, timeframe):
+    """
+    Aggregate OHLCV arrays into timeframe bars aligned to UTC.
+    open = first, high = max, low = min, close = last, volume = sum.
+    A leading bucket that starts before the data (partial history) is
+    dropped; the trailing bucket is kept even if still forming, like the
+    last candle Birdeye returns.
+    """
+    seconds = timeframe_seconds(timeframe)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if len(timestamps) == 0:
+        return timestamps, {col: np.asarray(columns[col], dtype=np.float64)[:0] for col in OHLCV_COLUMNS}
+
+    origin = WEEK_ORIGIN if seconds % UNIT_SECONDS['w'] == 0 else 0
+    buckets = (timestamps - origin) // seconds * seconds + origin
+
+    # First index of every bucket (timestamps are sorted)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    if buckets[0] != timestamps[0]:
+        starts = starts[1:]
+    if len(starts) == 0:
+        return timestamps[:0], {col: np.asarray(columns[col], dtype=np.float64)[:0] for col in OHLCV_COLUMNS}
+    ends = np.append(starts[1:], len(timestamps)) - 1
+    first = starts[0]
+
+    out = {
+        'open': np.asarray(columns['open'])[starts],
+        'high': np.maximum.reduceat(np.asarray(columns['high'])[first:], starts - first),
+        'low': np.minimum.reduceat(np.asarray(columns['low'])[first:], starts - first),
+        'close': np.asarray(columns['close'])[ends],
+        'volume': np.add.reduceat(np.asarray(columns['volume'])[first:], starts - first),
+    }
+    return buckets[starts], {col: np.asarray(values, dtype=np.float64) for col, values in out.items()}
+
+
+class ResampleCache:
+    """
+    Derived bars per (store root, symbol, base timeframe, timeframe).
+
+    An entry is valid while the base meta.json (rows, last bar, update time)
+    is unchanged. When new base bars were appended only the buckets from the
+    last derived bar onwards are re-aggregated.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'partial': 0, 'full': 0}
+
+    @staticmethod
+    def _version(meta):
+        return (meta.get('rows'), meta.get('last_unix_time'), meta.get('updated_at'))
+
+    def get(self, store, symbol, base_timeframe, timeframe):
+        """(timestamps, {column: array}) of timeframe bars, or (None, None) if the base is not stored"""
+        meta = store.meta(symbol, base_timeframe)
+        if meta is None:
+            return None, None
+        key = (store.root, symbol, base_timeframe, timeframe)
+        version = self._version(meta)
+
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry['version'] == version:
+            self.stats['hits'] += 1
+            return entry['timestamps'], entry['columns']
+
+        base_ts, base_cols = store.read_arrays(symbol, base_timeframe)
+        timestamps = columns = None
+        if entry is not None and len(entry['timestamps']):
+            # Re-aggregate from the start of the last (possibly still forming) derived bar
+            last_start = entry['timestamps'][-1]
+            index = int(np.searchsorted(base_ts, last_start, side='left'))
+            if index < len(base_ts) and base_ts[index] == last_start and index == entry['last_base_index']:
+                tail_ts, tail_cols = resample_arrays(base_ts[index:], {c: base_cols[c][index:] for c in OHLCV_COLUMNS}, timeframe)
+                timestamps = np.concatenate([entry['timestamps'][:-1], tail_ts])
+                columns = {c: np.concatenate([entry['columns'][c][:-1], tail_cols[c]]) for c in OHLCV_COLUMNS}
+                self.stats['partial'] += 1
+
+        if timestamps is None:
+            timestamps, columns = resample_arrays(base_ts, base_cols, timeframe)
+            self.stats['full'] += 1
+
+        last_base_index = int(np.searchsorted(base_ts, timestamps[-1], side='left')) if len(timestamps) else 0
+        with self.lock:
+            self.entries[key] = {
+                'version': version,
+                'timestamps': timestamps,
+                'columns': columns,
+                'last_base_index': last_base_index,
+            }
+        return timestamps, columns
+
+    def invalidate(self, symbol=None):
+        with self.lock:
+            if symbol is None:
+                self.entries.clear()
+            else:
+                self.entries = {key: value for key, value in self.entries.items() if key[1] != symbol}
+
+
+resample_cache = ResampleCache()
+
+
+def read_bars(store, symbol, timeframe, base_timeframe=None, cache=resample_cache):
+    """
+    (timestamps, columns) for symbol at timeframe: stored directly, or
+    resampled from base_timeframe (default: the finest stored timeframe that
+    divides timeframe).
+    """
+    if base_timeframe is None:
+        if store.has(symbol, timeframe):
+            return store.read_arrays(symbol, timeframe)
+        candidates = [tf for tf in store.timeframes(symbol) if can_resample(tf, timeframe)]
+        if not candidates:
+            return None, None
+        base_timeframe = min(candidates, key=timeframe_seconds)
+    if base_timeframe == timeframe:
+        return store.read_arrays(symbol, timeframe)
+    if not can_resample(base_timeframe, timeframe):
+        raise ValueError(f"Cannot build {timeframe} bars from {base_timeframe} bars")
+    return cache.get(store, symbol, base_timeframe, timeframe)
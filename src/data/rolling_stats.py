@@ -0,0 +1,87 @@
+"""
+🌙 Moon Dev's Rolling Stats
+Média e desvio padrão móveis numa única passada (somas acumuladas) em vez
+de rolling().mean() + rolling().std() separados do pandas. Mesma semântica
+do pandas: janelas incompletas ou com NaN dão NaN e o desvio é amostral
+(ddof=1). A variante estável recentra as somas em blocos, então o erro de
+arredondamento não cresce com o tamanho da série.
+Built with love by Moon Dev 🚀
+"""
+
+import numpy as np
+
+# Janelas por bloco na variante estável (cada bloco tem sua própria soma acumulada).
+# Séries menores que isso são um bloco só; nas maiores os blocos também cabem melhor no cache.
+STABLE_BLOCK = 65_536
+
+
+def _window_sums(values, window):
+    """
+    Média e soma dos quadrados centrados de cada janela completa de values
+    (len(values) - window + 1 resultados). As somas são deslocadas pela média
+    do próprio trecho para evitar cancelamento catastrófico.
+    """
+    finite = np.isfinite(values)
+    shift = values[finite].mean() if finite.any() else 0.0
+    centered = np.where(finite, values - shift, 0.0)
+
+    sums = np.zeros(len(values) + 1)
+    squares = np.zeros(len(values) + 1)
+    np.cumsum(centered, out=sums[1:])
+    np.square(centered, out=centered)
+    np.cumsum(centered, out=squares[1:])
+
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    mean = window_sum / window
+    # Soma dos quadrados dos desvios em relação à média da janela
+    window_squares -= window_sum * mean
+    np.maximum(window_squares, 0.0, out=window_squares)
+    mean += shift
+
+    if not finite.all():
+        # Janela com algum NaN -> NaN (min_periods=window do pandas)
+        gaps = np.concatenate(([0], np.cumsum(~finite)))
+        has_gap = (gaps[window:] - gaps[:-window]) > 0
+        mean[has_gap] = np.nan
+        window_squares[has_gap] = np.nan
+    return mean, window_squares
+
+
+def rolling_mean_std(values, window, ddof=1, stable=True, out_mean=None, out_std=None):
+    """
+    (média, desvio) móveis de values numa passada, arrays do tamanho de values.
+
+    stable=True (padrão) recentra a cada STABLE_BLOCK janelas, stable=False usa
+    uma soma acumulada única sobre a série inteira;
+    out_mean/out_std: buffers pré-alocados (float32 ou float64) para as saídas.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError(f"Janela inválida: {window}")
+    n = len(values)
+    mean = np.empty(n) if out_mean is None else out_mean
+    std = np.empty(n) if out_std is None else out_std
+    mean.fill(np.nan)
+    std.fill(np.nan)
+    if n < window:
+        return mean, std
+
+    block = STABLE_BLOCK if stable else n
+
+    # Bloco [start, end) de janelas terminando em start..end-1
+    for start in range(window - 1, n, block):
+        end = min(start + block, n)
+        block_mean, block_squares = _window_sums(values[start - window + 1:end], window)
+        mean[start:end] = block_mean
+        if window > ddof:
+            std[start:end] = np.sqrt(block_squares / (window - ddof))
+    return mean, std
+
+
+def bollinger_bands(values, window, num_std, stable=True):
+    """(superior, média, inferior) das Bollinger Bands de values"""
+    mean, std = rolling_mean_std(values, window, stable=stable)
+    std *= num_std
+    return mean + std, mean, mean - std
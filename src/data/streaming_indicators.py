@@ -0,0 +1,142 @@
+"""
+🌙 Moon Dev's Streaming Indicators
+Versão incremental da estratégia Distância MME9 + Bollinger Bands:
+cada novo candle custa O(1) em vez de recalcular todo o histórico.
+Built with love by Moon Dev 🚀
+"""
+
+import math
+from collections import deque
+
+from ..core.config import STRATEGY_MME_PERIOD, STRATEGY_BB_PERIOD, STRATEGY_BB_STD
+
+
+class StreamingExhaustionIndicator:
+    """
+    Mantém o estado da MME (adjust=False, igual a calculate_ema) e uma janela
+    deslizante da distância % com média/variância de Welford, produzindo os
+    mesmos valores de calculate_distance_mme9 + calculate_bollinger_on_distance
+    (dentro da tolerância de float).
+    """
+
+    def __init__(self, ema_period=STRATEGY_MME_PERIOD, bb_period=STRATEGY_BB_PERIOD,
+                 bb_std=STRATEGY_BB_STD, resync_every=None):
+        self.ema_period = ema_period
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+        self.alpha = 2 / (ema_period + 1)
+
+        # Recalcula média/variância da janela de tempos em tempos para não acumular erro
+        self.resync_every = resync_every or bb_period * 50
+
+        self.ema = None
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.count = 0
+        self.updates_since_resync = 0
+
+        self.exaustao_alta = False
+        self.exaustao_baixa = False
+        self.periodos_exaustao_alta = 0
+        self.periodos_exaustao_baixa = 0
+
+    @property
+    def ready(self):
+        """True quando a janela das Bollinger Bands está completa"""
+        return len(self.window) == self.bb_period
+
+    def _push(self, value):
+        """Adiciona um valor na janela atualizando média e M2 em O(1)"""
+        if len(self.window) < self.bb_period:
+            self.window.append(value)
+            n = len(self.window)
+            delta = value - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (value - self.mean)
+            return
+
+        old = self.window.popleft()
+        self.window.append(value)
+        old_mean = self.mean
+        self.mean += (value - old) / self.bb_period
+        self.m2 += (value - old) * (value - self.mean + old - old_mean)
+
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= self.resync_every:
+            self._resync()
+
+    def _resync(self):
+        n = len(self.window)
+        self.mean = math.fsum(self.window) / n
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in self.window)
+        self.updates_since_resync = 0
+
+    def update(self, close):
+        """Processa um novo fechamento e retorna os indicadores do candle"""
+        close = float(close)
+        self.count += 1
+
+        if self.ema is None:
+            self.ema = close
+        else:
+            self.ema = self.alpha * close + (1 - self.alpha) * self.ema
+
+        distancia = close - self.ema
+        distancia_pct = (distancia / self.ema) * 100
+        self._push(distancia_pct)
+
+        if self.ready:
+            variance = max(self.m2, 0.0) / (self.bb_period - 1) if self.bb_period > 1 else 0.0
+            std = math.sqrt(variance)
+            bb_middle = self.mean
+            bb_upper = bb_middle + std * self.bb_std
+            bb_lower = bb_middle - std * self.bb_std
+        else:
+            bb_middle = bb_upper = bb_lower = math.nan
+
+        # Exaustão / reversão (mesma regra de detect_exhaustion_signals)
+        exaustao_alta = distancia_pct > bb_upper
+        exaustao_baixa = distancia_pct < bb_lower
+        reversao_baixa = self.exaustao_alta and not exaustao_alta
+        reversao_alta = self.exaustao_baixa and not exaustao_baixa
+
+        self.periodos_exaustao_alta = self.periodos_exaustao_alta + 1 if exaustao_alta else 0
+        self.periodos_exaustao_baixa = self.periodos_exaustao_baixa + 1 if exaustao_baixa else 0
+        self.exaustao_alta = exaustao_alta
+        self.exaustao_baixa = exaustao_baixa
+
+        # Sinal (mesma regra de generate_signals)
+        signal = 0
+        signal_strength = 0.0
+        if exaustao_baixa:
+            signal = 1
+            signal_strength = abs((distancia_pct - bb_lower) / bb_lower) if bb_lower else math.inf
+        elif exaustao_alta:
+            signal = -1
+            signal_strength = abs((distancia_pct - bb_upper) / bb_upper) if bb_upper else math.inf
+
+        return {
+            'close': close,
+            'MME9': self.ema,
+            'distanciaMME9': distancia,
+            'distanciaMME9_pct': distancia_pct,
+            'BB_upper': bb_upper,
+            'BB_middle': bb_middle,
+            'BB_lower': bb_lower,
+            'exaustao_alta': exaustao_alta,
+            'exaustao_baixa': exaustao_baixa,
+            'reversao_alta': reversao_alta,
+            'reversao_baixa': reversao_baixa,
+            'periodos_exaustao_alta': self.periodos_exaustao_alta,
+            'periodos_exaustao_baixa': self.periodos_exaustao_baixa,
+            'signal': signal,
+            'signal_strength': signal_strength,
+        }
+
+    def warm_up(self, closes):
+        """Alimenta o histórico e retorna os indicadores do último candle"""
+        last = None
+        for close in closes:
+            last = self.update(close)
+        return last
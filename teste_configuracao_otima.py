@@ -7,45 +7,30 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.data.ohlcv_store import load_csv_data, OHLCVStore
+from src.data.parallel_optimizer import run_work_units
+from src.data.fused_indicators import signal_arrays
+from src.data.feature_cache import cached_fused_indicators
+from src.data.precision import indicator_dtype
 from termcolor import colored, cprint
 import pandas as pd
 import numpy as np
+import contextlib
+import io
 
 def calculate_optimized_strategy(df, ema_period=21, bb_period=100, bb_std=2.5):
     """Calcula estratégia com parâmetros otimizados"""
     
-    # Calcular EMA otimizada
-    df['ema_opt'] = df['close'].ewm(span=ema_period).mean()
-    df['distance_opt'] = ((df['close'] - df['ema_opt']) / df['ema_opt']) * 100
+    # EMA, distância, bandas e sinais otimizados numa única passada
+    out = cached_fused_indicators(df['close'].values, ema_period, bb_period, bb_std, adjust=True, dtype=indicator_dtype())
+    signal, strength = signal_arrays(out)
     
-    # Bollinger Bands otimizadas
-    rolling_mean = df['distance_opt'].rolling(window=bb_period).mean()
-    rolling_std = df['distance_opt'].rolling(window=bb_period).std()
-    
-    df['bb_upper_opt'] = rolling_mean + (rolling_std * bb_std)
-    df['bb_lower_opt'] = rolling_mean - (rolling_std * bb_std)
-    
-    # Gerar sinais otimizados
-    df['signal_opt'] = 0
-    df['signal_strength_opt'] = 0.0
-    
-    # Condições otimizadas
-    buy_condition = df['distance_opt'] < df['bb_lower_opt']
-    sell_condition = df['distance_opt'] > df['bb_upper_opt']
-    
-    df.loc[buy_condition, 'signal_opt'] = 1
-    df.loc[sell_condition, 'signal_opt'] = -1
-    
-    # Força do sinal otimizada
-    df.loc[buy_condition, 'signal_strength_opt'] = abs(
-        (df.loc[buy_condition, 'distance_opt'] - df.loc[buy_condition, 'bb_lower_opt']) / 
-        df.loc[buy_condition, 'bb_lower_opt']
-    )
-    
-    df.loc[sell_condition, 'signal_strength_opt'] = abs(
-        (df.loc[sell_condition, 'distance_opt'] - df.loc[sell_condition, 'bb_upper_opt']) / 
-        df.loc[sell_condition, 'bb_upper_opt']
-    )
+    df['ema_opt'] = out['ema']
+    df['distance_opt'] = out['distance']
+    df['bb_upper_opt'] = out['bb_upper']
+    df['bb_lower_opt'] = out['bb_lower']
+    df['signal_opt'] = signal
+    df['signal_strength_opt'] = strength
     
     return df
 
@@ -68,10 +53,7 @@ def test_optimized_config(csv_file):
     cprint("=" * 60, "blue")
     
     # Carregar dados
-    df = pd.read_csv(csv_file)
-    df.columns = df.columns.str.lower()
-    df['timestamp'] = pd.to_datetime(df['datetime'])
-    df = df.dropna()
+    df = load_csv_data(csv_file)
     
     cprint(f"📊 Períodos: {len(df)}", "cyan")
     cprint(f"📅 De: {df['timestamp'].min()} até {df['timestamp'].max()}", "cyan")
@@ -149,11 +131,18 @@ def test_optimized_config(csv_file):
         cprint("❌ Nenhum sinal gerado", "red")
         return None
 
-def test_all_optimized():
-    """Testa todas as configurações otimizadas"""
+def _test_config_captured(csv_file):
+    """Roda test_optimized_config num worker guardando a saída para imprimir de uma vez"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = test_optimized_config(csv_file)
+    return {'output': output.getvalue(), 'result': result}
+
+def test_all_optimized(max_workers=None):
+    """Testa todas as configurações otimizadas (um processo por arquivo)"""
     import glob
     
-    csv_files = glob.glob("*.csv")
+    csv_files = sorted(glob.glob("*.csv"))
     
     if not csv_files:
         cprint("❌ Nenhum arquivo CSV encontrado!", "red")
@@ -163,12 +152,18 @@ def test_all_optimized():
     cprint("🚀 Aplicando melhores parâmetros para cada ativo", "white", "on_blue")
     cprint("=" * 70, "blue")
     
-    results = []
-    
+    # Importar os CSVs no store antes, assim os workers só mapeiam os .npy
+    store = OHLCVStore()
     for csv_file in csv_files:
-        result = test_optimized_config(csv_file)
-        if result:
-            results.append(result)
+        store.import_csv(csv_file)
+    
+    # Cada relatório aparece inteiro assim que o seu arquivo termina
+    def show_report(csv_file, report):
+        print(report['output'], end='')
+    
+    units = [(csv_file, (csv_file,)) for csv_file in csv_files]
+    reports = run_work_units(_test_config_captured, units, max_workers=max_workers, on_result=show_report)
+    results = [reports[csv_file]['result'] for csv_file in csv_files if reports[csv_file]['result']]
     
     # Resumo final
     if results:
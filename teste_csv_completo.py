@@ -9,35 +9,19 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.data.custom_indicators_simple import run_complete_analysis
+from src.data.ohlcv_store import load_csv_data as load_store_csv
 from termcolor import colored, cprint
 import pandas as pd
 import glob
 from datetime import datetime
 
 def load_csv_data(file_path):
-    """Carrega dados do CSV e padroniza formato"""
+    """Carrega dados do CSV (via store colunar) e padroniza formato"""
     try:
-        df = pd.read_csv(file_path)
-        
-        # Padronizar nomes das colunas
-        df.columns = df.columns.str.lower()
-        
-        # Converter datetime
-        if 'datetime' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['datetime'])
-        elif 'date' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['date'])
-        
-        # Verificar se tem todas as colunas necessárias
-        required_cols = ['open', 'high', 'low', 'close', 'volume']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        
-        if missing_cols:
-            cprint(f"❌ Colunas faltando: {missing_cols}", "red")
-            return None
+        # Primeira leitura converte o CSV para .npy; as seguintes só mapeiam os arquivos
+        df = load_store_csv(file_path)
         
         # Remover dados inválidos
-        df = df.dropna()
         df = df[df['close'] > 0]
         
         return df
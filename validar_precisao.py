@@ -0,0 +1,78 @@
+"""
+🌙 Moon Dev's Precision Validator
+Valida uma política de precisão (DATA_PRECISION) contra o float64 em todos os
+CSVs históricos: erro máximo dos indicadores, sinais que mudaram e quanta
+memória o DataFrame da estratégia ocupa em cada modo.
+Uso: python validar_precisao.py [politica] (ex: compact, indicators32)
+"""
+
+import glob
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from termcolor import cprint
+
+from src.core.config import DATA_PRECISION, PRECISION_MAX_SIGNAL_MISMATCH
+from src.data.ohlcv_store import load_csv_data
+from src.data.fused_indicators import fused_indicators, signal_arrays
+from src.data.precision import compare_with_float64, frame_nbytes, get_policy, signal_labels
+
+# (ema, período BB, desvios, adjust): estratégia padrão e as configurações dos otimizadores
+PARAMETER_SETS = [
+    (9, 200, 2, False),
+    (9, 200, 2, True),
+    (21, 100, 2.5, True),
+    (5, 50, 1.5, True),
+]
+
+
+def strategy_frame_nbytes(csv_file, policy):
+    """Memória do DataFrame com OHLCV + colunas da estratégia na política dada"""
+    settings = get_policy(policy)
+    df = load_csv_data(csv_file, precision=policy)
+    out = fused_indicators(df['close'].values, 9, 200, 2, dtype=settings['indicators'])
+    signal, strength = signal_arrays(out)
+
+    for name in ('ema', 'distance', 'bb_upper', 'bb_middle', 'bb_lower'):
+        df[name] = out[name]
+    df['signal'] = signal.astype(settings['signals'])
+    df['signal_type'] = signal_labels(signal, policy)
+    df['signal_strength'] = strength
+    return frame_nbytes(df)
+
+
+def validate(policy):
+    get_policy(policy)
+    cprint(f"🗜️ Validando política '{policy}' contra float64", "white", "on_blue")
+    print(f"Limite de sinais divergentes: {PRECISION_MAX_SIGNAL_MISMATCH:.3%} dos candles\n")
+
+    all_ok = True
+    for csv_file in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*-data.csv'))):
+        name = os.path.basename(csv_file)
+        close = load_csv_data(csv_file, precision='float64')['close'].values
+
+        full = strategy_frame_nbytes(csv_file, 'float64')
+        lean = strategy_frame_nbytes(csv_file, policy)
+        cprint(f"📊 {name}: {len(close)} candles | {full / 1e6:.1f} MB -> {lean / 1e6:.1f} MB "
+               f"({lean / full:.0%})", "cyan")
+
+        for ema_period, bb_period, bb_std, adjust in PARAMETER_SETS:
+            report = compare_with_float64(close, ema_period, bb_period, bb_std, adjust=adjust, policy=policy)
+            errors = report['max_abs_error']
+            status = "✅" if report['ok'] else "❌"
+            all_ok &= report['ok']
+            print(f"   {status} EMA {ema_period:2d} BB ({bb_period:3d}, {bb_std}) adjust={adjust!s:5} | "
+                  f"sinais diferentes: {report['signal_mismatches']:4d} ({report['signal_mismatch_rate']:.4%}) | "
+                  f"erro máx distância: {errors['distance']:.2e} bandas: {max(errors['bb_upper'], errors['bb_lower']):.2e}")
+
+    if all_ok:
+        cprint(f"\n🎉 Política '{policy}' aprovada: pode usar DATA_PRECISION = '{policy}'", "white", "on_green")
+    else:
+        cprint(f"\n⚠️ Política '{policy}' muda sinais demais, mantenha float64 para estes dados", "white", "on_red")
+    return all_ok
+
+
+if __name__ == "__main__":
+    policy = sys.argv[1] if len(sys.argv) > 1 else (DATA_PRECISION if DATA_PRECISION != 'float64' else 'compact')
+    sys.exit(0 if validate(policy) else 1)
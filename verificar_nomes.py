@@ -0,0 +1,82 @@
+"""
+🌙 Moon Dev's Name Check
+Smoke check dos módulos de trading: importa cada um e confere se todo nome
+global usado dentro das funções existe no módulo (ou nos builtins). Pega
+singletons apagados e variáveis de config com nome errado antes que a
+função quebre com NameError no meio de um trade.
+Uso: python verificar_nomes.py
+"""
+
+import builtins
+import dis
+import importlib
+import os
+import sys
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from termcolor import cprint
+
+MODULES = [
+    'src.core.nice_funcs',
+    'src.core.execution_context',
+    'src.core.execution_engine',
+    'src.core.quote_manager',
+    'src.core.position_tracker',
+    'src.core.wallet_snapshot',
+    'src.core.token_registry',
+    'src.agents.trading_agent',
+]
+
+
+def _code_objects(code):
+    """code e todos os code objects aninhados (funções, classes, lambdas)"""
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def missing_names(module):
+    """{(nome, função)} de globais usados nas funções que o módulo não define"""
+    with open(module.__file__, encoding='utf-8') as f:
+        top = compile(f.read(), module.__file__, 'exec')
+    missing = set()
+    for code in _code_objects(top):
+        if code is top:
+            continue  # o corpo do módulo já rodou no import
+        for instruction in dis.get_instructions(code):
+            name = instruction.argval
+            if instruction.opname == 'LOAD_GLOBAL' and not hasattr(module, name) and not hasattr(builtins, name):
+                missing.add((name, code.co_name))
+    return missing
+
+
+def check():
+    cprint("🔎 Conferindo nomes globais dos módulos de trading", "white", "on_blue")
+    all_ok = True
+    for name in MODULES:
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            cprint(f"❌ {name}: import falhou ({type(e).__name__}: {str(e)})", "white", "on_red")
+            all_ok = False
+            continue
+        missing = missing_names(module)
+        if missing:
+            all_ok = False
+            cprint(f"❌ {name}:", "white", "on_red")
+            for missing_name, function in sorted(missing):
+                print(f"   {missing_name} (usado em {function})")
+        else:
+            print(f"✅ {name}")
+
+    if all_ok:
+        cprint("\n🎉 Todos os nomes resolvem", "white", "on_green")
+    else:
+        cprint("\n⚠️ Há nomes indefinidos: essas funções quebram com NameError", "white", "on_red")
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)